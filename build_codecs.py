@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# -*- coding: latin-1 -*-
+
+# Reggie Next - New Super Mario Bros. Wii Level Editor
+# Milestone 3
+# Copyright (C) 2009-2014 Treeki, Tempus, angelsl, JasonP27, Kamek64,
+# MalStar1000, RoadrunnerWMC, 2017 Stella/AboodXD, John10v10
+
+# This file is part of Reggie Next.
+
+# Reggie Next is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Reggie Next is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Reggie Next.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# build_codecs.py
+# Compiles the Cython codecs (lh_cy, lz77_cy and tpl_cy) in place, so that
+# Reggie! doesn't have to fall back to the slower NumPy or Python ones.
+# Run it once after checking out the source, and again if a .pyx changes:
+#     python3 build_codecs.py
+
+################################################################
+################################################################
+
+# Imports
+import os
+import sys
+
+try:
+    from Cython.Build import cythonize
+    from setuptools import setup, Extension
+except ImportError:
+    print('>> Imports failed; please install Cython and setuptools.')
+    sys.exit(1)
+
+Codecs = ('lh_cy', 'lz77_cy', 'tpl_cy')
+
+print('[[ Building the Reggie! Next codecs ]]')
+
+# Build next to the .pyx files, whatever the working directory is
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+setup(
+    name='reggie_codecs',
+    ext_modules=cythonize(
+        [Extension(name, [name + '.pyx']) for name in Codecs],
+        language_level=3,
+    ),
+    script_args=['build_ext', '--inplace'],
+)
+
+print('>> Built %s !' % ', '.join(Codecs))
@@ -0,0 +1,1256 @@
+#!/usr/bin/python
+# -*- coding: latin-1 -*-
+
+# Reggie Next - New Super Mario Bros. Wii Level Editor
+# Milestone 3
+# Copyright (C) 2009-2014 Treeki, Tempus, angelsl, JasonP27, Kamek64,
+# MalStar1000, RoadrunnerWMC, 2017 Stella/AboodXD, John10v10
+
+# This file is part of Reggie Next.
+
+# Reggie Next is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Reggie Next is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Reggie Next.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# levelcore.py
+# Loads and saves NSMBW levels as plain data, without Qt.
+# The editor builds its items from these records, and scripts can use
+# Level and Area directly to process levels in bulk.
+
+
+################################################################
+################################################################
+
+import pickle
+import struct
+
+import archive
+
+# NumPy is optional; it speeds up mapping many positions to zones at once
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Metadata:
+    """
+    Class for the new level metadata system
+    """
+
+    # This new system is much more useful and flexible than the old
+    # system, but is incompatible with older versions of Reggie.
+    # They will fail to understand the data, and skip it like it
+    # doesn't exist. The new system is written with forward-compatibility
+    # in mind. Thus, when newer versions of Reggie are created
+    # with new metadata values, they will be easily able to add to
+    # the existing ones. In addition, the metadata system is lossless,
+    # so unrecognized values will be preserved when you open and save.
+
+    # Type values:
+    # 0 = binary
+    # 1 = string
+    # 2+ = undefined as of now - future Reggies can use them
+    # Theoretical limit to type values is 4,294,967,296
+
+    def __init__(self, data=None):
+        """
+        Creates a metadata object with the data given
+        """
+        self.DataDict = {}
+        if data is None: return
+
+        if data[0:4] != b'MD2_':
+            # This is old-style metadata - convert it
+            try:
+                strdata = ''
+                for d in data: strdata += chr(d)
+                level_info = pickle.loads(strdata)
+                for k, v in level_info.iteritems():
+                    self.setStrData(k, v)
+            except Exception:
+                pass
+            if ('Website' not in self.DataDict) and ('Webpage' in self.DataDict):
+                self.DataDict['Website'] = self.DataDict['Webpage']
+            return
+
+        # Iterate through the data
+        idx = 4
+        while idx < len(data) - 4:
+
+            # Read the next (first) four bytes - the key length
+            rawKeyLen = data[idx:idx + 4]
+            idx += 4
+
+            keyLen = (rawKeyLen[0] << 24) | (rawKeyLen[1] << 16) | (rawKeyLen[2] << 8) | rawKeyLen[3]
+
+            # Read the next (key length) bytes - the key (as a str)
+            rawKey = data[idx:idx + keyLen]
+            idx += keyLen
+
+            key = ''
+            for b in rawKey: key += chr(b)
+
+            # Read the next four bytes - the number of type entries
+            rawTypeEntries = data[idx:idx + 4]
+            idx += 4
+
+            typeEntries = (rawTypeEntries[0] << 24) | (rawTypeEntries[1] << 16) | (rawTypeEntries[2] << 8) | \
+                          rawTypeEntries[3]
+
+            # Iterate through each type entry
+            for entry in range(typeEntries):
+                # Read the next four bytes - the type
+                rawType = data[idx:idx + 4]
+                idx += 4
+
+                type = (rawType[0] << 24) | (rawType[1] << 16) | (rawType[2] << 8) | rawType[3]
+
+                # Read the next four bytes - the data length
+                rawDataLen = data[idx:idx + 4]
+                idx += 4
+
+                dataLen = (rawDataLen[0] << 24) | (rawDataLen[1] << 16) | (rawDataLen[2] << 8) | rawDataLen[3]
+
+                # Read the next (data length) bytes - the data (as bytes)
+                entryData = data[idx:idx + dataLen]
+                idx += dataLen
+
+                # Add it to typeData
+                self.setOtherData(key, type, entryData)
+
+    def binData(self, key):
+        """
+        Returns the binary data associated with key
+        """
+        return self.otherData(key, 0)
+
+    def strData(self, key):
+        """
+        Returns the string data associated with key
+        """
+        data = self.otherData(key, 1)
+        if data is None: return
+        s = ''
+        for d in data: s += chr(d)
+        return s
+
+    def otherData(self, key, type):
+        """
+        Returns unknown data, with the given type value, associated with key (as binary data)
+        """
+        if key not in self.DataDict: return
+        if type not in self.DataDict[key]: return
+        return self.DataDict[key][type]
+
+    def setBinData(self, key, value):
+        """
+        Sets binary data, overwriting any existing binary data with that key
+        """
+        self.setOtherData(key, 0, value)
+
+    def setStrData(self, key, value):
+        """
+        Sets string data, overwriting any existing string data with that key
+        """
+        data = []
+        for char in value: data.append(ord(char))
+        self.setOtherData(key, 1, data)
+
+    def setOtherData(self, key, type, value):
+        """
+        Sets other (binary) data, overwriting any existing data with that key and type
+        """
+        if key not in self.DataDict: self.DataDict[key] = {}
+        self.DataDict[key][type] = value
+
+    def save(self):
+        """
+        Returns a bytes object that can later be loaded from
+        """
+
+        # Sort self.DataDict
+        dataDictSorted = []
+        for dataKey in self.DataDict: dataDictSorted.append((dataKey, self.DataDict[dataKey]))
+        dataDictSorted.sort(key=lambda entry: entry[0])
+
+        data = []
+
+        # Add 'MD2_'
+        data.append(ord('M'))
+        data.append(ord('D'))
+        data.append(ord('2'))
+        data.append(ord('_'))
+
+        # Iterate through self.DataDict
+        for dataKey, types in dataDictSorted:
+
+            # Add the key length (4 bytes)
+            keyLen = len(dataKey)
+            data.append(keyLen >> 24)
+            data.append((keyLen >> 16) & 0xFF)
+            data.append((keyLen >> 8) & 0xFF)
+            data.append(keyLen & 0xFF)
+
+            # Add the key (key length bytes)
+            for char in dataKey: data.append(ord(char))
+
+            # Sort the types
+            typesSorted = []
+            for type in types: typesSorted.append((type, types[type]))
+            typesSorted.sort(key=lambda entry: entry[0])
+
+            # Add the number of types (4 bytes)
+            typeNum = len(typesSorted)
+            data.append(typeNum >> 24)
+            data.append((typeNum >> 16) & 0xFF)
+            data.append((typeNum >> 8) & 0xFF)
+            data.append(typeNum & 0xFF)
+
+            # Iterate through typesSorted
+            for type, typeData in typesSorted:
+
+                # Add the type (4 bytes)
+                data.append(type >> 24)
+                data.append((type >> 16) & 0xFF)
+                data.append((type >> 8) & 0xFF)
+                data.append(type & 0xFF)
+
+                # Add the data length (4 bytes)
+                dataLen = len(typeData)
+                data.append(dataLen >> 24)
+                data.append((dataLen >> 16) & 0xFF)
+                data.append((dataLen >> 8) & 0xFF)
+                data.append(dataLen & 0xFF)
+
+                # Add the data (data length bytes)
+                for d in typeData: data.append(d)
+
+        return data
+
+
+class ZoneIndex:
+    """
+    Snapshot of the zone rectangles, for mapping many positions to the
+    zone containing or nearest each one
+    """
+
+    def __init__(self, zones):
+        self.key = self.keyFor(zones)
+        self.rects = [(x, y, x + w, y + h, id) for x, y, w, h, id in self.key]
+
+        if np is not None and self.rects:
+            self.left, self.top, self.right, self.bottom, self.ids = (
+                np.array(column, dtype=np.float64) for column in zip(*self.rects)
+            )
+
+    @staticmethod
+    def keyFor(zones):
+        """
+        Returns a value that changes whenever the zones do
+        """
+        return tuple((zone.objx, zone.objy, zone.width, zone.height, zone.id) for zone in zones)
+
+    def lookup(self, x, y, useid=False):
+        """
+        Returns the zone ID containing or nearest the specified position
+        """
+        minimumdist = -1
+        rval = -1
+
+        for idx, (left, top, right, bottom, id) in enumerate(self.rects):
+            if left <= x <= right and top <= y <= bottom:
+                return id if useid else idx
+
+            xdist = 0
+            ydist = 0
+            if x <= left: xdist = left - x
+            if x >= right: xdist = x - right
+            if y <= top: ydist = top - y
+            if y >= bottom: ydist = y - bottom
+
+            dist = (xdist ** 2 + ydist ** 2) ** 0.5
+            if dist < minimumdist or minimumdist == -1:
+                minimumdist = dist
+                rval = id
+
+        return rval
+
+    def lookupMany(self, positions, useid=False):
+        """
+        Returns the zone IDs for a list of (x, y) positions, in one
+        vectorized pass if NumPy is available
+        """
+        if not self.rects:
+            return [-1] * len(positions)
+
+        if np is None or not positions:
+            return [self.lookup(x, y, useid) for x, y in positions]
+
+        pos = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        x = pos[:, 0:1]
+        y = pos[:, 1:2]
+
+        # the first zone containing each position wins...
+        inside = (self.left <= x) & (x <= self.right) & (self.top <= y) & (y <= self.bottom)
+        first = inside.argmax(axis=1)
+
+        # ...and otherwise the nearest one
+        xdist = np.where(x >= self.right, x - self.right, np.where(x <= self.left, self.left - x, 0))
+        ydist = np.where(y >= self.bottom, y - self.bottom, np.where(y <= self.top, self.top - y, 0))
+        nearest = np.sqrt(xdist ** 2 + ydist ** 2).argmin(axis=1)
+
+        result = np.where(
+            inside.any(axis=1),
+            self.ids[first] if useid else first,
+            self.ids[nearest],
+        )
+        return result.astype(np.int64).tolist()
+
+
+def MapPositionsToZoneIDs(zones, positions, useid=False):
+    """
+    Returns the zone IDs containing or nearest a list of (x, y) positions
+    """
+    return ZoneIndex(zones).lookupMany(positions, useid)
+
+
+################################################################
+################################################################
+################################################################
+############################ Records ###########################
+
+# These have the same attribute names as the editor's items, so the
+# Write functions below can save either of them.
+
+class LevelObject:
+    """
+    An object in one of the area's layers
+    """
+    __slots__ = ('tileset', 'type', 'layer', 'objx', 'objy', 'width', 'height')
+
+    def __init__(self, tileset, type, layer, objx, objy, width, height):
+        self.tileset = tileset
+        self.type = type
+        self.layer = layer
+        self.objx = objx
+        self.objy = objy
+        self.width = width
+        self.height = height
+
+
+class Sprite:
+    """
+    A sprite. zoneID is worked out again when the area is saved.
+    """
+    __slots__ = ('type', 'objx', 'objy', 'spritedata', 'zoneID')
+
+    def __init__(self, type, objx, objy, spritedata):
+        self.type = type
+        self.objx = objx
+        self.objy = objy
+        self.spritedata = spritedata
+        self.zoneID = spritedata[6]
+
+
+class Entrance:
+    """
+    An entrance
+    """
+    __slots__ = ('objx', 'objy', 'entid', 'destarea', 'destentrance', 'enttype', 'entzone', 'entlayer',
+                 'entpath', 'entsettings', 'cpdirection')
+
+    def __init__(self, objx, objy, entid, destarea, destentrance, enttype, entzone, entlayer, entpath,
+                 entsettings, cpdirection):
+        self.objx = objx
+        self.objy = objy
+        self.entid = entid
+        self.destarea = destarea
+        self.destentrance = destentrance
+        self.enttype = enttype
+        self.entzone = entzone
+        self.entlayer = entlayer
+        self.entpath = entpath
+        self.entsettings = entsettings
+        self.cpdirection = cpdirection
+
+
+class Zone:
+    """
+    A zone, with its bounding and background settings
+    """
+    Fields = (
+        'objx', 'objy', 'width', 'height', 'modeldark', 'terraindark', 'id', 'block3id', 'cammode', 'camzoom',
+        'visibility', 'block5id', 'block6id', 'camtrack', 'music', 'sfxmod',
+    )
+    BoundingFields = ('yupperbound', 'ylowerbound', 'yupperbound2', 'ylowerbound2', 'entryid', 'unknownbnf')
+    BgAFields = ('entryidA', 'XscrollA', 'YscrollA', 'YpositionA', 'XpositionA', 'bg1A', 'bg2A', 'bg3A', 'ZoomA')
+    BgBFields = ('entryidB', 'XscrollB', 'YscrollB', 'YpositionB', 'XpositionB', 'bg1B', 'bg2B', 'bg3B', 'ZoomB')
+    __slots__ = Fields + BoundingFields + BgAFields + BgBFields
+
+    def __init__(self, data, bounding, bgA, bgB):
+        for fields, values in ((self.Fields, data), (self.BoundingFields, bounding),
+                               (self.BgAFields, bgA), (self.BgBFields, bgB)):
+            for name, value in zip(fields, values):
+                setattr(self, name, value)
+
+    def bounding(self):
+        """
+        Returns the bounding settings, in the order they're stored in
+        """
+        return tuple(getattr(self, name) for name in self.BoundingFields)
+
+    def bgA(self):
+        """
+        Returns the top background settings, in the order they're stored in
+        """
+        return tuple(getattr(self, name) for name in self.BgAFields)
+
+    def bgB(self):
+        """
+        Returns the bottom background settings, in the order they're stored in
+        """
+        return tuple(getattr(self, name) for name in self.BgBFields)
+
+
+class Location:
+    """
+    A location
+    """
+    __slots__ = ('objx', 'objy', 'width', 'height', 'id')
+
+    def __init__(self, objx, objy, width, height, id):
+        self.objx = objx
+        self.objy = objy
+        self.width = width
+        self.height = height
+        self.id = id
+
+
+class Comment:
+    """
+    An in-level comment, stored in the level metadata
+    """
+    __slots__ = ('objx', 'objy', 'text')
+
+    def __init__(self, objx, objy, text=''):
+        self.objx = objx
+        self.objy = objy
+        self.text = text
+
+
+################################################################
+################################################################
+################################################################
+######################## Block Functions #######################
+
+# Paths are kept as dicts, like the editor's Area.pathdata:
+# {'id': int, 'loops': bool, 'nodes': [{'x', 'y', 'speed', 'accel', 'delay'}]}
+
+def ReadBlocks(course):
+    """
+    Splits a course file into its 14 blocks. Also returns the editor
+    metadata stored before the first block, or None if there isn't any.
+    """
+    blocks = [None] * 14
+    getblock = struct.Struct('>II')
+    for i in range(14):
+        data = getblock.unpack_from(course, i * 8)
+        if data[1] == 0:
+            blocks[i] = b''
+        else:
+            blocks[i] = course[data[0]:data[0] + data[1]]
+
+    block1pos = getblock.unpack_from(course, 0)
+    metadata = course[0x70:block1pos[0]] if block1pos[0] != 0x70 else None
+
+    return blocks, metadata
+
+
+def WriteCourse(blocks, metadata):
+    """
+    Puts a course file back together from its blocks and editor metadata
+    """
+    rdata = bytearray(metadata)
+    if len(rdata) % 4 != 0:
+        rdata += bytes(4 - (len(rdata) % 4))
+
+    FileLength = (14 * 8) + len(rdata)
+    for block in blocks:
+        FileLength += len(block)
+
+    course = bytearray(FileLength)
+    saveblock = struct.Struct('>II')
+
+    HeaderOffset = 0
+    FileOffset = (14 * 8) + len(rdata)
+    course[0x70:0x70 + len(rdata)] = rdata
+    for block in blocks:
+        blocksize = len(block)
+        saveblock.pack_into(course, HeaderOffset, FileOffset, blocksize)
+        if blocksize > 0:
+            course[FileOffset:FileOffset + blocksize] = block
+        HeaderOffset += 8
+        FileOffset += blocksize
+
+    return bytes(course)
+
+
+def LoadMetadata(data):
+    """
+    Returns the Metadata stored in a course file, or an empty one
+    """
+    if (data is None) or (len(data) == 0):
+        return Metadata()
+
+    try:
+        return Metadata(data)
+    except Exception:
+        return Metadata()  # fallback
+
+
+def ReadTilesetNames(block):
+    """
+    Reads block 1, the tileset names
+    """
+    data = struct.unpack_from('32s32s32s32s', block)
+    return tuple(name.strip(b'\0').decode('latin-1') for name in data)
+
+
+def WriteTilesetNames(names):
+    """
+    Writes block 1, the tileset names
+    """
+    return ''.join(name.ljust(32, '\0') for name in names).encode('latin-1')
+
+
+def ReadOptions(block2, block4):
+    """
+    Reads block 2, the general options, and block 4, the unknown
+    maybe-more-general-options block. Returns a dict of area attributes.
+    """
+    optstruct = struct.Struct('>IxxxxHh?BxxB?Bx')
+    defEvents, wrapByte, timeLimit, creditsFlag, unkVal, startEntrance, ambushFlag, toadHouseType = \
+        optstruct.unpack(block2)
+
+    optdata2struct = struct.Struct('>xxHHxx')
+    unkVal1, unkVal2 = optdata2struct.unpack(block4)
+
+    return {
+        'defEvents': defEvents,
+        'timeLimit': timeLimit,
+        'creditsFlag': creditsFlag,
+        'startEntrance': startEntrance,
+        'ambushFlag': ambushFlag,
+        'toadHouseType': toadHouseType,
+        'wrapFlag': bool(wrapByte & 1),
+        'unkFlag1': bool(wrapByte >> 3),
+        'unkFlag2': bool(unkVal == 100),
+        'unkVal1': unkVal1,
+        'unkVal2': unkVal2,
+    }
+
+
+def WriteOptions(area):
+    """
+    Writes blocks 2 and 4 from the options of an area
+    """
+    optstruct = struct.Struct('>IxxxxHh?BBBB?Bx')
+
+    wrapByte = 1 if area.wrapFlag else 0
+    if area.unkFlag1: wrapByte |= 8
+    unkVal = 100 if area.unkFlag2 else 0
+
+    block2 = optstruct.pack(area.defEvents, wrapByte, area.timeLimit, area.creditsFlag, unkVal, unkVal,
+                            unkVal, area.startEntrance, area.ambushFlag, area.toadHouseType)
+
+    optdata2struct = struct.Struct('>xxHHxx')
+    block4 = optdata2struct.pack(area.unkVal1, area.unkVal2)
+
+    return block2, block4
+
+
+def ReadEntrances(block):
+    """
+    Reads block 7, the entrances
+    """
+    entstruct = struct.Struct('>HHxxxxBBBBxBBBHxB')
+    return [Entrance(*data) for data in entstruct.iter_unpack(block[:len(block) // 20 * 20])]
+
+
+def WriteEntrances(entrances, zoneIDs):
+    """
+    Writes block 7, the entrances, with the zone each one is in
+    """
+    offset = 0
+    entstruct = struct.Struct('>HHxxxxBBBBxBBBHxB')
+    buffer = bytearray(len(entrances) * 20)
+    for entrance, zoneID in zip(entrances, zoneIDs):
+        entstruct.pack_into(buffer, offset, int(entrance.objx), int(entrance.objy),
+                            int(entrance.entid), int(entrance.destarea), int(entrance.destentrance),
+                            int(entrance.enttype), zoneID, int(entrance.entlayer), int(entrance.entpath),
+                            int(entrance.entsettings), int(entrance.cpdirection))
+        offset += 20
+    return bytes(buffer)
+
+
+def ReadSprites(block):
+    """
+    Reads block 8, the sprites
+    """
+    sprstruct = struct.Struct('>HHH8sxx')
+    return [Sprite(*data) for data in sprstruct.iter_unpack(block[:len(block) // 16 * 16])]
+
+
+def WriteSprites(sprites):
+    """
+    Writes block 8, the sprites
+    """
+    offset = 0
+    sprstruct = struct.Struct('>HHH6sB1sxx')
+    buffer = bytearray((len(sprites) * 16) + 4)
+    f_int = int
+    for sprite in sprites:
+        try:
+            sprstruct.pack_into(buffer, offset, f_int(sprite.type), f_int(sprite.objx), f_int(sprite.objy),
+                                sprite.spritedata[:6], sprite.zoneID, bytes([sprite.spritedata[7], ]))
+        except:
+            # Hopefully this will solve the mysterious bug, and will
+            # soon no longer be necessary.
+            raise ValueError('SaveSprites struct.error. Current sprite data dump:\n' + \
+                             str(offset) + '\n' + \
+                             str(sprite.type) + '\n' + \
+                             str(sprite.objx) + '\n' + \
+                             str(sprite.objy) + '\n' + \
+                             str(sprite.spritedata[:6]) + '\n' + \
+                             str(sprite.zoneID) + '\n' + \
+                             str(bytes([sprite.spritedata[7], ])) + '\n',
+                             )
+        offset += 16
+    buffer[offset:offset + 4] = b'\xFF\xFF\xFF\xFF'
+    return bytes(buffer)
+
+
+def WriteLoadedSprites(sprites):
+    """
+    Writes block 9, the list of sprite types that are used
+    """
+    ls = sorted({sprite.type for sprite in sprites})
+
+    sprstruct = struct.Struct('>Hxx')
+    return b''.join(sprstruct.pack(int(s)) for s in ls)
+
+
+def SortSpritesByZone(sprites, zoneIDs):
+    """
+    Returns the sprites sorted by zone ID so they will work in-game, and
+    sets the zoneID of each one
+    """
+    split = {}
+    zones = []
+
+    for sprite, zone in zip(sprites, zoneIDs):
+        sprite.zoneID = zone
+        if not zone in split:
+            split[zone] = []
+            zones.append(zone)
+        split[zone].append(sprite)
+
+    newlist = []
+    zones.sort()
+    for z in zones:
+        newlist += split[z]
+
+    return newlist
+
+
+def ReadZones(block3, block5, block6, block10):
+    """
+    Reads block 10, the zones, along with their boundings (block 3) and
+    top and bottom backgrounds (blocks 5 and 6)
+    """
+    bdngstruct = struct.Struct('>llllxBxBxxxx')
+    bgstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
+    zonestruct = struct.Struct('>HHHHHHBBBBxBBBBxBB')
+
+    # If there are several with the same id, the last one is used
+    bounding = {data[4]: data for data in bdngstruct.iter_unpack(block3[:len(block3) // 24 * 24])}
+    bgA = {data[0]: data for data in bgstruct.iter_unpack(block5[:len(block5) // 24 * 24])}
+    bgB = {data[0]: data for data in bgstruct.iter_unpack(block6[:len(block6) // 24 * 24])}
+
+    zones = []
+    for i, data in enumerate(zonestruct.iter_unpack(block10[:len(block10) // 24 * 24])):
+        if data[11] not in bgA or data[12] not in bgB:
+            raise ValueError('Zone %d has no background settings' % (i + 1))
+
+        # Zones are numbered in the order they're stored in
+        data = data[:6] + (i,) + data[7:]
+        zones.append(Zone(data, bounding.get(data[7], (0,) * 6), bgA[data[11]], bgB[data[12]]))
+
+    return zones
+
+
+def WriteZones(zones):
+    """
+    Writes blocks 10, 3, 5 and 6, the zone data, boundings, bgA and bgB data respectively
+    """
+    bdngstruct = struct.Struct('>llllxBxBxxxx')
+    bgAstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
+    bgBstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
+    zonestruct = struct.Struct('>HHHHHHBBBBxBBBBxBB')
+    offset = 0
+    i = 0
+    zcount = len(zones)
+    buffer2 = bytearray(24 * zcount)
+    buffer4 = bytearray(24 * zcount)
+    buffer5 = bytearray(24 * zcount)
+    buffer9 = bytearray(24 * zcount)
+    for z in zones:
+        if z.objx < 0: z.objx = 0
+        if z.objy < 0: z.objy = 0
+        bdngstruct.pack_into(buffer2, offset, z.yupperbound, z.ylowerbound, z.yupperbound2, z.ylowerbound2, i, 0xF)
+        bgAstruct.pack_into(buffer4, offset, i, z.XscrollA, z.YscrollA, z.YpositionA, z.XpositionA, z.bg1A, z.bg2A,
+                            z.bg3A, z.ZoomA)
+        bgBstruct.pack_into(buffer5, offset, i, z.XscrollB, z.YscrollB, z.YpositionB, z.XpositionB, z.bg1B, z.bg2B,
+                            z.bg3B, z.ZoomB)
+        zonestruct.pack_into(buffer9, offset, z.objx, z.objy, z.width, z.height, z.modeldark, z.terraindark, i, i,
+                             z.cammode, z.camzoom, z.visibility, i, i, z.camtrack, z.music, z.sfxmod)
+        offset += 24
+        i += 1
+
+    return bytes(buffer2), bytes(buffer4), bytes(buffer5), bytes(buffer9)
+
+
+def ReadLocations(block):
+    """
+    Reads block 11, the locations
+    """
+    locstruct = struct.Struct('>HHHHBxxx')
+    return [Location(*data) for data in locstruct.iter_unpack(block[:len(block) // 12 * 12])]
+
+
+def WriteLocations(locations):
+    """
+    Writes block 11, the locations
+    """
+    locstruct = struct.Struct('>HHHHBxxx')
+    offset = 0
+    buffer = bytearray(12 * len(locations))
+
+    for z in locations:
+        locstruct.pack_into(buffer, offset, int(z.objx), int(z.objy), int(z.width), int(z.height), int(z.id))
+        offset += 12
+
+    return bytes(buffer)
+
+
+def ReadLayer(layerdata, layer):
+    """
+    Reads the objects of an object layer file
+    """
+    objstruct = struct.Struct('>HHHHH')
+    return [LevelObject(data[0] >> 12, data[0] & 4095, layer, data[1], data[2], data[3], data[4])
+            for data in objstruct.iter_unpack(layerdata[:len(layerdata) // 10 * 10])]
+
+
+def WriteLayer(objects):
+    """
+    Writes an object layer file
+    """
+    offset = 0
+    objstruct = struct.Struct('>HHHHH')
+    buffer = bytearray((len(objects) * 10) + 2)
+    f_int = int
+    for obj in objects:
+        objstruct.pack_into(buffer,
+                            offset,
+                            f_int((obj.tileset << 12) | obj.type),
+                            f_int(obj.objx),
+                            f_int(obj.objy),
+                            f_int(obj.width),
+                            f_int(obj.height))
+        offset += 10
+    buffer[offset] = 0xFF
+    buffer[offset + 1] = 0xFF
+    return bytes(buffer)
+
+
+def ReadPaths(block13, block14):
+    """
+    Reads block 13, the paths, and block 14, their nodes
+    """
+    # [20:28:38]  [@Treeki] struct Path { unsigned char id; char padding; unsigned short startNodeIndex; unsigned short nodeCount; unsigned short unknown; };
+    pathstruct = struct.Struct('>BxHHH')
+    # [20:29:04]  [@Treeki] struct PathNode { unsigned short x; unsigned short y; float speed; float unknownMaybeAccel; short unknown; char padding[2]; }
+    nodestruct = struct.Struct('>HHffhxx')
+
+    pathdata = []
+    for id, startindex, count, loops in pathstruct.iter_unpack(block13[:len(block13) // 8 * 8]):
+        nodes = []
+        offset = startindex * 16
+        for i in range(count):
+            data = nodestruct.unpack_from(block14, offset)
+            nodes.append({'x': int(data[0]),
+                          'y': int(data[1]),
+                          'speed': float(data[2]),
+                          'accel': float(data[3]),
+                          'delay': int(data[4])
+                          })
+            offset += 16
+
+        pathdata.append({'id': int(id), 'nodes': nodes, 'loops': loops == 2})
+
+    return pathdata
+
+
+def WritePaths(pathdata):
+    """
+    Writes blocks 13 and 14, the paths and their nodes
+    """
+    pathstruct = struct.Struct('>BxHHH')
+    nodestruct = struct.Struct('>HHffhxx')
+    nodecount = 0
+    for path in pathdata:
+        nodecount += len(path['nodes'])
+    nodebuffer = bytearray(nodecount * 16)
+    nodeoffset = 0
+    nodeindex = 0
+    offset = 0
+    buffer = bytearray(len(pathdata) * 8)
+    for path in pathdata:
+        if (len(path['nodes']) < 1): continue
+        for node in path['nodes']:
+            nodestruct.pack_into(nodebuffer, nodeoffset, int(node['x']), int(node['y']), float(node['speed']),
+                                 float(node['accel']), int(node['delay']))
+            nodeoffset += 16
+
+        pathstruct.pack_into(buffer, offset, int(path['id']), int(nodeindex), int(len(path['nodes'])),
+                             2 if path['loops'] else 0)
+        offset += 8
+        nodeindex += len(path['nodes'])
+
+    return bytes(buffer), bytes(nodebuffer)
+
+
+def ReadComments(data):
+    """
+    Reads the in-level comments from their metadata entry, which may be None
+    """
+    comments = []
+    if data is None: return comments
+
+    data = bytes(data)
+    idx = 0
+    while idx < len(data):
+        xpos, ypos, tlen = struct.unpack_from('>III', data, idx)
+        idx += 12
+        comments.append(Comment(xpos, ypos, data[idx:idx + tlen].decode('latin-1')))
+        idx += tlen
+
+    return comments
+
+
+def WriteComments(comments):
+    """
+    Writes the in-level comments into their metadata entry
+    """
+    b = []
+    for com in comments:
+        b.extend(struct.pack('>III', com.objx, com.objy, len(com.text)))
+        for char in com.text: b.append(ord(char))
+    return b
+
+
+def ReadLevel(data):
+    """
+    Reads the files of each area from a level archive, as (course, L0, L1,
+    L2) lists in area order. Missing files are None. Returns None if the
+    archive has no course folder.
+    """
+    arc = archive.U8.load(data)
+
+    try:
+        arc['course']
+    except:
+        return None
+
+    # Sort the area data
+    areaData = {}
+    for name, val in arc.files:
+        if val is None: continue
+        name = name.replace('\\', '/').split('/')[-1]
+
+        if not name.startswith('course'): continue
+        if not name.endswith('.bin'): continue
+        if '_bgdatL' in name:
+            # It's a layer file
+            if len(name) != 19: continue
+            try:
+                thisArea = int(name[6])
+                laynum = int(name[14])
+            except ValueError:
+                continue
+            if not (0 < thisArea < 5): continue
+
+            if thisArea not in areaData: areaData[thisArea] = [None] * 4
+            areaData[thisArea][laynum + 1] = val
+        else:
+            # It's the course file
+            if len(name) != 11: continue
+            try:
+                thisArea = int(name[6])
+            except ValueError:
+                continue
+            if not (0 < thisArea < 5): continue
+
+            if thisArea not in areaData: areaData[thisArea] = [None] * 4
+            areaData[thisArea][0] = val
+
+    areas = []
+    thisArea = 1
+    while thisArea in areaData:
+        areas.append(areaData[thisArea])
+        thisArea += 1
+
+    return areas
+
+
+def WriteLevel(areas):
+    """
+    Writes a level archive from the (course, L0, L1, L2) files of each area
+    """
+
+    # Make a new archive
+    newArchive = archive.U8()
+
+    # Create a folder within the archive
+    newArchive['course'] = None
+
+    # Add the files of each area to the archive
+    for areanum, (course, L0, L1, L2) in enumerate(areas):
+        if course is not None:
+            newArchive['course/course%d.bin' % (areanum + 1)] = course
+        if L0 is not None:
+            newArchive['course/course%d_bgdatL0.bin' % (areanum + 1)] = L0
+        if L1 is not None:
+            newArchive['course/course%d_bgdatL1.bin' % (areanum + 1)] = L1
+        if L2 is not None:
+            newArchive['course/course%d_bgdatL2.bin' % (areanum + 1)] = L2
+
+    # return the U8 archive data
+    return newArchive._dump()
+
+
+################################################################
+################################################################
+################################################################
+######################### Level Classes ########################
+
+class Area:
+    """
+    A parsed NSMBW level area, as plain data. load() and save() go through
+    the Load*/Save* methods below, so the editor's area can override them
+    to build its items instead of records.
+    """
+
+    def __init__(self):
+        """
+        Creates a completely new area
+        """
+        self.areanum = 1
+
+        # Default tileset names for NSMBW
+        self.tileset0 = 'Pa0_jyotyu'
+        self.tileset1 = ''
+        self.tileset2 = ''
+        self.tileset3 = ''
+
+        self.blocks = [b''] * 14
+        self.blocks[0] = b'Pa0_jyotyu' + bytes(128 - len('Pa0_jyotyu'))
+        self.blocks[1] = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc8\x00\x00\x00\x00\x00\x00\x00\x00'
+        self.blocks[3] = bytes(8)
+        self.blocks[7] = b'\xff\xff\xff\xff'
+
+        self.defEvents = 0
+        self.timeLimit = 200
+        self.creditsFlag = False
+        self.startEntrance = 0
+        self.ambushFlag = False
+        self.toadHouseType = 0
+        self.wrapFlag = False
+        self.unkFlag1 = False
+        self.unkFlag2 = False
+
+        self.unkVal1 = 0
+        self.unkVal2 = 0
+
+        self.layers = [[], [], []]
+        self.entrances = []
+        self.sprites = []
+        self.zones = []
+        self.locations = []
+        self.pathdata = []
+        self.comments = []
+
+        # Layer files the area didn't have; they stay out while empty
+        self.missingLayers = [False, False, False]
+
+        self.Metadata = Metadata()
+        self.storesMetadata = True
+
+    def load(self, course, L0, L1, L2):
+        """
+        Loads the area from its course and layer files
+        """
+        # Load in the course file and blocks
+        self.blocks, metadata = ReadBlocks(course)
+
+        # Load stuff from individual blocks
+        self.LoadTilesetNames()  # block 1
+        self.LoadOptions()  # block 2
+        self.LoadEntrances()  # block 7
+        self.LoadZones()  # block 10 (also blocks 3, 5, and 6)
+        self.LoadLocations()  # block 11
+        self.LoadPaths()  # block 13 and 14
+
+        # Load the editor metadata and the comments stored in it
+        self.LoadReggieInfo(metadata)
+        self.LoadComments()
+
+        self.LoadTilesets()
+        self.LoadSprites()  # block 8
+
+        self.layers = [[], [], []]
+        self.missingLayers = [data is None for data in (L0, L1, L2)]
+        for idx, data in enumerate((L0, L1, L2)):
+            if data is not None:
+                self.LoadLayer(idx, data)
+
+        return True
+
+    def save(self):
+        """
+        Returns the area's course and layer files
+        """
+        # prepare this because otherwise the game refuses to load some sprites
+        self.SortSpritesByZone()
+
+        # save each block first
+        self.SaveTilesetNames()  # block 1
+        self.SaveOptions()  # block 2
+        self.SaveEntrances()  # block 7
+        self.SaveSprites()  # block 8
+        self.SaveLoadedSprites()  # block 9
+        self.SaveZones()  # block 10 (and 3, 5 and 6)
+        self.SaveLocations()  # block 11
+        self.SavePaths()  # block 13 and 14
+        self.SaveComments()
+
+        return (
+            WriteCourse(self.blocks, self.SaveReggieInfo()),
+            self.SaveLayer(0),
+            self.SaveLayer(1),
+            self.SaveLayer(2),
+        )
+
+    def MapToZoneIDs(self, things):
+        """
+        Returns the id of the zone each thing (anything with objx and objy)
+        is in
+        """
+        return MapPositionsToZoneIDs(self.zones, [(thing.objx, thing.objy) for thing in things])
+
+    def SortSpritesByZone(self):
+        """
+        Sorts the sprite list by zone ID so it will work in-game
+        """
+        self.sprites = SortSpritesByZone(self.sprites, self.MapToZoneIDs(self.sprites))
+
+    def LoadTilesetNames(self):
+        """
+        Loads block 1, the tileset names
+        """
+        self.tileset0, self.tileset1, self.tileset2, self.tileset3 = ReadTilesetNames(self.blocks[0])
+
+    def LoadOptions(self):
+        """
+        Loads block 2, the general options, and block 4
+        """
+        for name, value in ReadOptions(self.blocks[1], self.blocks[3]).items():
+            setattr(self, name, value)
+
+    def LoadEntrances(self):
+        """
+        Loads block 7, the entrances
+        """
+        self.entrances = ReadEntrances(self.blocks[6])
+
+    def LoadSprites(self):
+        """
+        Loads block 8, the sprites
+        """
+        self.sprites = ReadSprites(self.blocks[7])
+
+    def LoadZones(self):
+        """
+        Loads block 10, the zones (with blocks 3, 5 and 6)
+        """
+        self.zones = ReadZones(self.blocks[2], self.blocks[4], self.blocks[5], self.blocks[9])
+
+    def LoadLocations(self):
+        """
+        Loads block 11, the locations
+        """
+        self.locations = ReadLocations(self.blocks[10])
+
+    def LoadPaths(self):
+        """
+        Loads block 13, the paths, and block 14, their nodes
+        """
+        self.pathdata = ReadPaths(self.blocks[12], self.blocks[13])
+
+    def LoadReggieInfo(self, data):
+        """
+        Loads the editor metadata (None if the course file has none)
+        """
+        self.Metadata = LoadMetadata(data)
+        self.storesMetadata = data is not None
+
+    def LoadComments(self):
+        """
+        Loads the comments from self.Metadata
+        """
+        self.comments = ReadComments(self.Metadata.binData('InLevelComments_A%d' % self.areanum))
+
+    def LoadTilesets(self):
+        """
+        Called between loading the comments and the sprites. There are no
+        tilesets to load here; the editor loads its own.
+        """
+        pass
+
+    def LoadLayer(self, idx, layerdata):
+        """
+        Loads a specific object layer from a string
+        """
+        self.layers[idx] = ReadLayer(layerdata, idx)
+
+    def SaveTilesetNames(self):
+        """
+        Saves the tileset names back to block 1
+        """
+        self.blocks[0] = WriteTilesetNames((self.tileset0, self.tileset1, self.tileset2, self.tileset3))
+
+    def SaveOptions(self):
+        """
+        Saves block 2, the general options, and block 4
+        """
+        self.blocks[1], self.blocks[3] = WriteOptions(self)
+
+    def SaveEntrances(self):
+        """
+        Saves the entrances back to block 7
+        """
+        self.blocks[6] = WriteEntrances(self.entrances, self.MapToZoneIDs(self.entrances))
+
+    def SaveSprites(self):
+        """
+        Saves the sprites back to block 8
+        """
+        self.blocks[7] = WriteSprites(self.sprites)
+
+    def SaveLoadedSprites(self):
+        """
+        Saves the list of loaded sprites back to block 9
+        """
+        self.blocks[8] = WriteLoadedSprites(self.sprites)
+
+    def SaveZones(self):
+        """
+        Saves blocks 10, 3, 5 and 6, the zone data, boundings, bgA and bgB data respectively
+        """
+        self.blocks[2], self.blocks[4], self.blocks[5], self.blocks[9] = WriteZones(self.zones)
+
+    def SaveLocations(self):
+        """
+        Saves block 11, the location data
+        """
+        self.blocks[10] = WriteLocations(self.locations)
+
+    def SavePaths(self):
+        """
+        Saves the paths back to blocks 13 and 14
+        """
+        self.blocks[12], self.blocks[13] = WritePaths(self.pathdata)
+
+    def SaveComments(self):
+        """
+        Saves the comments to self.Metadata, once there are some
+        """
+        key = 'InLevelComments_A%d' % self.areanum
+        if self.comments or self.Metadata.binData(key) is not None:
+            self.Metadata.setBinData(key, WriteComments(self.comments))
+
+    def SaveReggieInfo(self):
+        """
+        Returns the editor metadata. Course files without any are kept that
+        way until some is added.
+        """
+        if self.storesMetadata or self.Metadata.DataDict:
+            return self.Metadata.save()
+        return b''
+
+    def SaveLayer(self, idx):
+        """
+        Saves an object layer to a string, or returns None if the area
+        didn't have that layer file and the layer is still empty
+        """
+        if self.missingLayers[idx] and not self.layers[idx]:
+            return None
+        return WriteLayer(self.layers[idx])
+
+
+class Level:
+    """
+    A NSMBW level, as plain data
+    """
+
+    def __init__(self):
+        """
+        Creates a level with one new area
+        """
+        self.areas = [Area()]
+
+    def load(self, data):
+        """
+        Loads the level from (decompressed) archive data. Returns False if
+        it isn't a level.
+        """
+        files = ReadLevel(data)
+        if files is None:
+            return False
+
+        self.areas = []
+        for areanum, (course, L0, L1, L2) in enumerate(files, 1):
+            area = Area()
+            area.areanum = areanum
+            area.load(course, L0, L1, L2)
+            self.areas.append(area)
+
+        return True
+
+    def save(self):
+        """
+        Returns the level as archive data
+        """
+        return WriteLevel([area.save() for area in self.areas])
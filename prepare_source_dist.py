@@ -51,14 +51,22 @@ files = (
     
     # alphabetical
     ('archive.py', dir_),
+    ('build_codecs.py', dir_),
     ('common.py', dir_),
+    ('levelcore.py', dir_),
+    ('lh.py', dir_),
+    ('lh_cy.pyx', dir_),
     ('LHdec.py', dir_),
     ('LHDecompressor.exe', dir_),
     ('lz77.py', dir_),
+    ('lz77_cy.pyx', dir_),
     ('prepare_source_dist.py', dir_),
     ('pyqtribbon.py', dir_),
     ('reggie.py', dir_),
     ('sprites.py', dir_),
+    ('tpl.py', dir_),
+    ('tpl_cy.pyx', dir_),
+    ('tpl_np.py', dir_),
     ('windows_build.py', dir_),
 
     ('license.txt', dir_),
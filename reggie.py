@@ -42,7 +42,14 @@ if currentRunningVersion < minimum:
 
 # Stdlib imports
 import base64
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
 import importlib
+import itertools
+import json
 import math
 from math import sqrt
 import os.path
@@ -52,6 +59,7 @@ import random
 import struct
 import threading
 import time
+import tracemalloc
 import urllib.request
 from xml.etree import ElementTree as etree
 import zipfile
@@ -79,33 +87,41 @@ for v, c in zip(version, pqt_min):
 
 # Local imports
 import archive
+import levelcore
 import spritelib as SLib
-import sprites
+from levelcore import Metadata
 from sliderswitch import QSliderSwitch
 
-# LH decompressor
-try:
-    import pyximport
-    pyximport.install()
-    import lh_cy as lh
-except ImportError:
-    import lh
+# Codecs: each one has a Cython backend (compiled by build_codecs.py) and a
+# pure Python fallback, and TPL also has a NumPy one. CodecBackends records
+# which backend each codec uses, and why the faster ones couldn't be used.
+CodecBackends = {}
 
-# LZ77 decompressor
-try:
-    import pyximport
-    pyximport.install()
-    import lz77_cy as lz77
-except ImportError:
-    import lz77
 
-# TPL decoder
-try:
-    import pyximport
-    pyximport.install()
-    import tpl_cy as tpl
-except ImportError:
-    import tpl
+def ImportCodec(codec, *backends):
+    """
+    Imports the first available backend of a codec from (module, backend
+    name) pairs, fastest first. The last one has to be pure Python.
+    """
+    failures = []
+    for moduleName, backend in backends[:-1]:
+        try:
+            module = importlib.import_module(moduleName)
+        except ImportError as e:
+            failures.append('%s: %s' % (backend, e))
+        else:
+            CodecBackends[codec] = (backend, failures)
+            return module
+
+    moduleName, backend = backends[-1]
+    CodecBackends[codec] = (backend, failures)
+    print('Using the slow pure Python %s codec; run build_codecs.py to compile the Cython one' % codec)
+    return importlib.import_module(moduleName)
+
+
+lh = ImportCodec('LH', ('lh_cy', 'Cython'), ('lh', 'Python'))
+lz77 = ImportCodec('LZ77', ('lz77_cy', 'Cython'), ('lz77', 'Python'))
+tpl = ImportCodec('TPL', ('tpl_cy', 'Cython'), ('tpl_np', 'NumPy'), ('tpl', 'Python'))
 
 ReggieID = 'Reggie Next Level Editor by Treeki, Tempus, RoadrunnerWMC, Stella/AboodXD'
 ReggieVersion = 'Milestone 3 Alpha 2'
@@ -120,6 +136,7 @@ if not hasattr(QtWidgets.QGraphicsItem, 'ItemSendsGeometryChanges'):
 app = None
 mainWindow = None
 settings = None
+gamedef = None
 firstLoad = True
 
 FileExtentions = ('.arc', '.arc.LH')
@@ -355,43 +372,63 @@ compressed = False
 
 
 def checkContent(data):
-    if not data.startswith(b'U\xAA8-'):
+    if not data.startswith(b'U\xAA8-') or len(data) < 16:
         return False
 
-    required = (b'course\0', b'course1.bin\0', b'\0\0\0\x80')
-    for r in required:
-        if r not in data:
+    # The file names are in the U8 header, before the file data
+    dataOffset, = struct.unpack_from('>I', data, 12)
+    header = data[:dataOffset]
+
+    for r in (b'course\0', b'course1.bin\0'):
+        if r not in header:
             return False
 
-    return True
+    return data.find(b'\0\0\0\x80', dataOffset) != -1
 
 
 def IsNSMBLevel(filename):
-    global compressed
     """
-    Does some basic checks to confirm a file is a NSMB level
+    Does some quick checks to see if a file could be a NSMB level, without
+    reading all of it. LH-compressed files are only checked when opened.
     """
     if not os.path.isfile(filename): return False
 
-    f = open(filename, 'rb')
-    data = f.read()
-    f.close()
-    del f
+    with open(filename, 'rb') as f:
+        data = f.read(16)
+
+        if lh.IsLHCompressed(data):
+            return True
+
+        if not data.startswith(b'U\xAA8-') or len(data) < 16:
+            return False
+
+        dataOffset, = struct.unpack_from('>I', data, 12)
+        data += f.read(max(dataOffset - 16, 0))
+
+    return b'course\0' in data and b'course1.bin\0' in data
 
-    compressed = False
 
-    if lh.IsLHCompressed(bytes(data)):
+def ReadLevelFile(filename):
+    """
+    Reads a level file, decompressing it if needed. Returns None if it
+    couldn't be decompressed.
+    """
+    global compressed
+
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    compressed = lh.IsLHCompressed(data)
+
+    if compressed:
         try:
             data = lh.UncompressLH(bytearray(data))
         except IndexError:
             QtWidgets.QMessageBox.warning(None, trans.string('Err_Decompress', 0),
                                           trans.string('Err_Decompress', 1, '[file]', filename))
-            return False
-
-        compressed = True
+            return None
 
-    if checkContent(data):
-        return True
+    return data
 
 
 def FilesAreMissing():
@@ -728,8 +765,6 @@ def LoadConstantLists():
     global BgScrollRateStrings
     global ZoneThemeValues
     global ZoneTerrainThemeValues
-    global Sprites
-    global SpriteListData
 
     BgScrollRates = [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0, 0.0, 1.2, 1.5, 2.0, 4.0]
     BgScrollRateStrings = []
@@ -741,9 +776,6 @@ def LoadConstantLists():
 
     ZoneTerrainThemeValues = trans.stringList('ZonesDlg', 2)
 
-    Sprites = None
-    SpriteListData = None
-
 
 class SpriteDefinition:
     """
@@ -786,6 +818,37 @@ class SpriteDefinition:
 
             return str(self.entries[n][1])
 
+    fieldsource = None  # XML element (or its serialized bytes) with the unparsed fields
+
+    def __getattr__(self, name):
+        """
+        Parses the fields the first time they're needed
+        """
+        if name in ('fields', 'dependencies', 'dependencynotes') and self.fieldsource is not None:
+            self.loadFields()
+            return getattr(self, name)
+
+        raise AttributeError(name)
+
+    def loadFields(self):
+        """
+        Parses the fields from fieldsource, warning the user about errors
+        """
+        elem = self.fieldsource
+        self.fieldsource = None
+        if isinstance(elem, bytes):
+            elem = etree.fromstring(elem)
+
+        self.dependencies = []
+        self.dependencynotes = None
+
+        try:
+            self.loadFrom(elem)
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(None, trans.string('Err_BrokenSpriteData', 0),
+                                          trans.string('Err_BrokenSpriteData', 1, '[sprites]', str(self.id)),
+                                          QtWidgets.QMessageBox.Ok)
+            QtWidgets.QMessageBox.warning(None, trans.string('Err_BrokenSpriteData', 2), repr([str(e)]))
 
     def loadFrom(self, elem):
         """
@@ -1163,21 +1226,191 @@ class SpriteDefinition:
                 fields.append((7, attribs['title1'], attribs['title2'], bit, comment, required, advanced, comment2, advancedcomment))
 
 
+SpriteDataCacheVersion = 2
+SpriteDataKey = None
+
+
+def GetCachePath(name):
+    """
+    Returns the path to a file in the cache folder, or None if the folder
+    can't be created
+    """
+    folder = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.GenericCacheLocation)
+    if not folder: return None
+
+    folder = os.path.join(folder, 'Reggie Next')
+    try:
+        os.makedirs(folder, exist_ok=True)
+    except OSError:
+        return None
+
+    return os.path.join(folder, name)
+
+
+def FileStamp(path):
+    """
+    Returns a value that changes whenever the file at path does
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None)
+
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+ParsedCacheVersion = 1
+
+
+def ParsedCachePath(kind, path):
+    """
+    Returns the cache file for data of some kind parsed from path
+    """
+    name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return GetCachePath('%s-%s.pickle' % (kind, name))
+
+
+def LoadParsedCache(kind, path):
+    """
+    Returns the data SaveParsedCache saved for path, or None if any of the
+    files it was parsed from have changed since
+    """
+    cachePath = ParsedCachePath(kind, path)
+    if cachePath is None or not os.path.isfile(cachePath): return None
+
+    try:
+        with open(cachePath, 'rb') as f:
+            version, stamps, data = pickle.load(f)
+    except Exception:
+        return None
+
+    if version != ParsedCacheVersion: return None
+    if any(FileStamp(stamp[0]) != stamp for stamp in stamps): return None
+
+    return data
+
+
+def SaveParsedCache(kind, path, stamps, data):
+    """
+    Saves data parsed from path. stamps are the FileStamps of every file it
+    was parsed from, taken before parsing them.
+    """
+    cachePath = ParsedCachePath(kind, path)
+    if cachePath is None: return
+
+    try:
+        with open(cachePath + '.tmp', 'wb') as f:
+            pickle.dump((ParsedCacheVersion, tuple(stamps), data), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(cachePath + '.tmp', cachePath)
+    except Exception:
+        pass
+
+
+def SpriteDataCacheKey(paths):
+    """
+    Returns a value that changes whenever any of the sprite data files, or
+    the translated strings baked into the sprite definitions, do
+    """
+    files = []
+    for sdpath, snpath in paths:
+        for path in (sdpath, snpath):
+            if path is not None and not isinstance(path, str): path = path.path
+            if path in (None, ''):
+                files.append(None)
+            else:
+                files.append(FileStamp(path))
+
+    strings = tuple(trans.string('SpriteDataEditor', n) for n in (1, 2, 8, 9, 11))
+    return (SpriteDataCacheVersion, tuple(files), strings)
+
+
+def SpriteDataCachePath(key):
+    """
+    Returns the cache file for a set of sprite data files
+    """
+    name = hashlib.sha1(repr(key[1]).encode('utf-8')).hexdigest()
+    return GetCachePath('spritedata-%s.pickle' % name)
+
+
+def LoadSpriteDataCache(key):
+    """
+    Returns the sprite definitions saved for key, or None
+    """
+    path = SpriteDataCachePath(key)
+    if path is None or not os.path.isfile(path): return None
+
+    try:
+        with open(path, 'rb') as f:
+            cachedkey, records = pickle.load(f)
+    except Exception:
+        return None
+
+    if cachedkey != key: return None
+
+    sprites = []
+    for record in records:
+        if record is None:
+            sprites.append(None)
+            continue
+
+        sdef = SpriteDefinition()
+        sdef.__dict__.update(record)
+        sprites.append(sdef)
+
+    return sprites
+
+
+def SaveSpriteDataCache(key, sprites):
+    """
+    Saves the sprite definitions for key
+    """
+    path = SpriteDataCachePath(key)
+    if path is None: return
+
+    records = []
+    for sdef in sprites:
+        if sdef is None:
+            records.append(None)
+            continue
+
+        # the fields are stored unparsed, as XML
+        record = dict(sdef.__dict__)
+        if isinstance(sdef.fieldsource, etree.Element):
+            sdef.fieldsource.tail = None  # text after the element isn't part of it
+            record['fieldsource'] = etree.tostring(sdef.fieldsource)
+        records.append(record)
+
+    try:
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump((key, records), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
 def LoadSpriteData():
     """
     Ensures that the sprite data info is loaded
     """
-    global Sprites
-
-    Sprites = [None] * 483
-    errors = []
-    errortext = []
+    global Sprites, SpriteDataKey
 
     # It works this way so that it can overwrite settings based on order of precedence
     paths = [(trans.files['spritedata'], None)]
     for pathtuple in gamedef.multipleRecursiveFiles('spritedata', 'spritenames'):
         paths.append(pathtuple)
 
+    # Nothing to do if the same files were already loaded, or are cached
+    key = SpriteDataCacheKey(paths)
+    if key == SpriteDataKey and Sprites is not None: return
+
+    cached = LoadSpriteDataCache(key)
+    if cached is not None:
+        Sprites = cached
+        SpriteDataKey = key
+        return
+
+    Sprites = [None] * 483
+
     for sdpath, snpath in paths:
 
         # Add XML sprite data, if there is any
@@ -1238,14 +1471,9 @@ def LoadSpriteData():
                 sdef.noyoshi = noyoshi
                 sdef.asm = asm
                 sdef.size = size
-                sdef.dependencies = []
-                sdef.dependencynotes = None
 
-                try:
-                    sdef.loadFrom(sprite)
-                except Exception as e:
-                    errors.append(str(spriteid))
-                    errortext.append(str(e))
+                # the fields are parsed when the sprite is first edited
+                sdef.fieldsource = sprite
 
                 Sprites[spriteid] = sdef
 
@@ -1266,12 +1494,8 @@ def LoadSpriteData():
             for spriteid, name in data:
                 Sprites[int(spriteid)].name = name
 
-    # Warn the user if errors occurred
-    if len(errors) > 0:
-        QtWidgets.QMessageBox.warning(None, trans.string('Err_BrokenSpriteData', 0),
-                                      trans.string('Err_BrokenSpriteData', 1, '[sprites]', ', '.join(errors)),
-                                      QtWidgets.QMessageBox.Ok)
-        QtWidgets.QMessageBox.warning(None, trans.string('Err_BrokenSpriteData', 2), repr(errortext))
+    SpriteDataKey = key
+    SaveSpriteDataCache(key, Sprites)
 
 
 SpriteCategories = None
@@ -1605,12 +1829,74 @@ class ChooseLevelNameDialog(QtWidgets.QDialog):
 
 Tiles = None # 0x200 tiles per tileset, plus 64 for each type of override
 TilesetFilesLoaded = [None, None, None, None]
+
+# (slot, archive path) -> (FileStamp, tiles, object definitions) of the
+# last few tilesets loaded, so switching areas doesn't decode them again
+TilesetCache = collections.OrderedDict()
+TilesetCacheSize = 12
 TilesetAnimTimer = None
 Overrides = None # 320 tiles, this is put into Tiles usually
 TileBehaviours = None
 ObjectDefinitions = None # 4 tilesets
 TilesetsAnimating = False
 
+# Zoom-dependent tile levels: level n holds tiles pre-scaled to 24 >> n
+# pixels. Below TileFlatZoom, each tile is drawn as a single flat colour.
+TileMipLevels = 4 # 100%, 50%, 25%, 12.5%
+TileFlatZoom = 12.5
+
+# Tiles are rasterized in square chunks of TileChunkSize x TileChunkSize
+# tiles, off the GUI thread. Bumping TileChunkGeneration throws away every
+# rendered chunk, and has to happen whenever tile graphics change. Edits to
+# objects bump the version of the chunks they touch in TileChunkVersions.
+TileChunkSize = 16
+TileChunkBudget = 96 * 1024 * 1024 # bytes
+TileChunkSyncLimit = 4 # chunks re-rendered in place per paint, for edits
+TileChunkGeneration = 0
+TileChunkVersions = {} # (chunk x, chunk y): version
+
+
+def InvalidateTileChunks():
+    """
+    Marks every rendered tile chunk as outdated
+    """
+    global TileChunkGeneration
+    TileChunkGeneration += 1
+
+
+def InvalidateTileRect(rect):
+    """
+    Marks the rendered tile chunks that overlap rect (in tiles) as outdated
+    """
+    # The whole cache is thrown away once the level is loaded
+    if LevelPopulating: return
+
+    cs = TileChunkSize
+    cx1 = max(int(rect.x()) // cs, 0)
+    cy1 = max(int(rect.y()) // cs, 0)
+    cx2 = int(rect.x() + rect.width()) // cs
+    cy2 = int(rect.y() + rect.height()) // cs
+
+    versions = TileChunkVersions
+    for cy in range(cy1, cy2 + 1):
+        for cx in range(cx1, cx2 + 1):
+            versions[cx, cy] = versions.get((cx, cy), 0) + 1
+
+
+def TileMipLevelForZoom(zoom):
+    """
+    Returns the tile level to draw at the given zoom level (in percent), or
+    None if tiles should be drawn as flat colours
+    """
+    if zoom < TileFlatZoom:
+        return None
+
+    level = 0
+    while level < TileMipLevels - 1 and zoom <= 100 / (2 << level):
+        level += 1
+
+    return level
+
 
 class ObjectDef:
     """
@@ -1674,6 +1960,7 @@ class TilesetTile:
         self.animTiles = []
         self.collData = ()
         self.collOverlay = None
+        self.mipCache = {}
 
     def addAnimationData(self, data, reverse=False):
         """
@@ -1743,6 +2030,58 @@ class TilesetTile:
 
         return result
 
+    def getCurrentSource(self):
+        """
+        Returns the unmodified pixmap for the current animation frame
+        """
+        if (not TilesetsAnimating) or (not self.isAnimated):
+            return self.main
+        return self.animTiles[self.animFrame]
+
+    def getScaledTile(self, level):
+        """
+        Returns the current tile pre-scaled to 24 >> level pixels. The scaled
+        pixmaps are generated the first time they're needed and cached.
+        """
+        if level == 0:
+            return self.getCurrentTile()
+
+        key = (level, self.getCurrentSource().cacheKey(), CollisionsShown)
+        pix = self.mipCache.get(key)
+        if pix is None:
+            size = 24 >> level
+            pix = self.getCurrentTile().scaled(size, size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            self.mipCache[key] = pix
+
+        return pix
+
+    def getScaledImage(self, level):
+        """
+        Returns the current tile as a QImage pre-scaled to 24 >> level
+        pixels. Unlike QPixmaps, these are safe to paint from worker threads.
+        """
+        key = ('img', level, self.getCurrentSource().cacheKey(), CollisionsShown)
+        img = self.mipCache.get(key)
+        if img is None:
+            img = self.getScaledTile(level).toImage()
+            self.mipCache[key] = img
+
+        return img
+
+    def getFlatColor(self):
+        """
+        Returns the average color of the current tile, for drawing at very
+        low zoom levels
+        """
+        key = ('flat', self.getCurrentSource().cacheKey(), CollisionsShown)
+        color = self.mipCache.get(key)
+        if color is None:
+            img = self.getCurrentTile().toImage().scaled(1, 1, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            color = QtGui.QColor.fromRgba(img.pixel(0, 0))
+            self.mipCache[key] = color
+
+        return color
+
     def setCollisions(self, colldata):
         """
         Sets the collision data for this tile
@@ -2171,6 +2510,7 @@ class TilesetTile:
             pass
 
         self.collOverlay = collPix
+        self.mipCache = {}
 
 
 def RenderObject(tileset, objnum, width, height, fullslope=False):
@@ -2453,35 +2793,32 @@ def _LoadTileset(idx, name, reload=False):
 
     # find the tileset path
     global arcname
-    TilesetPaths = reversed(gamedef.GetGamePaths())
-
-    found = False
-    for path in TilesetPaths:
-        if path is None: break
-
-        arcname = path
-        arcname += '/Texture/'
-        arcname += name + '.arc'
-
-        compressed = False
-        if os.path.isfile(arcname):
-            found = True
-            break
-        arcname += '.LH'
-        compressed = True
-        if os.path.isfile(arcname):
-            found = True
-            break
+    found = gamedef.GetTilesetFile(name)
 
     # warning if not found
-    if not found:
+    if found is None:
         QtWidgets.QMessageBox.warning(None, trans.string('Err_MissingTileset', 0),
                                       trans.string('Err_MissingTileset', 1, '[file]', name))
         return False
 
+    arcname, compressed = found
+
     # if this file's already loaded, return
     if TilesetFilesLoaded[idx] == arcname and not reload: return
 
+    # if it was loaded into this slot recently, use that
+    tileoffset = idx * 256
+    stamp = FileStamp(arcname)
+    cached = TilesetCache.get((idx, arcname))
+    if cached is not None and cached[0] == stamp and not reload:
+        TilesetCache.move_to_end((idx, arcname))
+        Tiles[tileoffset:tileoffset + 256] = cached[1]
+        ObjectDefinitions[idx] = cached[2]
+        TilesetFilesLoaded[idx] = arcname
+        SLib.Tiles = Tiles
+        InvalidateTileChunks()
+        return
+
     # get the data
     with open(arcname, 'rb') as fileobj:
         arcdata = fileobj.read()
@@ -2656,9 +2993,21 @@ def _LoadTileset(idx, name, reload=False):
     # Keep track of this filepath
     TilesetFilesLoaded[idx] = arcname
 
+    # Some overrides change the tiles of another slot, and those can't be
+    # reused as they are
+    if OverridesOtherSlots(idx, name):
+        TilesetCache.clear()
+    else:
+        TilesetCache[(idx, arcname)] = (stamp, Tiles[tileoffset:tileoffset + 256], defs)
+        TilesetCache.move_to_end((idx, arcname))
+        while len(TilesetCache) > TilesetCacheSize:
+            TilesetCache.popitem(False)
+
     # Add Tiles to spritelib
     SLib.Tiles = Tiles
 
+    InvalidateTileChunks()
+
 
 def LoadTexture_NSMBW(tiledata):
     data = tpl.decodeRGB4A3(tiledata, 1024, 256, False)
@@ -2725,6 +3074,24 @@ def UnloadTileset(idx):
     ObjectDefinitions[idx] = [None] * 256
     TilesetFilesLoaded[idx] = None
 
+    InvalidateTileChunks()
+
+
+def OverridesOtherSlots(idx, name):
+    """
+    Returns True if ProcessOverrides changes tiles outside of this slot
+    """
+    tsidx = OverriddenTilesets
+
+    if name in tsidx["Pa0"]:
+        return idx != 0
+    elif name in tsidx["Flowers"] or name in tsidx["Forest Flowers"]:
+        return idx != 1
+    elif name in tsidx["Lines"] or name in tsidx["Full Lines"]:
+        return idx != 3
+
+    return False
+
 
 def ProcessOverrides(idx, name):
     """
@@ -3001,6 +3368,7 @@ def LoadOverrides():
 Area = None
 Dirty = False
 DirtyOverride = 0
+LevelPopulating = 0
 AutoSaveDirty = False
 OverrideSnapping = False
 CurrentPaintType = 0
@@ -3012,6 +3380,8 @@ Layer1Shown = True
 Layer2Shown = True
 SpritesShown = True
 SpriteImagesShown = True
+SpriteImageMargin = 480  # scene pixels around the view in which sprite images are created
+SpriteImageReleaseDelay = None  # seconds out of view before a sprite image is released; None keeps them
 RealViewEnabled = False
 LocationsShown = True
 CommentsShown = True
@@ -3078,202 +3448,6 @@ def SetDirty(noautosave = False):
         pass
 
 
-class Metadata:
-    """
-    Class for the new level metadata system
-    """
-
-    # This new system is much more useful and flexible than the old
-    # system, but is incompatible with older versions of Reggie.
-    # They will fail to understand the data, and skip it like it
-    # doesn't exist. The new system is written with forward-compatibility
-    # in mind. Thus, when newer versions of Reggie are created
-    # with new metadata values, they will be easily able to add to
-    # the existing ones. In addition, the metadata system is lossless,
-    # so unrecognized values will be preserved when you open and save.
-
-    # Type values:
-    # 0 = binary
-    # 1 = string
-    # 2+ = undefined as of now - future Reggies can use them
-    # Theoretical limit to type values is 4,294,967,296
-
-    def __init__(self, data=None):
-        """
-        Creates a metadata object with the data given
-        """
-        self.DataDict = {}
-        if data is None: return
-
-        if data[0:4] != b'MD2_':
-            # This is old-style metadata - convert it
-            try:
-                strdata = ''
-                for d in data: strdata += chr(d)
-                level_info = pickle.loads(strdata)
-                for k, v in level_info.iteritems():
-                    self.setStrData(k, v)
-            except Exception:
-                pass
-            if ('Website' not in self.DataDict) and ('Webpage' in self.DataDict):
-                self.DataDict['Website'] = self.DataDict['Webpage']
-            return
-
-        # Iterate through the data
-        idx = 4
-        while idx < len(data) - 4:
-
-            # Read the next (first) four bytes - the key length
-            rawKeyLen = data[idx:idx + 4]
-            idx += 4
-
-            keyLen = (rawKeyLen[0] << 24) | (rawKeyLen[1] << 16) | (rawKeyLen[2] << 8) | rawKeyLen[3]
-
-            # Read the next (key length) bytes - the key (as a str)
-            rawKey = data[idx:idx + keyLen]
-            idx += keyLen
-
-            key = ''
-            for b in rawKey: key += chr(b)
-
-            # Read the next four bytes - the number of type entries
-            rawTypeEntries = data[idx:idx + 4]
-            idx += 4
-
-            typeEntries = (rawTypeEntries[0] << 24) | (rawTypeEntries[1] << 16) | (rawTypeEntries[2] << 8) | \
-                          rawTypeEntries[3]
-
-            # Iterate through each type entry
-            for entry in range(typeEntries):
-                # Read the next four bytes - the type
-                rawType = data[idx:idx + 4]
-                idx += 4
-
-                type = (rawType[0] << 24) | (rawType[1] << 16) | (rawType[2] << 8) | rawType[3]
-
-                # Read the next four bytes - the data length
-                rawDataLen = data[idx:idx + 4]
-                idx += 4
-
-                dataLen = (rawDataLen[0] << 24) | (rawDataLen[1] << 16) | (rawDataLen[2] << 8) | rawDataLen[3]
-
-                # Read the next (data length) bytes - the data (as bytes)
-                entryData = data[idx:idx + dataLen]
-                idx += dataLen
-
-                # Add it to typeData
-                self.setOtherData(key, type, entryData)
-
-    def binData(self, key):
-        """
-        Returns the binary data associated with key
-        """
-        return self.otherData(key, 0)
-
-    def strData(self, key):
-        """
-        Returns the string data associated with key
-        """
-        data = self.otherData(key, 1)
-        if data is None: return
-        s = ''
-        for d in data: s += chr(d)
-        return s
-
-    def otherData(self, key, type):
-        """
-        Returns unknown data, with the given type value, associated with key (as binary data)
-        """
-        if key not in self.DataDict: return
-        if type not in self.DataDict[key]: return
-        return self.DataDict[key][type]
-
-    def setBinData(self, key, value):
-        """
-        Sets binary data, overwriting any existing binary data with that key
-        """
-        self.setOtherData(key, 0, value)
-
-    def setStrData(self, key, value):
-        """
-        Sets string data, overwriting any existing string data with that key
-        """
-        data = []
-        for char in value: data.append(ord(char))
-        self.setOtherData(key, 1, data)
-
-    def setOtherData(self, key, type, value):
-        """
-        Sets other (binary) data, overwriting any existing data with that key and type
-        """
-        if key not in self.DataDict: self.DataDict[key] = {}
-        self.DataDict[key][type] = value
-
-    def save(self):
-        """
-        Returns a bytes object that can later be loaded from
-        """
-
-        # Sort self.DataDict
-        dataDictSorted = []
-        for dataKey in self.DataDict: dataDictSorted.append((dataKey, self.DataDict[dataKey]))
-        dataDictSorted.sort(key=lambda entry: entry[0])
-
-        data = []
-
-        # Add 'MD2_'
-        data.append(ord('M'))
-        data.append(ord('D'))
-        data.append(ord('2'))
-        data.append(ord('_'))
-
-        # Iterate through self.DataDict
-        for dataKey, types in dataDictSorted:
-
-            # Add the key length (4 bytes)
-            keyLen = len(dataKey)
-            data.append(keyLen >> 24)
-            data.append((keyLen >> 16) & 0xFF)
-            data.append((keyLen >> 8) & 0xFF)
-            data.append(keyLen & 0xFF)
-
-            # Add the key (key length bytes)
-            for char in dataKey: data.append(ord(char))
-
-            # Sort the types
-            typesSorted = []
-            for type in types: typesSorted.append((type, types[type]))
-            typesSorted.sort(key=lambda entry: entry[0])
-
-            # Add the number of types (4 bytes)
-            typeNum = len(typesSorted)
-            data.append(typeNum >> 24)
-            data.append((typeNum >> 16) & 0xFF)
-            data.append((typeNum >> 8) & 0xFF)
-            data.append(typeNum & 0xFF)
-
-            # Iterate through typesSorted
-            for type, typeData in typesSorted:
-
-                # Add the type (4 bytes)
-                data.append(type >> 24)
-                data.append((type >> 16) & 0xFF)
-                data.append((type >> 8) & 0xFF)
-                data.append(type & 0xFF)
-
-                # Add the data length (4 bytes)
-                dataLen = len(typeData)
-                data.append(dataLen >> 24)
-                data.append((dataLen >> 16) & 0xFF)
-                data.append((dataLen >> 8) & 0xFF)
-                data.append(dataLen & 0xFF)
-
-                # Add the data (data length bytes)
-                for d in typeData: data.append(d)
-
-        return data
-
-
 class AbstractLevel:
     """
     Class for an abstract level from any game. Defines the API.
@@ -3345,54 +3519,13 @@ class Level_NSMBW(AbstractLevel):
 
         global Area
 
-        arc = archive.U8.load(data)
-
-        try:
-            arc['course']
-        except:
+        areaFiles = levelcore.ReadLevel(data)
+        if areaFiles is None:
             return False
 
-        # Sort the area data
-        areaData = {}
-        for name, val in arc.files:
-            if val is None: continue
-            name = name.replace('\\', '/').split('/')[-1]
-
-            if not name.startswith('course'): continue
-            if not name.endswith('.bin'): continue
-            if '_bgdatL' in name:
-                # It's a layer file
-                if len(name) != 19: continue
-                try:
-                    thisArea = int(name[6])
-                    laynum = int(name[14])
-                except ValueError:
-                    continue
-                if not (0 < thisArea < 5): continue
-
-                if thisArea not in areaData: areaData[thisArea] = [None] * 4
-                areaData[thisArea][laynum + 1] = val
-            else:
-                # It's the course file
-                if len(name) != 11: continue
-                try:
-                    thisArea = int(name[6])
-                except ValueError:
-                    continue
-                if not (0 < thisArea < 5): continue
-
-                if thisArea not in areaData: areaData[thisArea] = [None] * 4
-                areaData[thisArea][0] = val
-
         # Create area objects
         self.areas = []
-        thisArea = 1
-        while thisArea in areaData:
-            course = areaData[thisArea][0]
-            L0 = areaData[thisArea][1]
-            L1 = areaData[thisArea][2]
-            L2 = areaData[thisArea][3]
-
+        for thisArea, (course, L0, L1, L2) in enumerate(areaFiles, 1):
             if thisArea == areaToLoad:
                 newarea = Area_NSMBW()
                 Area = newarea
@@ -3404,72 +3537,51 @@ class Level_NSMBW(AbstractLevel):
             newarea.load(course, L0, L1, L2)
             self.areas.append(newarea)
 
-            thisArea += 1
-
         return True
 
-    def save(self):
+    def switchArea(self, areaNum):
         """
-        Save the level back to a file
+        Makes another area the current one. Areas are parsed the first time
+        they're switched to, and kept parsed after that.
         """
+        global Area
 
-        # Make a new archive
-        newArchive = archive.U8()
+        area = self.areas[areaNum - 1]
+        if isinstance(area, AbstractParsedArea):
+            Area = area
+            SLib.Area = Area
 
-        # Create a folder within the archive
-        newArchive['course'] = None
+            # The tilesets are usually still cached from the last time
+            CreateTilesets()
+            if area.tileset0 != '': LoadTileset(0, area.tileset0)
+            if area.tileset1 != '': LoadTileset(1, area.tileset1)
+            if area.tileset2 != '': LoadTileset(2, area.tileset2)
+            if area.tileset3 != '': LoadTileset(3, area.tileset3)
 
-        # Go through the areas, save them and add them back to the archive
-        for areanum, area in enumerate(self.areas):
-            course, L0, L1, L2 = area.save()
+        else:
+            newarea = Area_NSMBW()
+            Area = newarea
+            SLib.Area = Area
 
-            if course is not None:
-                newArchive['course/course%d.bin' % (areanum + 1)] = course
-            if L0 is not None:
-                newArchive['course/course%d_bgdatL0.bin' % (areanum + 1)] = L0
-            if L1 is not None:
-                newArchive['course/course%d_bgdatL1.bin' % (areanum + 1)] = L1
-            if L2 is not None:
-                newArchive['course/course%d_bgdatL2.bin' % (areanum + 1)] = L2
+            newarea.areanum = areaNum
+            newarea.load(*area.save())
+            self.areas[areaNum - 1] = newarea
 
-        # return the U8 archive data
-        return newArchive._dump()
+        return True
 
-    def saveNewArea(self, course_new, L0_new, L1_new, L2_new):
+    def save(self):
         """
         Save the level back to a file
         """
+        return levelcore.WriteLevel([area.save() for area in self.areas])
 
-        # Make a new archive
-        newArchive = archive.U8()
-
-        # Create a folder within the archive
-        newArchive['course'] = None
-
-        # Go through the areas, save them and add them back to the archive
-        for areanum, area in enumerate(self.areas):
-            course, L0, L1, L2 = area.save()
-
-            if course is not None:
-                newArchive['course/course%d.bin' % (areanum + 1)] = course
-            if L0 is not None:
-                newArchive['course/course%d_bgdatL0.bin' % (areanum + 1)] = L0
-            if L1 is not None:
-                newArchive['course/course%d_bgdatL1.bin' % (areanum + 1)] = L1
-            if L2 is not None:
-                newArchive['course/course%d_bgdatL2.bin' % (areanum + 1)] = L2
-
-        if course_new is not None:
-            newArchive['course/course%d.bin' % (len(self.areas) + 1)] = course_new
-        if L0_new is not None:
-            newArchive['course/course%d_bgdatL0.bin' % (len(self.areas) + 1)] = L0_new
-        if L1_new is not None:
-            newArchive['course/course%d_bgdatL1.bin' % (len(self.areas) + 1)] = L1_new
-        if L2_new is not None:
-            newArchive['course/course%d_bgdatL2.bin' % (len(self.areas) + 1)] = L2_new
-
-        # return the U8 archive data
-        return newArchive._dump()
+    def saveNewArea(self, course_new, L0_new, L1_new, L2_new):
+        """
+        Save the level back to a file, with a new area added at the end
+        """
+        areas = [area.save() for area in self.areas]
+        areas.append((course_new, L0_new, L1_new, L2_new))
+        return levelcore.WriteLevel(areas)
 
 
 class AbstractArea:
@@ -3494,73 +3606,85 @@ class AbstractArea:
         return (self.course, self.L0, self.L1, self.L2)
 
 
-class AbstractParsedArea(AbstractArea):
+class AbstractParsedArea(levelcore.Area):
     """
     An area that is parsed to load sprites, entrances, etc. Still abstracted among games.
     Don't instantiate this! It could blow up becuase many of the functions are only defined
     within subclasses. If you want an area object, use a game-specific subclass.
     """
+    # Sprites that paint liquids/fog over their whole zone in Real View
+    ZoneEffectSpriteTypes = frozenset((64, 138, 139, 216, 358, 374, 435))
+
+    # zone id -> effect sprites in that zone; None if it has to be rebuilt
+    zoneEffectSprites = None
 
     def __init__(self):
         """
         Creates a completely new area
         """
-
-        # Default area number
-        self.areanum = 1
-
-        # Settings
-        self.defEvents = 0
-        self.wrapFlag = 0
-        self.timeLimit = 200
-        self.unk1 = 0
-        self.startEntrance = 0
-        self.unk2 = 0
-        self.unk3 = 0
-
-        # Lists of things
-        self.entrances = []
-        self.sprites = []
-        self.zones = []
-        self.locations = []
-        self.pathdata = []
+        super().__init__()
         self.paths = []
-        self.comments = []
-        self.layers = [[], [], []]
-
-        # Metadata
-        self.LoadReggieInfo(None)
 
         # Load tilesets
         CreateTilesets()
         LoadTileset(0, self.tileset0)
         LoadTileset(1, self.tileset1)
 
-    def load(self, course, L0, L1, L2):
+    def GetZoneEffectSprites(self, zoneid):
         """
-        Loads an area from the archive files
+        Returns the Real View effect sprites that belong to the zone with
+        the given id, rebuilding the index if needed
         """
+        if self.zoneEffectSprites is None:
+            self.zoneEffectSprites = {}
+            for sprite in self.sprites:
+                if sprite.type in self.ZoneEffectSpriteTypes:
+                    self.AddZoneEffectSprite(sprite)
 
-        # Load in the course file and blocks
-        self.LoadBlocks(course)
+        return self.zoneEffectSprites.get(zoneid, ())
 
-        # Load stuff from individual blocks
-        self.LoadTilesetNames()  # block 1
-        self.LoadOptions()  # block 2
-        self.LoadEntrances()  # block 7
-        self.LoadZones()  # block 10 (also blocks 3, 5, and 6)
-        self.LoadLocations()  # block 11
-        self.LoadPaths()  # block 12 and 13
-        # Load the editor metadata
-        if self.block1pos[0] != 0x70:
-            rddata = course[0x70:self.block1pos[0]]
-            self.LoadReggieInfo(rddata)
-        else:
-            self.LoadReggieInfo(None)
-        del self.block1pos
+    def AddZoneEffectSprite(self, sprite):
+        """
+        Adds a sprite to the zone index
+        """
+        zoneid = SLib.GetZoneIndex(self.zones).lookup(sprite.objx, sprite.objy)
+        self.zoneEffectSprites.setdefault(zoneid, []).append(sprite)
+
+    def UpdateZoneEffectSprite(self, sprite, present=None):
+        """
+        Updates the zone index after a sprite was added, removed, moved or
+        had its type changed. present tells whether the sprite is in the
+        level; by default, that's whether it's in self.sprites yet.
+        """
+        if self.zoneEffectSprites is None: return
+
+        for sprites in self.zoneEffectSprites.values():
+            if sprite in sprites:
+                sprites.remove(sprite)
 
-        # Now, load the comments
-        self.LoadComments()
+        if present is None:
+            present = sprite in self.sprites
+
+        if sprite.type in self.ZoneEffectSpriteTypes and present:
+            self.AddZoneEffectSprite(sprite)
+
+    def InvalidateZoneEffectSprites(self):
+        """
+        Throws away the zone index, after zones were edited
+        """
+        self.zoneEffectSprites = None
+
+    def LoadTilesets(self):
+        """
+        Loads the tilesets, between loading the comments and the sprites
+        """
+        # Start decoding the sprite images while the tilesets load. This
+        # is skipped until sprites.py has been imported for a sprite that
+        # came into view, rather than importing it here.
+        if gamedef.imageClassesLoaded():
+            spritedata = self.blocks[7]
+            spritedata = spritedata[:len(spritedata) // 16 * 16]
+            SLib.PreloadSpriteImages(gamedef.getImageClasses(), {t for t, in struct.iter_unpack('>H14x', spritedata)})
 
         global firstLoad
 
@@ -3595,77 +3719,6 @@ class AbstractParsedArea(AbstractArea):
 
             firstLoad = False
 
-        self.LoadSprites()  # block 8
-
-        self.layers = [[], [], []]
-
-        if L0 is not None:
-            self.LoadLayer(0, L0)
-        if L1 is not None:
-            self.LoadLayer(1, L1)
-        if L2 is not None:
-            self.LoadLayer(2, L2)
-
-        # Delete self.blocks
-        # del self.blocks
-
-        return True
-
-    def save(self):
-        """
-        Save the area back to a file
-        """
-        # prepare this because otherwise the game refuses to load some sprites
-        self.SortSpritesByZone()
-
-        # save each block first
-        self.SaveTilesetNames()  # block 1
-        self.SaveOptions()  # block 2
-        self.SaveEntrances()  # block 7
-        self.SaveSprites()  # block 8
-        self.SaveLoadedSprites()  # block 9
-        self.SaveZones()  # block 10 (and 3, 5 and 6)
-        self.SaveLocations()  # block 11
-        self.SavePaths()
-
-        rdata = bytearray(self.Metadata.save())
-        if len(rdata) % 4 != 0:
-            for i in range(4 - (len(rdata) % 4)):
-                rdata.append(0)
-        rdata = bytes(rdata)
-
-        # Save the main course file
-        # We'll be passing over the blocks array two times.
-        # Using bytearray here because it offers mutable bytes
-        # and works directly with struct.pack_into(), so it's a
-        # win-win situation
-        FileLength = (14 * 8) + len(rdata)
-        for block in self.blocks:
-            FileLength += len(block)
-
-        course = bytearray()
-        for i in range(FileLength): course.append(0)
-        saveblock = struct.Struct('>II')
-
-        HeaderOffset = 0
-        FileOffset = (14 * 8) + len(rdata)
-        struct.pack_into('{0}s'.format(len(rdata)), course, 0x70, rdata)
-        for block in self.blocks:
-            blocksize = len(block)
-            saveblock.pack_into(course, HeaderOffset, FileOffset, blocksize)
-            if blocksize > 0:
-                course[FileOffset:FileOffset + blocksize] = block
-            HeaderOffset += 8
-            FileOffset += blocksize
-
-        # return stuff
-        return (
-            bytes(course),
-            self.SaveLayer(0),
-            self.SaveLayer(1),
-            self.SaveLayer(2),
-        )
-
     def RemoveFromLayer(self, obj):
         """
         Removes a specific object from the level and updates Z-indices accordingly
@@ -3673,45 +3726,16 @@ class AbstractParsedArea(AbstractArea):
         layer = self.layers[obj.layer]
         idx = layer.index(obj)
         del layer[idx]
+        InvalidateTileRect(obj.LevelRect)
         for i in range(idx, len(layer)):
             upd = layer[i]
             upd.setZValue(upd.zValue() - 1)
 
-    def SortSpritesByZone(self):
+    def MapToZoneIDs(self, things):
         """
-        Sorts the sprite list by zone ID so it will work in-game
+        Returns the id of the zone each thing is in, using the editor's zone index
         """
-
-        split = {}
-        zones = []
-
-        f_MapPositionToZoneID = SLib.MapPositionToZoneID
-        zonelist = self.zones
-
-        for sprite in self.sprites:
-            zone = f_MapPositionToZoneID(zonelist, sprite.objx, sprite.objy)
-            sprite.zoneID = zone
-            if not zone in split:
-                split[zone] = []
-                zones.append(zone)
-            split[zone].append(sprite)
-
-        newlist = []
-        zones.sort()
-        for z in zones:
-            newlist += split[z]
-
-        self.sprites = newlist
-
-    def LoadReggieInfo(self, data):
-        if (data is None) or (len(data) == 0):
-            self.Metadata = Metadata()
-            return
-
-        try:
-            self.Metadata = Metadata(data)
-        except Exception:
-            self.Metadata = Metadata()  # fallback
+        return SLib.MapPositionsToZoneIDs(self.zones, [(thing.objx, thing.objy) for thing in things])
 
 
 class Area_NSMBW(AbstractParsedArea):
@@ -3719,522 +3743,76 @@ class Area_NSMBW(AbstractParsedArea):
     Class for a parsed NSMBW level area
     """
 
-    def __init__(self):
-        """
-        Creates a completely new NSMBW area
-        """
-        # Default tileset names for NSMBW
-        self.tileset0 = 'Pa0_jyotyu'
-        self.tileset1 = ''
-        self.tileset2 = ''
-        self.tileset3 = ''
-
-        self.blocks = [b''] * 14
-        self.blocks[0] = b'Pa0_jyotyu' + bytes(128 - len('Pa0_jyotyu'))
-        self.blocks[1] = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc8\x00\x00\x00\x00\x00\x00\x00\x00'
-        self.blocks[3] = bytes(8)
-        self.blocks[7] = b'\xff\xff\xff\xff'
-
-        self.defEvents = 0
-        self.timeLimit = 200
-        self.creditsFlag = False
-        self.startEntrance = 0
-        self.ambushFlag = False
-        self.toadHouseType = 0
-        self.wrapFlag = False
-        self.unkFlag1 = False
-        self.unkFlag2 = False
-
-        self.unkVal1 = 0
-        self.unkVal2 = 0
-
-        self.entrances = []
-        self.sprites = []
-        self.bounding = []
-        self.bgA = []
-        self.bgB = []
-        self.zones = []
-        self.locations = []
-        self.pathdata = []
-        self.paths = []
-        self.comments = []
-
-        super().__init__()
-
-    def LoadBlocks(self, course):
-        """
-        Loads self.blocks from the course file
-        """
-        self.blocks = [None] * 14
-        getblock = struct.Struct('>II')
-        for i in range(14):
-            data = getblock.unpack_from(course, i * 8)
-            if data[1] == 0:
-                self.blocks[i] = b''
-            else:
-                self.blocks[i] = course[data[0]:data[0] + data[1]]
-
-        self.block1pos = getblock.unpack_from(course, 0)
-
-    def LoadTilesetNames(self):
-        """
-        Loads block 1, the tileset names
-        """
-        data = struct.unpack_from('32s32s32s32s', self.blocks[0])
-        self.tileset0 = data[0].strip(b'\0').decode('latin-1')
-        self.tileset1 = data[1].strip(b'\0').decode('latin-1')
-        self.tileset2 = data[2].strip(b'\0').decode('latin-1')
-        self.tileset3 = data[3].strip(b'\0').decode('latin-1')
-
-    def LoadOptions(self):
-        """
-        Loads block 2, the general options
-        """
-        optdata = self.blocks[1]
-        optstruct = struct.Struct('>IxxxxHh?BxxB?Bx')
-        data = optstruct.unpack(optdata)
-        self.defEvents, wrapByte, self.timeLimit, self.creditsFlag, unkVal, self.startEntrance, self.ambushFlag, self.toadHouseType = data
-        self.wrapFlag = bool(wrapByte & 1)
-        self.unkFlag1 = bool(wrapByte >> 3)
-        self.unkFlag2 = bool(unkVal == 100)
-
-        """
-        Loads block 4, the unknown maybe-more-general-options block
-        """
-        optdata2 = self.blocks[3]
-        optdata2struct = struct.Struct('>xxHHxx')
-        data = optdata2struct.unpack(optdata2)
-        self.unkVal1, self.unkVal2 = data
-
     def LoadEntrances(self):
         """
         Loads block 7, the entrances
         """
-        entdata = self.blocks[6]
-        entcount = len(entdata) // 20
-        entstruct = struct.Struct('>HHxxxxBBBBxBBBHxB')
-        offset = 0
-        entrances = []
-        for i in range(entcount):
-            data = entstruct.unpack_from(entdata, offset)
-            entrances.append(
-                EntranceItem(data[0], data[1], data[2], data[3], data[4], data[5], data[6], data[7], data[8], data[9],
-                             data[10]))
-            offset += 20
-        self.entrances = entrances
+        self.entrances = [
+            EntranceItem(e.objx, e.objy, e.entid, e.destarea, e.destentrance, e.enttype, e.entzone, e.entlayer,
+                         e.entpath, e.entsettings, e.cpdirection)
+            for e in levelcore.ReadEntrances(self.blocks[6])
+        ]
 
     def LoadSprites(self):
         """
         Loads block 8, the sprites
         """
-        spritedata = self.blocks[7]
-        sprcount = len(spritedata) // 16
-        sprstruct = struct.Struct('>HHH8sxx')
-        offset = 0
-        sprites = []
-
-        unpack = sprstruct.unpack_from
-        append = sprites.append
         obj = SpriteItem
-        for i in range(sprcount):
-            data = unpack(spritedata, offset)
-            append(obj(data[0], data[1], data[2], data[3]))
-            offset += 16
-        self.sprites = sprites
+        self.sprites = [obj(s.type, s.objx, s.objy, s.spritedata) for s in levelcore.ReadSprites(self.blocks[7])]
 
     def LoadZones(self):
         """
-        Loads block 3, the bounding preferences
-        """
-        bdngdata = self.blocks[2]
-        count = len(bdngdata) // 24
-        bdngstruct = struct.Struct('>llllxBxBxxxx')
-        offset = 0
-        bounding = []
-        for i in range(count):
-            datab = bdngstruct.unpack_from(bdngdata, offset)
-            bounding.append([datab[0], datab[1], datab[2], datab[3], datab[4], datab[5]])
-            offset += 24
-        self.bounding = bounding
-
-        """
-        Loads block 5, the top level background values
-        """
-        bgAdata = self.blocks[4]
-        bgAcount = len(bgAdata) // 24
-        bgAstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
-        offset = 0
-        bgA = []
-        for i in range(bgAcount):
-            data = bgAstruct.unpack_from(bgAdata, offset)
-            bgA.append([data[0], data[1], data[2], data[3], data[4], data[5], data[6], data[7], data[8]])
-            offset += 24
-        self.bgA = bgA
-
-        """
-        Loads block 6, the bottom level background values
-        """
-        bgBdata = self.blocks[5]
-        bgBcount = len(bgBdata) // 24
-        bgBstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
-        offset = 0
-        bgB = []
-        for i in range(bgBcount):
-            datab = bgBstruct.unpack_from(bgBdata, offset)
-            bgB.append([datab[0], datab[1], datab[2], datab[3], datab[4], datab[5], datab[6], datab[7], datab[8]])
-            offset += 24
-        self.bgB = bgB
-
-        """
-        Loads block 10, the zone data
-        """
-        zonedata = self.blocks[9]
-        zonestruct = struct.Struct('>HHHHHHBBBBxBBBBxBB')
-        count = len(zonedata) // 24
-        offset = 0
+        Loads block 10, the zones (with blocks 3, 5 and 6)
+        """
         zones = []
-        for i in range(count):
-            dataz = zonestruct.unpack_from(zonedata, offset)
-
-            # Find the proper bounding
-            boundObj = None
-            id = dataz[7]
-            for checkb in self.bounding:
-                if checkb[4] == id: boundObj = checkb
-
+        for z in levelcore.ReadZones(self.blocks[2], self.blocks[4], self.blocks[5], self.blocks[9]):
             zones.append(
-                ZoneItem(dataz[0], dataz[1], dataz[2], dataz[3], dataz[4], dataz[5], dataz[6], dataz[7], dataz[8],
-                         dataz[9], dataz[10], dataz[11], dataz[12], dataz[13], dataz[14], dataz[15], boundObj, bgA, bgB,
-                         i))
-            offset += 24
+                ZoneItem(z.objx, z.objy, z.width, z.height, z.modeldark, z.terraindark, z.id, z.block3id, z.cammode,
+                         z.camzoom, z.visibility, z.block5id, z.block6id, z.camtrack, z.music, z.sfxmod,
+                         z.bounding(), [z.bgA()], [z.bgB()], z.id))
         self.zones = zones
 
     def LoadLocations(self):
         """
         Loads block 11, the locations
         """
-        locdata = self.blocks[10]
-        locstruct = struct.Struct('>HHHHBxxx')
-        count = len(locdata) // 12
-        offset = 0
-        locations = []
-        for i in range(count):
-            data = locstruct.unpack_from(locdata, offset)
-            locations.append(LocationItem(data[0], data[1], data[2], data[3], data[4]))
-            offset += 12
-        self.locations = locations
+        self.locations = [
+            LocationItem(l.objx, l.objy, l.width, l.height, l.id) for l in levelcore.ReadLocations(self.blocks[10])
+        ]
 
     def LoadLayer(self, idx, layerdata):
         """
         Loads a specific object layer from a string
         """
-        objcount = len(layerdata) // 10
-        objstruct = struct.Struct('>HHHHH')
-        offset = 0
         z = (2 - idx) * 8192
 
         layer = self.layers[idx]
         append = layer.append
         obj = ObjectItem
-        unpack = objstruct.unpack_from
-        for i in range(objcount):
-            data = unpack(layerdata, offset)
-            append(obj(data[0] >> 12, data[0] & 4095, idx, data[1], data[2], data[3], data[4], z))
+        for o in levelcore.ReadLayer(layerdata, idx):
+            append(obj(o.tileset, o.type, idx, o.objx, o.objy, o.width, o.height, z))
             z += 1
-            offset += 10
 
     def LoadPaths(self):
         """
-        Loads block 12, the paths
+        Loads block 13, the paths, and block 14, their nodes
         """
-        # Path struct: >BxHHH
-        pathdata = self.blocks[12]
-        pathcount = len(pathdata) // 8
-        pathstruct = struct.Struct('>BxHHH')
-        offset = 0
-        unpack = pathstruct.unpack_from
-        pathinfo = []
-        paths = []
-        for i in range(pathcount):
-            data = unpack(pathdata, offset)
-            nodes = self.LoadPathNodes(data[1], data[2])
-            add2p = {'id': int(data[0]),
-                     'nodes': [],
-                     'loops': data[3] == 2
-                     }
-            for node in nodes:
-                add2p['nodes'].append(node)
-            pathinfo.append(add2p)
-
-            offset += 8
-
-        for i in range(pathcount):
-            xpi = pathinfo[i]
-            for xpj in xpi['nodes']:
-                paths.append(PathItem(xpj['x'], xpj['y'], xpi, xpj))
-
-        self.pathdata = pathinfo
-        self.paths = paths
-
-    def LoadPathNodes(self, startindex, count):
-        """
-        Loads block 13, the path nodes
-        """
-        # PathNode struct: >HHffhxx
-        ret = []
-        nodedata = self.blocks[13]
-        nodestruct = struct.Struct('>HHffhxx')
-        offset = startindex * 16
-        unpack = nodestruct.unpack_from
-        for i in range(count):
-            data = unpack(nodedata, offset)
-            ret.append({'x': int(data[0]),
-                        'y': int(data[1]),
-                        'speed': float(data[2]),
-                        'accel': float(data[3]),
-                        'delay': int(data[4])
-                        # 'id':i
-                        })
-            offset += 16
-        return ret
+        self.pathdata = levelcore.ReadPaths(self.blocks[12], self.blocks[13])
+        self.paths = [PathItem(node['x'], node['y'], path, node) for path in self.pathdata for node in path['nodes']]
 
     def LoadComments(self):
         """
         Loads the comments from self.Metadata
         """
         self.comments = []
-        b = self.Metadata.binData('InLevelComments_A%d' % self.areanum)
-        if b is None: return
-        idx = 0
-        while idx < len(b):
-            xpos = b[idx] << 24
-            xpos |= b[idx + 1] << 16
-            xpos |= b[idx + 2] << 8
-            xpos |= b[idx + 3]
-            idx += 4
-            ypos = b[idx] << 24
-            ypos |= b[idx + 1] << 16
-            ypos |= b[idx + 2] << 8
-            ypos |= b[idx + 3]
-            idx += 4
-            tlen = b[idx] << 24
-            tlen |= b[idx + 1] << 16
-            tlen |= b[idx + 2] << 8
-            tlen |= b[idx + 3]
-            idx += 4
-            s = ''
-            for char in range(tlen):
-                s += chr(b[idx])
-                idx += 1
-
-            com = CommentItem(xpos, ypos, s)
+        for c in levelcore.ReadComments(self.Metadata.binData('InLevelComments_A%d' % self.areanum)):
+            com = CommentItem(c.objx, c.objy, c.text)
             com.listitem = QtWidgets.QListWidgetItem()
 
             self.comments.append(com)
 
             com.UpdateListItem()
 
-    def SaveTilesetNames(self):
-        """
-        Saves the tileset names back to block 1
-        """
-        self.blocks[0] = ''.join(
-            [self.tileset0.ljust(32, '\0'), self.tileset1.ljust(32, '\0'), self.tileset2.ljust(32, '\0'),
-             self.tileset3.ljust(32, '\0')]).encode('latin-1')
-
-    def SaveOptions(self):
-        """
-        Saves block 2, the general options
-        """
-        optstruct = struct.Struct('>IxxxxHh?BBBB?Bx')
-
-        wrapByte = 1 if self.wrapFlag else 0
-        if self.unkFlag1: wrapByte |= 8
-        unkVal = 100 if self.unkFlag2 else 0
-
-        self.blocks[1] = optstruct.pack(self.defEvents, wrapByte, self.timeLimit, self.creditsFlag, unkVal, unkVal,
-                                        unkVal, self.startEntrance, self.ambushFlag, self.toadHouseType)
-
-        """
-        Saves block 4, the unknown maybe-more-general-options block
-        """
-        optdata2struct = struct.Struct('>xxHHxx')
-        self.blocks[3] = optdata2struct.pack(self.unkVal1, self.unkVal2)
-
-    def SaveLayer(self, idx):
-        """
-        Saves an object layer to a string
-        """
-        layer = self.layers[idx]
-        offset = 0
-        objstruct = struct.Struct('>HHHHH')
-        buffer = bytearray((len(layer) * 10) + 2)
-        f_int = int
-        for obj in layer:
-            objstruct.pack_into(buffer,
-                                offset,
-                                f_int((obj.tileset << 12) | obj.type),
-                                f_int(obj.objx),
-                                f_int(obj.objy),
-                                f_int(obj.width),
-                                f_int(obj.height))
-            offset += 10
-        buffer[offset] = 0xFF
-        buffer[offset + 1] = 0xFF
-        return bytes(buffer)
-
-    def SaveEntrances(self):
-        """
-        Saves the entrances back to block 7
-        """
-        offset = 0
-        entstruct = struct.Struct('>HHxxxxBBBBxBBBHxB')
-        buffer = bytearray(len(self.entrances) * 20)
-        zonelist = self.zones
-        for entrance in self.entrances:
-            zoneID = SLib.MapPositionToZoneID(zonelist, entrance.objx, entrance.objy)
-            entstruct.pack_into(buffer, offset, int(entrance.objx), int(entrance.objy),
-                                int(entrance.entid), int(entrance.destarea), int(entrance.destentrance),
-                                int(entrance.enttype), zoneID, int(entrance.entlayer), int(entrance.entpath),
-                                int(entrance.entsettings), int(entrance.cpdirection))
-            offset += 20
-        self.blocks[6] = bytes(buffer)
-
-    def SavePaths(self):
-        """
-        Saves the paths back to block 13
-        """
-        pathstruct = struct.Struct('>BxHHH')
-        nodecount = 0
-        for path in self.pathdata:
-            nodecount += len(path['nodes'])
-        nodebuffer = bytearray(nodecount * 16)
-        nodeoffset = 0
-        nodeindex = 0
-        offset = 0
-        buffer = bytearray(len(self.pathdata) * 8)
-        # [20:28:38]  [@Treeki] struct Path { unsigned char id; char padding; unsigned short startNodeIndex; unsigned short nodeCount; unsigned short unknown; };
-        for path in self.pathdata:
-            if (len(path['nodes']) < 1): continue
-            self.WritePathNodes(nodebuffer, nodeoffset, path['nodes'])
-
-            pathstruct.pack_into(buffer, offset, int(path['id']), int(nodeindex), int(len(path['nodes'])),
-                                 2 if path['loops'] else 0)
-            offset += 8
-            nodeoffset += len(path['nodes']) * 16
-            nodeindex += len(path['nodes'])
-
-        self.blocks[12] = bytes(buffer)
-        self.blocks[13] = bytes(nodebuffer)
-
-    def WritePathNodes(self, buffer, offst, nodes):
-        """
-        Writes the path node data to the block 14 bytearray
-        """
-        offset = int(offst)
-        # [20:29:04]  [@Treeki] struct PathNode { unsigned short x; unsigned short y; float speed; float unknownMaybeAccel; short unknown; char padding[2]; }
-        nodestruct = struct.Struct('>HHffhxx')
-        for node in nodes:
-            nodestruct.pack_into(buffer, offset, int(node['x']), int(node['y']), float(node['speed']),
-                                 float(node['accel']), int(node['delay']))
-            offset += 16
-
-    def SaveSprites(self):
-        """
-        Saves the sprites back to block 8
-        """
-        offset = 0
-        sprstruct = struct.Struct('>HHH6sB1sxx')
-        buffer = bytearray((len(self.sprites) * 16) + 4)
-        f_int = int
-        for sprite in self.sprites:
-            try:
-                sprstruct.pack_into(buffer, offset, f_int(sprite.type), f_int(sprite.objx), f_int(sprite.objy),
-                                    sprite.spritedata[:6], sprite.zoneID, bytes([sprite.spritedata[7], ]))
-            except:
-                # Hopefully this will solve the mysterious bug, and will
-                # soon no longer be necessary.
-                raise ValueError('SaveSprites struct.error. Current sprite data dump:\n' + \
-                                 str(offset) + '\n' + \
-                                 str(sprite.type) + '\n' + \
-                                 str(sprite.objx) + '\n' + \
-                                 str(sprite.objy) + '\n' + \
-                                 str(sprite.spritedata[:6]) + '\n' + \
-                                 str(sprite.zoneID) + '\n' + \
-                                 str(bytes([sprite.spritedata[7], ])) + '\n',
-                                 )
-            offset += 16
-        buffer[offset] = 0xFF
-        buffer[offset + 1] = 0xFF
-        buffer[offset + 2] = 0xFF
-        buffer[offset + 3] = 0xFF
-        self.blocks[7] = bytes(buffer)
-
-    def SaveLoadedSprites(self):
-        """
-        Saves the list of loaded sprites back to block 9
-        """
-        ls = []
-        for sprite in self.sprites:
-            if sprite.type not in ls: ls.append(sprite.type)
-        ls.sort()
-
-        offset = 0
-        sprstruct = struct.Struct('>Hxx')
-        buffer = bytearray(len(ls) * 4)
-        for s in ls:
-            sprstruct.pack_into(buffer, offset, int(s))
-            offset += 4
-        self.blocks[8] = bytes(buffer)
-
-    def SaveZones(self):
-        """
-        Saves blocks 10, 3, 5 and 6, the zone data, boundings, bgA and bgB data respectively
-        """
-        bdngstruct = struct.Struct('>llllxBxBxxxx')
-        bgAstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
-        bgBstruct = struct.Struct('>xBhhhhHHHxxxBxxxx')
-        zonestruct = struct.Struct('>HHHHHHBBBBxBBBBxBB')
-        offset = 0
-        i = 0
-        zcount = len(Area.zones)
-        buffer2 = bytearray(24 * zcount)
-        buffer4 = bytearray(24 * zcount)
-        buffer5 = bytearray(24 * zcount)
-        buffer9 = bytearray(24 * zcount)
-        for z in Area.zones:
-            if z.objx < 0: z.objx = 0
-            if z.objy < 0: z.objy = 0
-            bdngstruct.pack_into(buffer2, offset, z.yupperbound, z.ylowerbound, z.yupperbound2, z.ylowerbound2, i, 0xF)
-            bgAstruct.pack_into(buffer4, offset, i, z.XscrollA, z.YscrollA, z.YpositionA, z.XpositionA, z.bg1A, z.bg2A,
-                                z.bg3A, z.ZoomA)
-            bgBstruct.pack_into(buffer5, offset, i, z.XscrollB, z.YscrollB, z.YpositionB, z.XpositionB, z.bg1B, z.bg2B,
-                                z.bg3B, z.ZoomB)
-            zonestruct.pack_into(buffer9, offset, z.objx, z.objy, z.width, z.height, z.modeldark, z.terraindark, i, i,
-                                 z.cammode, z.camzoom, z.visibility, i, i, z.camtrack, z.music, z.sfxmod)
-            offset += 24
-            i += 1
-
-        self.blocks[2] = bytes(buffer2)
-        self.blocks[4] = bytes(buffer4)
-        self.blocks[5] = bytes(buffer5)
-        self.blocks[9] = bytes(buffer9)
-
-    def SaveLocations(self):
-        """
-        Saves block 11, the location data
-        """
-        locstruct = struct.Struct('>HHHHBxxx')
-        offset = 0
-        zcount = len(Area.locations)
-        buffer = bytearray(12 * zcount)
-
-        for z in Area.locations:
-            locstruct.pack_into(buffer, offset, int(z.objx), int(z.objy), int(z.width), int(z.height), int(z.id))
-            offset += 12
-
-        self.blocks[10] = bytes(buffer)
-
     def RemoveFromLayer(self, obj):
         """
         Removes a specific object from the level and updates Z indexes accordingly
@@ -4242,46 +3820,11 @@ class Area_NSMBW(AbstractParsedArea):
         layer = self.layers[obj.layer]
         idx = layer.index(obj)
         del layer[idx]
+        InvalidateTileRect(obj.LevelRect)
         for i in range(idx, len(layer)):
             upd = layer[i]
             upd.setZValue(upd.zValue() - 1)
 
-    def SortSpritesByZone(self):
-        """
-        Sorts the sprite list by zone ID so it will work in-game
-        """
-
-        split = {}
-        zones = []
-
-        f_MapPositionToZoneID = SLib.MapPositionToZoneID
-        zonelist = self.zones
-
-        for sprite in self.sprites:
-            zone = f_MapPositionToZoneID(zonelist, sprite.objx, sprite.objy)
-            sprite.zoneID = zone
-            if not zone in split:
-                split[zone] = []
-                zones.append(zone)
-            split[zone].append(sprite)
-
-        newlist = []
-        zones.sort()
-        for z in zones:
-            newlist += split[z]
-
-        self.sprites = newlist
-
-    def LoadReggieInfo(self, data):
-        if (data is None) or (len(data) == 0):
-            self.Metadata = Metadata()
-            return
-
-        try:
-            self.Metadata = Metadata(data)
-        except Exception:
-            self.Metadata = Metadata()  # fallback
-
 
 class InstanceDefinition:
     """
@@ -4523,6 +4066,44 @@ class ListWidgetItem_SortsByOther(QtWidgets.QListWidgetItem):
         return self.reference < other.reference
 
 
+class LevelItemListEntry:
+    """
+    A row of a LevelItemListModel. Stands in for a QListWidgetItem, but
+    only builds its text once the row is actually displayed.
+    """
+
+    def __init__(self, reference, text=None):
+        self.reference = reference
+        self.model = None
+        self.text_ = text or None
+        self.tooltip = None
+
+    def __lt__(self, other):
+        return self.reference < other.reference
+
+    def text(self):
+        if self.text_ is None:
+            self.text_ = self.reference.ListString()
+
+        return self.text_
+
+    def setText(self, text):
+        shown = self.text_ is not None
+        self.text_ = text
+        if self.model is not None: self.model.entryChanged(self, shown)
+
+    def setToolTip(self, tooltip):
+        self.tooltip = tooltip
+
+    def invalidate(self):
+        """
+        Drops the cached text, so it's rebuilt the next time it's shown
+        """
+        shown = self.text_ is not None
+        self.text_ = None
+        if self.model is not None: self.model.entryChanged(self, shown)
+
+
 class LevelEditorItem(QtWidgets.QGraphicsItem):
     """
     Class for any type of item that can show up in the level editor control
@@ -4638,8 +4219,18 @@ class LevelEditorItem(QtWidgets.QGraphicsItem):
 
             return newpos
 
+        elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            self.UpdateOverview()
+
         return QtWidgets.QGraphicsItem.itemChange(self, change, value)
 
+    def UpdateOverview(self):
+        """
+        Has the part of the level overview this item covers re-rendered
+        """
+        if mainWindow is not None and not LevelPopulating:
+            mainWindow.levelOverview.InvalidateItem(self)
+
     def getFullRect(self):
         """
         Basic implementation that returns self.BoundingRect
@@ -4664,7 +4255,10 @@ class LevelEditorItem(QtWidgets.QGraphicsItem):
 
             self.listitem.setToolTip('<img src="data:image/png;base64,' + b64 + '" />')
 
-        self.listitem.setText(self.ListString())
+        if isinstance(self.listitem, LevelItemListEntry):
+            self.listitem.invalidate()
+        else:
+            self.listitem.setText(self.ListString())
 
     def renderInLevelIcon(self):
         """
@@ -4726,6 +4320,7 @@ class ObjectItem(LevelEditorItem):
     Level editor item that represents an ingame object
     """
     instanceDef = InstanceDefinition_ObjectItem
+    tooltipPending = False
 
     def __init__(self, tileset, type, layer, x, y, width, height, z):
         """
@@ -4761,7 +4356,6 @@ class ObjectItem(LevelEditorItem):
         DirtyOverride -= 1
 
         self.setZValue(z)
-        self.UpdateTooltip()
 
         if layer == 0:
             self.setVisible(Layer0Shown)
@@ -4771,7 +4365,12 @@ class ObjectItem(LevelEditorItem):
             self.setVisible(Layer2Shown)
 
         self.updateObjCache()
-        self.UpdateTooltip()
+
+        if LevelPopulating:
+            # LevelScene.helpEvent sets it when it's first needed
+            self.tooltipPending = True
+        else:
+            self.UpdateTooltip()
 
     def UpdateSearchDatabase(self):
         y = 0
@@ -4832,6 +4431,7 @@ class ObjectItem(LevelEditorItem):
         """
         Updates the tooltip
         """
+        self.tooltipPending = False
         self.setToolTip(
             trans.string('Objects', 0, '[tileset]', self.tileset + 1, '[obj]', self.type, '[width]', self.width,
                          '[height]', self.height, '[layer]', self.layer))
@@ -4842,7 +4442,11 @@ class ObjectItem(LevelEditorItem):
         """
         self.objdata = RenderObject(self.tileset, self.type, self.width, self.height)
         self.randomise()
-        self.UpdateSearchDatabase()
+        InvalidateTileRect(self.LevelRect)
+
+        # LoadLevel resets the search database once the level is loaded
+        if not LevelPopulating:
+            self.UpdateSearchDatabase()
 
     def randomise(self, startx=0, starty=0, width=None, height=None):
         """
@@ -4993,6 +4597,7 @@ class ObjectItem(LevelEditorItem):
                 self.objdata[y] += new[y]
             self.randomise(self.width, 0, width - self.width, height)
 
+        InvalidateTileRect(QtCore.QRectF(self.objx, self.objy, max(width, self.width), max(height, self.height)))
         self.UpdateSearchDatabase()
 
     def UpdateRects(self):
@@ -5019,7 +4624,11 @@ class ObjectItem(LevelEditorItem):
         self.GrabberRectMB = QtCore.QRectF(((24 * self.width) - grabberwidth) / 2, (24 * self.height) - grabberwidth, grabberwidth, grabberwidth)
         self.GrabberRectMR = QtCore.QRectF((24 * self.width) - grabberwidth, ((24 * self.height) - grabberwidth) / 2, grabberwidth, grabberwidth)
 
+        if hasattr(self, 'LevelRect'):
+            InvalidateTileRect(self.LevelRect)
         self.LevelRect = QtCore.QRectF(self.objx, self.objy, self.width, self.height)
+        InvalidateTileRect(self.LevelRect)
+        self.UpdateOverview()
 
     def itemChange(self, change, value):
         """
@@ -5047,7 +4656,9 @@ class ObjectItem(LevelEditorItem):
             x = int(newpos.x() / 24)
             y = int(newpos.y() / 24)
             if x != self.objx or y != self.objy:
+                InvalidateTileRect(self.LevelRect)
                 self.LevelRect.moveTo(x, y)
+                InvalidateTileRect(self.LevelRect)
 
                 oldx = self.objx
                 oldy = self.objy
@@ -5074,6 +4685,11 @@ class ObjectItem(LevelEditorItem):
 
             return newpos
 
+        elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            # added to or removed from the level
+            InvalidateTileRect(self.LevelRect)
+            self.UpdateOverview()
+
         return QtWidgets.QGraphicsItem.itemChange(self, change, value)
 
     def paint(self, painter, option, widget):
@@ -5638,6 +5254,11 @@ class ZoneItem(LevelEditorItem):
         self.GrabberRectBR = QtCore.QRectF(int(self.width * 1.5) - grabberWidth, int(self.height * 1.5) - grabberWidth,
                                            grabberWidth, grabberWidth)
 
+        if hasattr(Area, 'zoneEffectSprites'):
+            Area.InvalidateZoneEffectSprites()
+
+        self.UpdateOverview()
+
     def paint(self, painter, option, widget):
         """
         Paints the zone on screen
@@ -5660,12 +5281,8 @@ class ZoneItem(LevelEditorItem):
             zoneRect = QtCore.QRectF(self.objx * 1.5, self.objy * 1.5, self.width * 1.5, self.height * 1.5)
             viewRect = mainWindow.view.mapToScene(mainWindow.view.viewport().rect()).boundingRect()
 
-            for sprite in Area.sprites:
-                if sprite.type in [64, 138, 139, 216, 358, 374, 435]:
-                    spriteZoneID = SLib.MapPositionToZoneID(Area.zones, sprite.objx, sprite.objy)
-
-                    if self.id == spriteZoneID:
-                        sprite.ImageObj.realViewZone(painter, zoneRect, viewRect)
+            for sprite in Area.GetZoneEffectSprites(self.id):
+                sprite.ImageObj.realViewZone(painter, zoneRect, viewRect)
 
         # Now paint the borders
         painter.setPen(QtGui.QPen(theme.color('zone_lines'), 3))
@@ -5790,7 +5407,6 @@ class ZoneItem(LevelEditorItem):
             self.setPos(int(self.objx * 1.5), int(self.objy * 1.5))
             self.scene().update(updaterect)
 
-            mainWindow.levelOverview.update()
             SetDirty()
 
             event.accept()
@@ -5801,6 +5417,11 @@ class ZoneItem(LevelEditorItem):
         """
         Avoids snapping for zones
         """
+        if change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            if hasattr(Area, 'zoneEffectSprites'):
+                Area.InvalidateZoneEffectSprites()
+            self.UpdateOverview()
+
         return QtWidgets.QGraphicsItem.itemChange(self, change, value)
 
 
@@ -5869,6 +5490,7 @@ class LocationItem(LevelEditorItem):
         self.DrawRect = QtCore.QRectF(1, 1, (self.width * 1.5) - 2, (self.height * 1.5) - 2)
         self.GrabberRect = QtCore.QRectF(((1.5) * self.width) - 4.8, ((1.5) * self.height) - 4.8, 4.8, 4.8)
         self.UpdateListItem()
+        self.UpdateOverview()
 
     def paint(self, painter, option, widget):
         """
@@ -5941,7 +5563,6 @@ class LocationItem(LevelEditorItem):
                 self.UpdateRects()
                 self.scene().update(updaterect)
                 SetDirty()
-                mainWindow.levelOverview.update()
 
                 if self.sizeChanged is not None:
                     self.sizeChanged(self, self.width, self.height)
@@ -5993,8 +5614,12 @@ class SpriteItem(LevelEditorItem):
         self.LevelRect = QtCore.QRectF(self.objx / 16, self.objy / 16, 1.5, 1.5)
         self.ChangingPos = False
 
+        # The real sprite image and its auxiliary items are only created once
+        # the sprite comes near the view (see ReggieWindow.UpdateSpriteImages)
         SLib.SpriteImage.loadImages()
         self.ImageObj = SLib.SpriteImage(self)
+        self.imageRealized = False
+        self.lastNearView = 0
 
         try:
             sname = Sprites[type].name
@@ -6029,6 +5654,9 @@ class SpriteItem(LevelEditorItem):
         self.setToolTip(trans.string('Sprites', 0, '[type]', type, '[name]', self.name))
         self.type = type
 
+        if hasattr(Area, 'zoneEffectSprites'):
+            Area.UpdateZoneEffectSprite(self)
+
         self.InitializeSprite()
 
         self.UpdateListItem()
@@ -6165,9 +5793,34 @@ class SpriteItem(LevelEditorItem):
         self.name = Sprites[type].name
         self.setToolTip(trans.string('Sprites', 0, '[type]', self.type, '[name]', self.name))
 
+        # Zone effect sprites are drawn by their zones in Real View, so they
+        # always need their real image
+        if self.imageRealized or type in AbstractParsedArea.ZoneEffectSpriteTypes:
+            self.RealizeImage(True)
+
+    def RealizeImage(self, force=False):
+        """
+        Creates the real sprite image and auxiliary objects, if needed
+        """
+        if self.imageRealized and not force: return
+        self.imageRealized = True
+
         imgs = gamedef.getImageClasses()
-        if type in imgs:
-            self.setImageObj(imgs[type])
+        if self.type in imgs:
+            self.setImageObj(imgs[self.type])
+        elif type(self.ImageObj) is not SLib.SpriteImage:
+            self.setImageObj(SLib.SpriteImage)
+
+    def ReleaseImage(self):
+        """
+        Replaces the sprite image with a plain spritebox, freeing its
+        auxiliary objects
+        """
+        if not self.imageRealized: return
+        self.imageRealized = False
+
+        if type(self.ImageObj) is not SLib.SpriteImage:
+            self.setImageObj(SLib.SpriteImage)
 
     def setImageObj(self, obj):
         """
@@ -6180,8 +5833,9 @@ class SpriteItem(LevelEditorItem):
         self.setZValue(26000)
         self.resetTransform()
 
-        if (self.type in gamedef.getImageClasses()) and (self.type not in SLib.SpriteImagesLoaded):
-            gamedef.getImageClasses()[self.type].loadImages()
+        imgs = gamedef.getImageClasses()
+        if (self.type in imgs) and (self.type not in SLib.SpriteImagesLoaded):
+            imgs[self.type].loadImages()
             SLib.SpriteImagesLoaded.add(self.type)
         self.ImageObj = obj(self)
 
@@ -6295,11 +5949,14 @@ class SpriteItem(LevelEditorItem):
                 self.ImageObj.spritebox.BoundingRect.topLeft().y(),
             )
 
+        self.UpdateOverview()
+
     def getFullRect(self):
         """
         Returns a rectangle that contains the sprite and all
         auxiliary objects.
         """
+        self.RealizeImage()
         self.UpdateRects()
 
         br = self.BoundingRect.translated(
@@ -6410,6 +6067,9 @@ class SpriteItem(LevelEditorItem):
                 if self.positionChanged is not None:
                     self.positionChanged(self, oldx, oldy, x, y)
 
+                if self.type in AbstractParsedArea.ZoneEffectSpriteTypes and hasattr(Area, 'zoneEffectSprites'):
+                    Area.UpdateZoneEffectSprite(self)
+
                 if len(mainWindow.CurrentSelection) == 1:
                     act = MoveItemUndoAction(self, oldx, oldy, x, y)
                     mainWindow.undoStack.addOrExtendAction(act)
@@ -6422,6 +6082,15 @@ class SpriteItem(LevelEditorItem):
 
             return newpos
 
+        elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            # added to or removed from the level (sprites are added to the
+            # scene before they're appended to Area.sprites)
+            if self.type in AbstractParsedArea.ZoneEffectSpriteTypes and hasattr(Area, 'zoneEffectSprites'):
+                Area.UpdateZoneEffectSprite(self, value is not None)
+            self.UpdateOverview()
+            if value is not None and not self.imageRealized and mainWindow is not None:
+                mainWindow.QueueSpriteImageUpdate()
+
         return QtWidgets.QGraphicsItem.itemChange(self, change, value)
 
     def setNewObjPos(self, newobjx, newobjy):
@@ -6429,10 +6098,15 @@ class SpriteItem(LevelEditorItem):
         Sets a new position, through objx and objy
         """
         self.objx, self.objy = newobjx, newobjy
+
+        if self.type in AbstractParsedArea.ZoneEffectSpriteTypes and hasattr(Area, 'zoneEffectSprites'):
+            Area.UpdateZoneEffectSprite(self)
         if SpriteImagesShown:
             self.setPos((newobjx + self.ImageObj.xOffset) * 1.5, (newobjy + self.ImageObj.yOffset) * 1.5)
         else:
             self.setPos(newobjx * 1.5, newobjy * 1.5)
+        if not self.imageRealized and mainWindow is not None:
+            mainWindow.QueueSpriteImageUpdate()
 
     def mousePressEvent(self, event):
         """
@@ -6450,7 +6124,7 @@ class SpriteItem(LevelEditorItem):
             return
 
         newitem = SpriteItem(self.type, self.objx, self.objy, self.spritedata)
-        newitem.listitem = ListWidgetItem_SortsByOther(newitem, newitem.ListString())
+        newitem.listitem = LevelItemListEntry(newitem)
 
         mainWindow.spriteList.addItem(newitem.listitem)
         Area.sprites.append(newitem)
@@ -6550,6 +6224,7 @@ class SpriteItem(LevelEditorItem):
         mainWindow.UpdateFlag = False
         sprlist.selectionModel().clearSelection()
         Area.sprites.remove(self)
+        Area.UpdateZoneEffectSprite(self)
         # self.scene().update(self.x(), self.y(), self.BoundingRect.width(), self.BoundingRect.height())
         self.scene().update()  # The zone painters need for the whole thing to update
 
@@ -7269,6 +6944,13 @@ class LevelOverviewWidget(QtWidgets.QWidget):
         self.Wlocator = 80
         self.mainWindowScale = 1
 
+        self.contentCache = None
+        self.contentCacheKey = None
+        self.contentDirty = True
+        self.dirtyRect = None
+        self.dirtyItems = set()
+        self.drawnRects = {} # item: (left, top, right, bottom) it was last drawn at
+
     def Reset(self):
         """
         Resets the max and scale variables
@@ -7278,6 +6960,7 @@ class LevelOverviewWidget(QtWidgets.QWidget):
         self.maxY = 1
         self.CalcSize()
         self.Rescale()
+        self.Invalidate()
 
     def CalcSize(self):
         """
@@ -7285,112 +6968,251 @@ class LevelOverviewWidget(QtWidgets.QWidget):
         """
         self.posmult = 24.0 / self.scale
 
-    def mouseMoveEvent(self, event):
+    def mouseMoveEvent(self, event):
+        """
+        Handles mouse movement over the widget
+        """
+        QtWidgets.QWidget.mouseMoveEvent(self, event)
+
+        if event.buttons() == Qt.LeftButton:
+            self.moveIt.emit(event.pos().x() * self.posmult, event.pos().y() * self.posmult)
+
+    def mousePressEvent(self, event):
+        """
+        Handles mouse pressing events over the widget
+        """
+        QtWidgets.QWidget.mousePressEvent(self, event)
+
+        if event.button() == Qt.LeftButton:
+            self.moveIt.emit(event.pos().x() * self.posmult, event.pos().y() * self.posmult)
+
+    def Invalidate(self, rect=None):
+        """
+        Marks the cached overview image as stale and schedules a repaint.
+        If rect (in blocks) is given, only that part of it is re-rendered.
+        """
+        if rect is None:
+            self.contentDirty = True
+        elif not self.contentDirty:
+            self.dirtyRect = QtCore.QRectF(rect) if self.dirtyRect is None else self.dirtyRect.united(rect)
+
+        self.update()
+
+    def InvalidateItem(self, item):
+        """
+        Re-renders the parts of the overview where an item was last drawn
+        and where it is now
+        """
+        if self.contentDirty: return
+
+        rect = self.ItemRect(item)
+        if rect is None: return
+
+        old = self.drawnRects.get(item)
+        if old is not None:
+            rect = rect.united(QtCore.QRectF(old[0], old[1], old[2] - old[0], old[3] - old[1]))
+
+        self.dirtyItems.add(item)
+        self.Invalidate(rect)
+
+    @staticmethod
+    def ItemRect(item):
         """
-        Handles mouse movement over the widget
+        Returns the rect an item covers in the overview, in blocks, or None
+        if it isn't shown there
         """
-        QtWidgets.QWidget.mouseMoveEvent(self, event)
+        if isinstance(item, (ZoneItem, LocationItem)):
+            return QtCore.QRectF(item.objx / 16, item.objy / 16, item.width / 16, item.height / 16)
+        elif isinstance(item, (ObjectItem, SpriteItem, EntranceItem)):
+            return QtCore.QRectF(item.LevelRect)
 
-        if event.buttons() == Qt.LeftButton:
-            self.moveIt.emit(event.pos().x() * self.posmult, event.pos().y() * self.posmult)
+        return None
 
-    def mousePressEvent(self, event):
+    def CalcBounds(self):
         """
-        Handles mouse pressing events over the widget
+        Calculates the extent of the level contents, in blocks
         """
-        QtWidgets.QWidget.mousePressEvent(self, event)
+        maxX = 0
+        maxY = 0
 
-        if event.button() == Qt.LeftButton:
-            self.moveIt.emit(event.pos().x() * self.posmult, event.pos().y() * self.posmult)
+        for zone in Area.zones:
+            maxX = max(maxX, (zone.objx + zone.width) / 16)
+            maxY = max(maxY, (zone.objy + zone.height) / 16)
 
-    def paintEvent(self, event):
+        for layer in Area.layers:
+            for obj in layer:
+                maxX = max(maxX, obj.objx)
+                maxY = max(maxY, obj.objy)
+
+        for sprite in Area.sprites:
+            maxX = max(maxX, sprite.objx / 16)
+            maxY = max(maxY, sprite.objy / 16)
+
+        for ent in Area.entrances:
+            maxX = max(maxX, ent.objx / 16)
+            maxY = max(maxY, ent.objy / 16)
+
+        for location in Area.locations:
+            maxX = max(maxX, (location.objx + location.width) / 16)
+            maxY = max(maxY, (location.objy + location.height) / 16)
+
+        self.maxX = maxX
+        self.maxY = maxY
+
+    def RenderContent(self, clip=None):
         """
-        Paints the level overview widget
+        Renders the zones, objects, sprites, entrances and locations into
+        the cached overview image. If clip (in blocks) is given, only that
+        part of the existing image is redrawn.
         """
         global theme
 
-        if not hasattr(Area, 'layers'):
-            # fixes race condition where this widget is painted after
-            # the level is created, but before it's loaded
-            return
-
-        painter = QtGui.QPainter(self)
+        if clip is None:
+            area = QtCore.QRect(0, 0, self.width(), self.height())
+            self.drawnRects = {}
+        else:
+            # Redraw whole pixels, with some room for the outlines, and
+            # everything that touches them
+            clip = clip.adjusted(-1, -1, 1, 1)
+            scale = self.scale
+            area = QtCore.QRectF(clip.x() * scale, clip.y() * scale, clip.width() * scale, clip.height() * scale).toAlignedRect()
+            area = area.intersected(QtCore.QRect(0, 0, self.width(), self.height()))
+            if area.isEmpty(): return self.contentCache
+
+            # Antialiasing comes out a little differently on the edges of
+            # an image, so render a bit more than what's kept
+            target = area
+            area = area.adjusted(-2, -2, 2, 2)
+            clip = QtCore.QRectF(area.x() / scale, area.y() / scale, area.width() / scale, area.height() / scale)
+            clip.adjust(-1, -1, 1, 1)
+
+        ratio = self.devicePixelRatioF()
+        img = QtGui.QImage(max(1, int(area.width() * ratio)), max(1, int(area.height() * ratio)),
+                           QtGui.QImage.Format_ARGB32_Premultiplied)
+        img.setDevicePixelRatio(ratio)
+        img.fill(Qt.transparent)
+
+        painter = QtGui.QPainter(img)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
-
-        self.Rescale()
+        painter.translate(-area.x(), -area.y())
         painter.scale(self.scale, self.scale)
         painter.fillRect(0, 0, 1024, 512, self.bgbrush)
 
-        maxX = self.maxX
-        maxY = self.maxY
         dr = painter.drawRect
         fr = painter.fillRect
-
-        maxX = 0
-        maxY = 0
+        drawn = self.drawnRects
+
+        if clip is None:
+            zones = Area.zones
+            objects = itertools.chain.from_iterable(Area.layers)
+            sprites = Area.sprites
+            entrances = Area.entrances
+            locations = Area.locations
+        else:
+            # Only look at what was drawn here last time, and at what
+            # was moved or added since
+            cl, ct, cr, cb = clip.left(), clip.top(), clip.right(), clip.bottom()
+            found = {item for item, (l, t, r, b) in drawn.items() if l <= cr and r >= cl and t <= cb and b >= ct}
+            found |= self.dirtyItems
+
+            # (deleted items and Quick Paint previews aren't in the level)
+            scene = mainWindow.scene
+            for item in [item for item in found if item.scene() is not scene]:
+                found.discard(item)
+                drawn.pop(item, None)
+
+            # Items that share a brush can go in any order
+            zones = [zone for zone in Area.zones if zone in found]
+            objects = [item for item in found if isinstance(item, ObjectItem)]
+            sprites = [item for item in found if isinstance(item, SpriteItem)]
+            entrances = [item for item in found if isinstance(item, EntranceItem)]
+            locations = [location for location in Area.locations if location in found]
+
+        self.dirtyItems = set()
+
+        def rects(items):
+            # (not QRectF.intersects(), which skips empty rects: they still
+            # get outlines)
+            for item in items:
+                rect = self.ItemRect(item)
+                l, t, r, b = rect.left(), rect.top(), rect.right(), rect.bottom()
+                drawn[item] = (l, t, r, b)
+                if clip is None or (l <= cr and r >= cl and t <= cb and b >= ct):
+                    yield rect
 
         b = self.viewbrush
         painter.setPen(QtGui.QPen(theme.color('overview_zone_lines'), 1))
 
-        for zone in Area.zones:
-            x = zone.objx / 16
-            y = zone.objy / 16
-            width = zone.width / 16
-            height = zone.height / 16
-            fr(x, y, width, height, b)
-            dr(x, y, width, height)
-            if x + width > maxX:
-                maxX = x + width
-            if y + height > maxY:
-                maxY = y + height
+        for rect in rects(zones):
+            fr(rect, b)
+            dr(rect)
 
         b = self.objbrush
 
-        for layer in Area.layers:
-            for obj in layer:
-                fr(obj.LevelRect, b)
-                if obj.objx > maxX:
-                    maxX = obj.objx
-                if obj.objy > maxY:
-                    maxY = obj.objy
+        for rect in rects(objects):
+            fr(rect, b)
 
         b = self.spritebrush
 
-        for sprite in Area.sprites:
-            fr(sprite.LevelRect, b)
-            if sprite.objx / 16 > maxX:
-                maxX = sprite.objx / 16
-            if sprite.objy / 16 > maxY:
-                maxY = sprite.objy / 16
+        for rect in rects(sprites):
+            fr(rect, b)
 
         b = self.entrancebrush
 
-        for ent in Area.entrances:
-            fr(ent.LevelRect, b)
-            if ent.objx / 16 > maxX:
-                maxX = ent.objx / 16
-            if ent.objy / 16 > maxY:
-                maxY = ent.objy / 16
+        for rect in rects(entrances):
+            fr(rect, b)
 
         b = self.locationbrush
         painter.setPen(QtGui.QPen(theme.color('overview_location_lines'), 1))
 
-        for location in Area.locations:
-            x = location.objx / 16
-            y = location.objy / 16
-            width = location.width / 16
-            height = location.height / 16
-            fr(x, y, width, height, b)
-            dr(x, y, width, height)
-            if x + width > maxX:
-                maxX = x + width
-            if y + height > maxY:
-                maxY = y + height
+        for rect in rects(locations):
+            fr(rect, b)
+            dr(rect)
 
-        self.maxX = maxX
-        self.maxY = maxY
+        painter.end()
 
-        b = self.locationbrush
+        if clip is not None:
+            # Paint it over the part of the cached image it replaces
+            painter = QtGui.QPainter(self.contentCache)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+            painter.drawImage(QtCore.QRectF(target), img, QtCore.QRectF(2 * ratio, 2 * ratio, target.width() * ratio, target.height() * ratio))
+            painter.end()
+            img = self.contentCache
+
+        return img
+
+    def paintEvent(self, event):
+        """
+        Paints the level overview widget
+        """
+        global theme
+
+        if not hasattr(Area, 'layers'):
+            # fixes race condition where this widget is painted after
+            # the level is created, but before it's loaded
+            return
+
+        # The level contents are only re-rendered where they have changed,
+        # or entirely if the widget was resized or the level grew or shrank;
+        # scrolling the main view just moves the viewbox over the cached image.
+        if self.contentDirty or self.dirtyRect is not None:
+            self.CalcBounds()
+
+        self.Rescale()
+        key = (self.width(), self.height(), self.scale, self.devicePixelRatioF())
+        if self.contentDirty or self.contentCache is None or key != self.contentCacheKey:
+            self.contentCache = self.RenderContent()
+            self.contentCacheKey = key
+            self.contentDirty = False
+        elif self.dirtyRect is not None:
+            self.RenderContent(self.dirtyRect)
+        self.dirtyRect = None
+
+        painter = QtGui.QPainter(self)
+        painter.drawImage(0, 0, self.contentCache)
+
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.scale(self.scale, self.scale)
         painter.setPen(QtGui.QPen(theme.color('overview_viewbox'), 1))
         painter.drawRect(self.Xposlocator / 24 / self.mainWindowScale, self.Yposlocator / 24 / self.mainWindowScale,
                          self.Wlocator / 24 / self.mainWindowScale, self.Hlocator / 24 / self.mainWindowScale)
@@ -10140,7 +9962,7 @@ class SpritePickerWidget(QtWidgets.QTreeWidget):
         self.clear()
 
         for viewname, view, nodelist in SpriteCategories:
-            for n in nodelist: nodelist.remove(n)
+            del nodelist[:]
             for catname, category in view:
                 cnode = QtWidgets.QTreeWidgetItem()
                 cnode.setText(0, catname)
@@ -10249,7 +10071,7 @@ class SpriteList(QtWidgets.QWidget):
         search = QtWidgets.QWidget()
         search.setLayout(layout)
 
-        self.list_ = ListWidgetWithToolTipSignal()
+        self.list_ = LevelItemListView()
 
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -10262,27 +10084,21 @@ class SpriteList(QtWidgets.QWidget):
         """
         Search the list.
         """
-        results = self.list_.findItems(text, Qt.MatchContains | Qt.MatchRecursive)
-
-        for sprite in self.list_.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-            sprite.setHidden(True)
-
-        for sprite in results:
-            sprite.setHidden(False)
-
-        self.ShownSearchResults = results
+        self.list_.setFilterText(text)
 
     def clear(self):
         self.searchbox.setText("")
+        self.list_.setFilterText("")
         return self.list_.clear()
 
     def selectionModel(self):
         return self.list_.selectionModel()
 
     def addItem(self, *args):
-        result = self.list_.addItem(*args)
-        self.search(self.searchbox.text())
-        return result
+        return self.list_.addItem(*args)
+
+    def addItems(self, *args):
+        return self.list_.addItems(*args)
 
     def setCurrentItem(self, *args):
         return self.list_.setCurrentItem(*args)
@@ -10395,6 +10211,7 @@ class SpriteEditorWidget(QtWidgets.QWidget):
     Widget for editing sprite data
     """
     DataUpdate = QtCore.pyqtSignal('PyQt_PyObject')
+    FormPoolSize = 24  # number of sprite type forms kept around for reuse
 
     def __init__(self, defaultmode=False):
         """
@@ -10536,7 +10353,10 @@ class SpriteEditorWidget(QtWidgets.QWidget):
         mainLayout.addLayout(toplayout)
         mainLayout.addLayout(subLayout)
 
-        layout = QtWidgets.QGridLayout()
+        # holds the field forms of recently edited sprite types; only the
+        # current one is visible
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
         self.editorlayout = layout
 
         subLayout.addLayout(self.msg_layout)
@@ -10549,6 +10369,8 @@ class SpriteEditorWidget(QtWidgets.QWidget):
         self.spritetype = -1
         self.data = b'\0\0\0\0\0\0\0\0'
         self.fields = []
+        self.form = None
+        self.forms = collections.OrderedDict()
         self.UpdateFlag = False
         self.DefaultMode = defaultmode
 
@@ -11946,17 +11768,15 @@ class SpriteEditorWidget(QtWidgets.QWidget):
         else:
             sprite = None
 
-        # remove all the existing widgets in the layout
+        # hide the fields of the previous sprite type
         self.clearMessages()
 
-        layout = self.editorlayout
-        for row in range(2, layout.rowCount()):
-            for column in range(0, layout.columnCount()):
-                w = layout.itemAtPosition(row, column)
-                if w is not None:
-                    widget = w.widget()
-                    layout.removeWidget(widget)
-                    widget.setParent(None)
+        if self.form is not None:
+            self.form.setVisible(False)
+            self.form = None
+
+        if reset:
+            self.clearForms()
 
         # show the raw editor if advanced mode is enabled
         self.showRawData.setVisible(not AdvancedModeEnabled)
@@ -12086,9 +11906,38 @@ class SpriteEditorWidget(QtWidgets.QWidget):
 
             self.yoshiInfo.setVisible(False)
 
-        # create all the new fields
+        # reuse the form built for this sprite type, if there is one
+        key = (type, AdvancedModeEnabled, AltSettingIcons)
+        pooled = self.forms.pop(key, None)
+
+        if pooled is not None and pooled[0] is sprite:
+            form, fields = pooled[1], pooled[2]
+
+        else:
+            if pooled is not None:
+                self.discardForm(pooled[1])
+
+            form, fields = self.buildForm(sprite)
+
+        self.forms[key] = (sprite, form, fields)
+        while len(self.forms) > self.FormPoolSize:
+            self.discardForm(self.forms.popitem(False)[1][1])
+
+        form.setVisible(True)
+        self.form = form
+        self.fields = fields
+        self.update(True)
+
+    def buildForm(self, sprite):
+        """
+        Creates the widget holding all the fields of a sprite type
+        """
+        form = QtWidgets.QWidget()
+        layout = QtWidgets.QGridLayout(form)
+        layout.setContentsMargins(0, 0, 0, 0)
+
         fields = []
-        row = 2
+        row = 0
 
         for f in sprite.fields:
             if f[0] == 0:
@@ -12119,8 +11968,25 @@ class SpriteEditorWidget(QtWidgets.QWidget):
             fields.append(nf)
             row += 1
 
-        self.fields = fields
-        self.update(True)
+        self.editorlayout.addWidget(form)
+        return form, fields
+
+    def discardForm(self, form):
+        """
+        Removes a sprite type form from the editor
+        """
+        self.editorlayout.removeWidget(form)
+        form.setParent(None)
+        form.deleteLater()
+
+    def clearForms(self):
+        """
+        Removes all the sprite type forms, so they get rebuilt
+        """
+        for sprite, form, fields in self.forms.values():
+            self.discardForm(form)
+
+        self.forms.clear()
 
     def addMessage(self, text, action = None, level = 0, close = "x"):
         """
@@ -12432,7 +12298,7 @@ class SpriteEditorWidget(QtWidgets.QWidget):
             mw.scene.addItem(spr)
             Area.sprites.append(spr)
 
-            spr.listitem = ListWidgetItem_SortsByOther(spr)
+            spr.listitem = LevelItemListEntry(spr)
             mw.spriteList.addItem(spr.listitem)
 
             SetDirty()
@@ -12907,7 +12773,7 @@ class ResizeChoiceDialog(QtWidgets.QDialog):
         mainWindow.scene.addItem(sprite)
         Area.sprites.append(sprite)
 
-        sprite.listitem = ListWidgetItem_SortsByOther(sprite)
+        sprite.listitem = LevelItemListEntry(sprite)
         mainWindow.spriteList.addItem(sprite.listitem)
 
         SetDirty()
@@ -13869,6 +13735,7 @@ class ReggieTheme:
         self.description = trans.string('Themes', 2)
         self.iconCacheSm = {}
         self.iconCacheLg = {}
+        self.iconFolders = {}
         self.style = None
 
         # Add the colors                                                       # Descriptions:
@@ -13920,67 +13787,61 @@ class ReggieTheme:
 
     def initFromFolder(self, folder):
         """
-        Initializes the theme from the folder
+        Initializes the theme from the folder, or from the cache if its XML
+        files haven't changed since they were last parsed
         """
         folder = os.path.join('reggiedata', 'themes', folder)
+        path = os.path.join(folder, 'main.xml')
 
-        fileList = os.listdir(folder)
+        parsed = LoadParsedCache('theme', path)
+        if parsed is None:
+            stamps = [FileStamp(path)]
+            parsed = self.parseFolder(folder, path, stamps)
+            SaveParsedCache('theme', path, stamps, parsed)
 
-        # Create a XML ElementTree
-        maintree = etree.parse(os.path.join(folder, 'main.xml'))
-        root = maintree.getroot()
+        head, colors, iconFolders = parsed
 
         # Parse the attributes of the <theme> tag
-        if not self.parseMainXMLHead(root):
+        if not self.parseMainXMLHead(etree.Element(*head)):
             # The attributes are messed up
             return
 
+        for id, rgba in colors.items():
+            self.colors[id] = QtGui.QColor(*rgba)
+
+        # Icons are loaded by GetIcon when they're first needed
+        self.iconFolders = iconFolders
+
+    def parseFolder(self, folder, path, stamps):
+        """
+        Parses main.xml and the files it points to, and returns the <theme>
+        tag and attributes, the colors and the icon folders. Adds the stamp
+        of every other file it reads.
+        """
+        # Create a XML ElementTree
+        maintree = etree.parse(path)
+        root = maintree.getroot()
+
+        colors = {}
+        iconFolders = {}
+
         # Parse the other nodes
         for node in root:
             if node.tag.lower() == 'colors':
                 if 'file' not in node.attrib: continue
 
                 # Load the colors XML
-                self.loadColorsXml(os.path.join(folder, node.attrib['file']))
+                colorsPath = os.path.join(folder, node.attrib['file'])
+                stamps.append(FileStamp(colorsPath))
+                colors.update(self.parseColorsXml(colorsPath))
 
             elif node.tag.lower() == 'icons':
                 if not all(thing in node.attrib for thing in ['size', 'folder']): continue
 
-                foldername = node.attrib['folder']
                 big = node.attrib['size'].lower()[:2] == 'lg'
-                cache = self.iconCacheLg if big else self.iconCacheSm
-
-                # Load the icons
-                for iconfilename in fileList:
-                    iconname = iconfilename
-                    if not iconname.startswith(foldername + '/'): continue
-                    iconname = iconname[len(foldername) + 1:]
-                    if len(iconname) <= len('icon-.png'): continue
-                    if not iconname.startswith('icon-') or not iconname.endswith('.png'): continue
-                    iconname = iconname[len('icon-'): -len('.png')]
-
-                    with open(os.path.join(folder, iconfilename), "rb") as inf:
-                        icodata = inf.read()
-                    pix = QtGui.QPixmap()
-                    if not pix.loadFromData(icodata): continue
-                    ico = QtGui.QIcon(pix)
-
-                    cache[iconname] = ico
-
-                ##        # Add some overview colors if they weren't specified
-                ##        fallbacks = {
-                ##            'overview_entrance': 'entrance_fill',
-                ##            'overview_location_fill': 'location_fill',
-                ##            'overview_location_lines': 'location_lines',
-                ##            'overview_sprite': 'sprite_fill',
-                ##            'overview_zone_lines': 'zone_lines',
-                ##            }
-                ##        for index in fallbacks:
-                ##            if (index not in colors) and (fallbacks[index] in colors): colors[index] = colors[fallbacks[index]]
-                ##
-                ##        # Use the new colors dict to overwrite values in self.colors
-                ##        for index in colors:
-                ##            self.colors[index] = colors[index]
+                iconFolders[big] = os.path.join(folder, node.attrib['folder'])
+
+        return (root.tag, dict(root.attrib)), colors, iconFolders
 
     def parseMainXMLHead(self, root):
         """
@@ -14021,17 +13882,17 @@ class ReggieTheme:
 
         return True
 
-    def loadColorsXml(self, file):
+    def parseColorsXml(self, file):
         """
-        Loads a colors.xml file
+        Parses a colors.xml file, and returns the (r, g, b, a) of each color
         """
         try:
             tree = etree.parse(file)
         except Exception:
-            return
+            return {}
 
         root = tree.getroot()
-        if root.tag.lower() != 'colors': return False
+        if root.tag.lower() != 'colors': return {}
 
         colorDict = {}
         for colorNode in root:
@@ -14066,11 +13927,9 @@ class ReggieTheme:
                     a = int(colorval[6:8], 16)
             except ValueError:
                 continue
-            colorobj = QtGui.QColor(r, g, b, a)
-            colorDict[colorNode.attrib['id']] = colorobj
+            colorDict[colorNode.attrib['id']] = (r, g, b, a)
 
-        # Merge dictionaries
-        self.colors.update(colorDict)
+        return colorDict
 
     def color(self, name):
         """
@@ -14090,8 +13949,16 @@ class ReggieTheme:
         cache = self.iconCacheLg if big else self.iconCacheSm
 
         if name not in cache:
-            path = 'reggiedata/ico/lg/icon-' if big else 'reggiedata/ico/sm/icon-'
-            path += name
+            # Use the theme's icon if it has one, and the default one if not
+            path = None
+            if big in self.iconFolders:
+                path = os.path.join(self.iconFolders[big], 'icon-%s.png' % name)
+                if not os.path.isfile(path): path = None
+
+            if path is None:
+                path = 'reggiedata/ico/lg/icon-' if big else 'reggiedata/ico/sm/icon-'
+                path += name
+
             cache[name] = QtGui.QIcon(path)
 
         return cache[name]
@@ -14375,20 +14242,106 @@ class SimultaneousUndoAction(UndoAction):
 
 
 # Game Definitions
-def LoadGameDef(name=None, dlg=None):
+class DataLoader:
+    """
+    Runs data file loaders on a thread pool. Loaders may only parse files
+    and set their own globals; anything that creates Qt objects stays on
+    the GUI thread, which calls join() for the data it needs first.
+    """
+
+    def __init__(self):
+        self.pool = concurrent.futures.ThreadPoolExecutor(min(8, os.cpu_count() or 1))
+        self.futures = {}
+
+    def add(self, name, func, *args, after=()):
+        """
+        Starts func(*args) in the background, once the tasks named in
+        after (which have to be added first) are done
+        """
+        deps = [self.futures[dep] for dep in after]
+        self.futures[name] = self.pool.submit(self.run, deps, func, args)
+
+    @staticmethod
+    def run(deps, func, args):
+        """
+        Runs a task on the pool. Its dependencies were submitted before it,
+        so they're already running or done and waiting on them can't
+        deadlock the pool.
+        """
+        for dep in deps:
+            dep.result()
+
+        return func(*args)
+
+    def join(self, *names):
+        """
+        Waits for the named tasks, or for all of them if no names are
+        given, and re-raises any error they hit
+        """
+        for name in (names or list(self.futures)):
+            self.futures[name].result()
+
+    def close(self):
+        """
+        Waits for any running tasks and shuts the pool down
+        """
+        self.pool.shutdown()
+
+
+# The inputs of each part of Reggie that depends on the gamedef, as of the
+# last LoadGameDef that succeeded, and the parts whose inputs the gamedef
+# being loaded changed. Parts whose inputs are the same aren't reloaded.
+GameDefInputs = {}
+GameDefChanged = set()
+
+
+def LoadGameDef(name=None, dlg=None, loader=None):
     """
-    Loads a game definition
+    Loads a game definition. If a DataLoader is passed in, the data files
+    are left loading in it for the caller to join.
     """
     global gamedef
     if dlg: dlg.setMaximum(7)
 
+    oldGameDef = gamedef
+
+    ownLoader = loader is None
+    if ownLoader: loader = DataLoader()
+
     # Put the whole thing into a try-except clause
     # to catch whatever errors may happen
     try:
 
-        # Load the gamedef
+        # Load the gamedef. The data files only depend on it, so they're
+        # all parsed in the background, and joined where they're needed.
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 1))  # Loading game patch...
-        gamedef = ReggieGameDefinition(name)
+        inputs = {}
+        def setGameDef():
+            global gamedef, GameDefChanged
+            gamedef = ReggieGameDefinition(name)
+
+            inputs.update(gamedef.GetInputs())
+            GameDefChanged = {part for part in inputs if GameDefInputs.get(part) != inputs[part]}
+
+        def loadIfChanged(part, func, *args):
+            if part in GameDefChanged: func(*args)
+
+        loader.add('GameDef', setGameDef)
+        after = ('GameDef',)
+        loader.add('SpriteData', loadIfChanged, 'SpriteData', LoadSpriteData, after=after)
+        parts = ['GameDef', 'SpriteData']
+        for part, func in (('SpriteListData', LoadSpriteListData),
+                           ('SpriteCategories', LoadSpriteCategories),
+                           ('BgANames', LoadBgANames),
+                           ('BgBNames', LoadBgBNames),
+                           ('ObjDescriptions', LoadObjDescriptions),
+                           ('TilesetNames', LoadTilesetNames),
+                           ('TilesetInfo', LoadTilesetInfo),
+                           ('EntranceNames', LoadEntranceNames)):
+            loader.add(part, loadIfChanged, part, func, True, after=after)
+            parts.append(part)
+
+        loader.join('GameDef')
         if gamedef.custom and (not settings.contains('GamePath_' + gamedef.name)):
             # First-time usage of this gamedef. Have the
             # user pick a stage folder so we can load stages
@@ -14409,10 +14362,8 @@ def LoadGameDef(name=None, dlg=None):
 
         # Load spritedata.xml and spritecategories.xml
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 8))  # Loading sprite data...
-        LoadSpriteData()
-        LoadSpriteListData(True)
-        LoadSpriteCategories(True)
-        if mainWindow:
+        if mainWindow and not GameDefChanged.isdisjoint({'SpriteData', 'SpriteListData', 'SpriteCategories'}):
+            loader.join('SpriteData', 'SpriteListData', 'SpriteCategories')
             mainWindow.spriteViewPicker.clear()
             for cat in SpriteCategories:
                 mainWindow.spriteViewPicker.addItem(cat[0])
@@ -14425,55 +14376,50 @@ def LoadGameDef(name=None, dlg=None):
 
         # Load BgA/BgB names
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 9))  # Loading background names...
-        LoadBgANames(True)
-        LoadBgBNames(True)
         if dlg: dlg.setValue(3)
 
         # Reload tilesets
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 10))  # Reloading tilesets...
-        LoadObjDescriptions(True)  # reloads ts1_descriptions
-        if mainWindow is not None: mainWindow.ReloadTilesets(True)
-        LoadTilesetNames(True)  # reloads tileset names
-        LoadTilesetInfo(True)  # reloads tileset info
+        if mainWindow is not None:
+            loader.join('ObjDescriptions', 'TilesetNames', 'TilesetInfo')
+            mainWindow.ReloadTilesets(True, not GameDefChanged.isdisjoint({'ObjDescriptions', 'TilesetInfo'}))
         if dlg: dlg.setValue(4)
 
         # Load sprites.py
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 11))  # Loading sprite image data...
-        if Area is not None:
-            SLib.SpritesFolders = gamedef.recursiveFiles('sprites', False, True)
+        SLib.SpritesFolders = gamedef.recursiveFiles('sprites', False, True)
+        if 'SpriteImages' not in GameDefChanged and oldGameDef is not None:
+            # Same sprite images, so keep the sprites.py modules and images
+            gamedef.AdoptSprites(oldGameDef)
+
+        elif Area is not None:
+            loader.join('SpriteData')
 
             SLib.ImageCache.clear()
             SLib.SpriteImagesLoaded.clear()
-            sprites.LoadBasics()
-
-            spriteClasses = gamedef.getImageClasses()
-
-            for s in Area.sprites:
-                if s.type in SLib.SpriteImagesLoaded: continue
-                if s.type not in spriteClasses: continue
-
-                spriteClasses[s.type].loadImages()
-
-                SLib.SpriteImagesLoaded.add(s.type)
+            SLib.ClearPreloadedImages()
+            if gamedef.imageClassesLoaded() or any(s.imageRealized for s in Area.sprites):
+                SLib.PreloadSpriteImages(gamedef.getImageClasses(), {s.type for s in Area.sprites})
 
+            # Only sprites that already have an image need a new one now;
+            # the rest get theirs when they come into view
             for s in Area.sprites:
-                if s.type in spriteClasses:
-                    s.setImageObj(spriteClasses[s.type])
-                else:
-                    s.setImageObj(SLib.SpriteImage)
+                if s.imageRealized:
+                    s.RealizeImage(True)
 
         if dlg: dlg.setValue(5)
 
         # Reload the sprite-picker text
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 12))  # Applying sprite image data...
-        if Area is not None:
+        if Area is not None and 'SpriteData' in GameDefChanged:
+            loader.join('SpriteData')
             for spr in Area.sprites:
                 spr.UpdateListItem()  # Reloads the sprite-picker text
         if dlg: dlg.setValue(6)
 
         # Load entrance names
         if dlg: dlg.setLabelText(trans.string('Gamedefs', 16))  # Loading entrance names...
-        LoadEntranceNames(True)
+        if ownLoader: loader.join()
         if dlg: dlg.setValue(7)
 
     except Exception as e:
@@ -14484,8 +14430,18 @@ def LoadGameDef(name=None, dlg=None):
     #    if name is not None: LoadGameDef(None)
     #    return False
 
+    finally:
+        if ownLoader: loader.close()
+
+
+    # Success! The inputs are only recorded now, so if anything failed,
+    # loading this gamedef again reloads all of it. A caller's loader
+    # records them once all the data files it's joining have loaded.
+    if ownLoader:
+        GameDefInputs.update(inputs)
+    else:
+        loader.add('GameDefInputs', GameDefInputs.update, inputs, after=parts)
 
-    # Success!
     if dlg: setSetting('LastGameDef', name)
     return True
 
@@ -14516,14 +14472,14 @@ class ReggieGameDefinition:
 
         # Try to init it from name if possible
         NoneTypes = (None, 'None', 0, '', True, False)
-        if name in NoneTypes:
-            return
-        else:
+        if name not in NoneTypes:
             try:
                 self.InitFromName(name)
             except Exception:
                 raise  # self.InitAsEmpty()  # revert
 
+        self.BuildIndex()
+
     def InitAsEmpty(self):
         """
         Sets all properties to their default values
@@ -14537,7 +14493,17 @@ class ReggieGameDefinition:
         self.description = trans.string('Gamedefs', 14)  # 'A new Mario adventure!<br>' and the date
         self.version = '2'
 
-        self.sprites = sprites
+        self.sprites = None  # sprites.py, see getSprites()
+        self.imageClasses = None  # merged ImageClasses, see getImageClasses()
+
+        # File resolution index, see BuildIndex()
+        self.resolvedFiles = {}
+        self.resolvedFolders = {}
+        self.resolvedFile = {}
+        self.resolvedMultiple = {}
+        self.gamePaths = None
+        self.tilesetIndex = None
+        self.tilesetStamps = None
 
         self.files = {
             'bga': gdf(None, False),
@@ -14614,17 +14580,80 @@ class ReggieGameDefinition:
         # Get rid of the XML stuff
         del tree, root
 
-        # Load sprites.py if provided
-        if 'sprites' in self.files:
-            with open(self.files['sprites'].path, 'r') as f:
-                filedata = f.read()
+    def BuildIndex(self):
+        """
+        Resolves every file and folder through the chain of bases, with
+        patches applied, so recursiveFiles() and file() are dictionary hits
+        """
+        for ListToCheckIn, resolved, baseResolved in (
+                (self.files, self.resolvedFiles, self.base.resolvedFiles if self.base else {}),
+                (self.folders, self.resolvedFolders, self.base.resolvedFolders if self.base else {})):
 
-            # https://stackoverflow.com/questions/5362771/load-module-from-string-in-python
-            # with modifications
-            new_module = importlib.types.ModuleType(self.name + '->sprites')
-            exec(filedata, new_module.__dict__)
-            sys.modules[new_module.__name__] = new_module
-            self.sprites = new_module
+            for name in set(ListToCheckIn) | set(baseResolved):
+                listUpToNow, wasPatch = baseResolved.get(name, ((), True))
+                gdf = ListToCheckIn.get(name)
+
+                if gdf is None or gdf.path is None:
+                    resolved[name] = (listUpToNow, wasPatch)
+
+                # If it's a patch, add it to the end of the list
+                elif gdf.patch:
+                    resolved[name] = (listUpToNow + (gdf.path,), wasPatch)
+
+                # If it's not (it's free-standing), start over
+                else:
+                    resolved[name] = ((gdf.path,), False)
+
+        baseFile = self.base.resolvedFile if self.base else {}
+        for name, gdf in self.files.items():
+            self.resolvedFile[name] = gdf.path if gdf.path is not None else baseFile.get(name)
+
+    def GetInputs(self):
+        """
+        Returns what each part of Reggie that depends on the gamedef is
+        loaded from: the resolved files with their FileStamps
+        """
+        def stamps(name, folder=False):
+            paths, isPatch = self.recursiveFiles(name, True, folder)
+            return isPatch, tuple(FileStamp(path) for path in paths)
+
+        inputs = {
+            'SpriteData': tuple(
+                tuple(None if f is None else FileStamp(f.path) for f in files)
+                for files in self.multipleRecursiveFiles('spritedata', 'spritenames')),
+            'SpriteListData': stamps('spritelistdata'),
+            'SpriteCategories': stamps('spritecategories'),
+            'BgANames': stamps('bga'),
+            'BgBNames': stamps('bgb'),
+            'ObjDescriptions': stamps('ts1_descriptions'),
+            'TilesetNames': stamps('tilesets'),
+            'TilesetInfo': stamps('tilesetinfo'),
+            'EntranceNames': stamps('entrancetypes'),
+        }
+
+        # Sprite images come from the sprites.py of each gamedef in the
+        # chain, and from the sprite image folders
+        modules = []
+        def_ = self
+        while def_ is not None:
+            if def_.custom and 'sprites' in def_.files:
+                modules.append(FileStamp(def_.files['sprites'].path))
+            else:
+                modules.append(def_.custom)
+            def_ = def_.base
+
+        inputs['SpriteImages'] = (tuple(modules), stamps('sprites', True))
+        return inputs
+
+    def AdoptSprites(self, other):
+        """
+        Takes over the sprites.py modules other has imported, for when the
+        two gamedefs use the same ones
+        """
+        while self is not None and other is not None:
+            self.sprites = other.sprites
+            self.imageClasses = other.imageClasses
+            self, other = self.base, other.base
 
     def bgFile(self, name, layer):
         """
@@ -14702,21 +14731,75 @@ class ReggieGameDefinition:
             name = 'GamePath_' + self.name
             setSetting(name, path)
 
+        self.ResetGamePaths()
+
     def GetGamePaths(self):
         """
         Returns game paths of this gamedef and its bases
         """
-        mainpath = setting('GamePath')
-        if not self.custom: return [mainpath, ]
+        if self.gamePaths is None:
+            mainpath = setting('GamePath')
+            if not self.custom:
+                self.gamePaths = [mainpath, ]
+            elif self.base is None:
+                self.gamePaths = [mainpath, setting('GamePath_' + self.name)]
+            else:
+                self.gamePaths = self.base.GetGamePaths() + [setting('GamePath_' + self.name)]
 
-        name = 'GamePath_' + self.name
-        stg = setting(name)
-        if self.base is None:
-            return [mainpath, stg]
-        else:
-            paths = self.base.GetGamePaths()
-            paths.append(stg)
-            return paths
+        return list(self.gamePaths)
+
+    def ResetGamePaths(self):
+        """
+        Forgets the game paths and the tilesets found in them, after a game
+        path setting has changed
+        """
+        self.gamePaths = None
+        self.tilesetIndex = None
+        self.tilesetStamps = None
+
+    def GetTilesetFile(self, name):
+        """
+        Returns (path, compressed) for the tileset archive that takes
+        precedence, or None if there isn't one in any of the game paths
+        """
+        # Game paths are searched most specific first, up to the first unset one
+        paths = []
+        for path in reversed(self.GetGamePaths()):
+            if path is None: break
+            paths.append(path)
+
+        # Only list the Texture folders again if one of them has changed
+        stamps = []
+        for path in paths:
+            try:
+                stamps.append(os.stat(path + '/Texture').st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+
+        if stamps != self.tilesetStamps:
+            self.tilesetIndex = {}
+            for priority, path in enumerate(paths):
+                try:
+                    entries = list(os.scandir(path + '/Texture'))
+                except OSError:
+                    continue
+
+                for entry in entries:
+                    if entry.is_file():
+                        self.tilesetIndex.setdefault(os.path.normcase(entry.name), (priority, path))
+
+            self.tilesetStamps = stamps
+
+        # In each game path, an .arc comes before an .arc.LH
+        found = []
+        for compressed, ext in ((False, '.arc'), (True, '.arc.LH')):
+            hit = self.tilesetIndex.get(os.path.normcase(name + ext))
+            if hit is not None: found.append((hit[0], compressed, hit[1], ext))
+
+        if not found: return None
+
+        _, compressed, path, ext = min(found)
+        return path + '/Texture/' + name + ext, compressed
 
     def GetLastLevel(self):
         """
@@ -14748,112 +14831,96 @@ class ReggieGameDefinition:
         """
         Checks each base of this gamedef and returns a list of successive file paths
         """
-        ListToCheckIn = self.files if not folder else self.folders
-
-        # This can be handled 4 ways: if we do or don't have a base, and if we do or don't have a copy of the file.
-        if self.base is None:
-            if ListToCheckIn[name].path is None:  # No base, no file
-
-                if isPatch:
-                    return [], True
-                else:
-                    return []
-
-            else:  # No base, file
-
-                alist = []
-                alist.append(ListToCheckIn[name].path)
-                if isPatch:
-                    return alist, ListToCheckIn[name].patch
-                else:
-                    return alist
+        resolved = self.resolvedFolders if folder else self.resolvedFiles
+        paths, wasPatch = resolved.get(name, ((), True))
 
+        if isPatch:
+            return list(paths), wasPatch
         else:
-
-            if isPatch:
-                listUpToNow, wasPatch = self.base.recursiveFiles(name, True, folder)
-            else:
-                listUpToNow = self.base.recursiveFiles(name, False, folder)
-
-            if ListToCheckIn[name].path is None:  # Base, no file
-
-                if isPatch:
-                    return listUpToNow, wasPatch
-                else:
-                    return listUpToNow
-
-            else:  # Base, file
-
-                # If it's a patch, just add it to the end of the list
-                if ListToCheckIn[name].patch:
-                    listUpToNow.append(ListToCheckIn[name].path)
-
-                # If it's not (it's free-standing), make a new list and start over
-                else:
-                    newlist = []
-                    newlist.append(ListToCheckIn[name].path)
-                    if isPatch:
-                        return newlist, False
-                    else:
-                        return newlist
-
-                # Return
-                if isPatch:
-                    return listUpToNow, wasPatch
-                else:
-                    return listUpToNow
+            return list(paths)
 
     def multipleRecursiveFiles(self, *args):
         """
         Returns multiple recursive files in order of least recent to most recent as a list of tuples, one list per gamedef base
         """
+        if args not in self.resolvedMultiple:
+            # Each arg should be a file name
+            if self.base is None:
+                main = []  # start a new level
+            else:
+                main = self.base.multipleRecursiveFiles(*args)
 
-        # This should be very simple
-        # Each arg should be a file name
-        if self.base is None:
-            main = []  # start a new level
-        else:
-            main = self.base.multipleRecursiveFiles(*args)
+            # Add the values from this level
+            result = []
+            for name in args:
+                file = self.files.get(name)
+                result.append(file if file is not None and file.path is not None else None)
+            main.append(tuple(result))
 
-        # Add the values from this level, and then return it
-        result = []
-        for name in args:
-            try:
-                file = self.files[name]
-                if file.path is None: raise KeyError
-                result.append(self.files[name])
-            except KeyError:
-                result.append(None)
-        main.append(tuple(result))
-        return main
+            self.resolvedMultiple[args] = main
+
+        return list(self.resolvedMultiple[args])
 
     def file(self, name):
         """
         Returns a file by recursively checking successive gamedef bases
         """
-        if name not in self.files: return
-
-        if self.files[name].path is not None:
-            return self.files[name].path
-        else:
-            if self.base is None: return
-            return self.base.file(name)  # it can recursively check its base, too
+        return self.resolvedFile.get(name)
 
     def getImageClasses(self):
         """
-        Gets all image classes
+        Gets all image classes. The merged mapping is built once and shared,
+        so callers must not modify it.
         """
         if not self.custom:
-            return self.sprites.ImageClasses
+            return self.getSprites().ImageClasses
+
+        if self.imageClasses is not None:
+            return self.imageClasses
 
         if self.base is not None:
             images = dict(self.base.getImageClasses())
         else:
             images = {}
 
-        if hasattr(self.sprites, 'ImageClasses'):
-            images.update(self.sprites.ImageClasses)
-        return images
+        module = self.getSprites()
+        if hasattr(module, 'ImageClasses'):
+            images.update(module.ImageClasses)
+
+        self.imageClasses = images
+        return images
+
+    def imageClassesLoaded(self):
+        """
+        Returns True if getImageClasses() won't need to import sprites.py
+        """
+        if self.custom:
+            return self.imageClasses is not None
+
+        return self.sprites is not None
+
+    def getSprites(self):
+        """
+        Returns the sprites.py module for this gamedef. It's a big module,
+        so it's only imported once a sprite image is first needed.
+        """
+        if self.sprites is not None:
+            return self.sprites
+
+        if self.custom and 'sprites' in self.files:
+            with open(self.files['sprites'].path, 'r') as f:
+                filedata = f.read()
+
+            # https://stackoverflow.com/questions/5362771/load-module-from-string-in-python
+            # with modifications
+            new_module = importlib.types.ModuleType(self.name + '->sprites')
+            exec(filedata, new_module.__dict__)
+            sys.modules[new_module.__name__] = new_module
+            self.sprites = new_module
+        else:
+            self.sprites = importlib.import_module('sprites')
+
+        return self.sprites
 
 
 # Related functions
@@ -15845,28 +15912,53 @@ class ReggieTranslation:
 
     def InitFromXML(self, name):
         """
-        Parses the translation XML
+        Loads the translation from its XML, or from the cache if the XML
+        files haven't changed since they were last parsed
         """
         if name in ('', None, 'None'): return
         name = str(name)
-        MaxVer = 1.0
 
-        # Parse the file (errors are handled by __init__())
+        # Errors are handled by __init__()
         path = 'reggiedata/translations/' + name + '/main.xml'
+        parsed = LoadParsedCache('translation', path)
+        if parsed is None:
+            stamps = [FileStamp(path)]
+            parsed = self.ParseXML(name, path, stamps)
+            SaveParsedCache('translation', path, stamps, parsed)
+
+        self.name, self.version, self.translator, files, strings = parsed
+
+        # Overwrite self.files with files
+        for index in files: self.files[index] = files[index]
+
+        # Overwrite self.strings with strings
+        for index in strings:
+            if index not in self.strings: self.strings[index] = {}
+            for index2 in strings[index]:
+                self.strings[index][index2] = strings[index][index2]
+
+    def ParseXML(self, name, path, stamps):
+        """
+        Parses the translation XML, and returns (name, version, translator,
+        files, strings). Adds the stamp of every other file it reads.
+        """
+        MaxVer = 1.0
+
+        # Parse the file
         tree = etree.parse(path)
         root = tree.getroot()
 
         # Add attributes
         # Name
         if 'name' not in root.attrib: raise Exception
-        self.name = root.attrib['name']
+        transName = root.attrib['name']
         # Version
         if 'version' not in root.attrib: raise Exception
-        self.version = float(root.attrib['version'])
-        if self.version > MaxVer: raise Exception
+        version = float(root.attrib['version'])
+        if version > MaxVer: raise Exception
         # Translator
         if 'translator' not in root.attrib: raise Exception
-        self.translator = root.attrib['translator']
+        translator = root.attrib['translator']
 
         # Parse the nodes
         files = {}
@@ -15885,13 +15977,11 @@ class ReggieTranslation:
         # Get rid of the XML stuff
         del tree, root
 
-        # Overwrite self.files with files
-        for index in files: self.files[index] = files[index]
-
         # Check for a strings node
         if not strings: raise Exception
 
         # Parse the strings
+        stamps.append(FileStamp(strings))
         tree = etree.parse(strings)
         root = tree.getroot()
 
@@ -15925,11 +16015,7 @@ class ReggieTranslation:
             # Add it to strings
             strings[id] = sectionStrings
 
-        # Overwrite self.strings with strings
-        for index in strings:
-            if index not in self.strings: self.strings[index] = {}
-            for index2 in strings[index]:
-                self.strings[index][index2] = strings[index][index2]
+        return transName, version, translator, files, strings
 
     def string(self, *args):
         """
@@ -16065,6 +16151,288 @@ class ReggieTranslation:
         tree.write('strings.xml', encoding='utf-8')
 
 
+def BuildLayerTilemaps(x, y, width, height):
+    """
+    Returns the tilemaps of the visible layers within the given tile rect,
+    bottom layer first. Each tilemap is a list of rows; a cell is a tile
+    number, -1 for an unknown object or None if it's empty.
+    """
+    isect = QtCore.QRectF(x, y, width, height).intersects
+    tmaps = []
+
+    for layer, shown in zip(reversed(Area.layers), (Layer2Shown, Layer1Shown, Layer0Shown)):
+        if not shown: continue
+
+        tmap = None
+        for item in layer:
+            if not isect(item.LevelRect): continue
+
+            if tmap is None:
+                tmap = [[None] * width for _ in range(height)]
+
+            exists = True
+            if ObjectDefinitions[item.tileset] is None:
+                exists = False
+            elif ObjectDefinitions[item.tileset][item.type] is None:
+                exists = False
+
+            # clip the object to the rect
+            startx = max(x - item.objx, 0)
+            endx = min(x + width - item.objx, item.width)
+            desty = item.objy - y
+
+            for row in item.objdata:
+                if desty >= height: break
+                if desty >= 0:
+                    destrow = tmap[desty]
+                    destx = item.objx - x + startx
+                    for tile in row[startx:endx]:
+                        if not exists:
+                            destrow[destx] = -1
+                        elif tile > 0:
+                            destrow[destx] = tile
+                        destx += 1
+                desty += 1
+
+        if tmap is not None:
+            tmaps.append(tmap)
+
+    return tmaps
+
+
+def PaintTilemaps(painter, tmaps, level, sources):
+    """
+    Paints tilemaps from BuildLayerTilemaps() at the given tile level.
+    sources maps tile numbers to images (or to flat colors, if level is
+    None). Works on any paint device, in any thread.
+    """
+    size = 1 if level is None else 24 >> level
+
+    for tmap in tmaps:
+        desty = 0
+        for row in tmap:
+            destx = 0
+            for tile in row:
+                if tile is not None:
+                    if level is None:
+                        painter.fillRect(destx, desty, 1, 1, sources[tile])
+                    else:
+                        painter.drawImage(destx, desty, sources[tile])
+                destx += size
+            desty += size
+
+
+def TileSources(tmaps, level):
+    """
+    Collects the images (or flat colors) needed to paint some tilemaps
+    """
+    sources = {}
+    for tmap in tmaps:
+        for row in tmap:
+            for tile in row:
+                if tile is None or tile in sources: continue
+
+                t = Overrides[108] if tile == -1 else Tiles[tile]
+                sources[tile] = t.getFlatColor() if level is None else t.getScaledImage(level)
+
+    return sources
+
+
+class TileChunkRenderer(QtCore.QRunnable):
+    """
+    Rasterizes a single tile chunk into a QImage
+    """
+
+    def __init__(self, cache, key, version, tmaps, level, sources, generation):
+        QtCore.QRunnable.__init__(self)
+        self.cache = cache
+        self.key = key
+        self.version = version
+        self.tmaps = tmaps
+        self.level = level
+        self.sources = sources
+        self.generation = generation
+
+    def render(self):
+        """
+        Renders the chunk and returns the image
+        """
+        size = TileChunkSize * (1 if self.level is None else 24 >> self.level)
+        img = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        img.fill(Qt.transparent)
+
+        painter = QtGui.QPainter(img)
+        PaintTilemaps(painter, self.tmaps, self.level, self.sources)
+        painter.end()
+
+        return img
+
+    def run(self):
+        """
+        Renders the chunk on a worker thread and hands it to the cache
+        """
+        self.cache.chunkRendered.emit(self.key, self.version, self.render(), self.generation)
+
+
+class TileChunkCache(QtCore.QObject):
+    """
+    Cache of rasterized tile chunks, keyed by (chunk x, chunk y, tile level).
+    Chunks are rendered on a thread pool. Each one remembers the version of
+    its spot in TileChunkVersions, which object edits bump, so only outdated
+    chunks get their tilemaps rebuilt.
+    """
+    chunkRendered = QtCore.pyqtSignal(object, int, object, int)
+
+    def __init__(self, scene):
+        QtCore.QObject.__init__(self)
+        self.scene = scene
+        self.chunks = collections.OrderedDict() # key: (version, pixmap or None if empty)
+        self.pending = {} # key: version
+        self.usage = 0
+        self.generation = TileChunkGeneration
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(max(QtCore.QThread.idealThreadCount() - 1, 1))
+
+        self.chunkRendered.connect(self.handleChunkRendered)
+
+    def clear(self):
+        """
+        Throws away every chunk
+        """
+        self.pool.clear()
+        self.chunks.clear()
+        self.pending.clear()
+        self.usage = 0
+        self.generation = TileChunkGeneration
+
+    def store(self, key, version, pix):
+        """
+        Adds a rendered chunk, evicting the least recently used ones if
+        the cache is over budget
+        """
+        old = self.chunks.pop(key, None)
+        if old is not None and old[1] is not None:
+            self.usage -= old[1].width() * old[1].height() * 4
+
+        self.chunks[key] = (version, pix)
+        if pix is None: return
+        self.usage += pix.width() * pix.height() * 4
+
+        while self.usage > TileChunkBudget and len(self.chunks) > 1:
+            _, (_, oldpix) = self.chunks.popitem(last=False)
+            if oldpix is not None:
+                self.usage -= oldpix.width() * oldpix.height() * 4
+
+    def handleChunkRendered(self, key, version, img, generation):
+        """
+        Receives a chunk from a worker thread
+        """
+        if generation != self.generation: return
+
+        if self.pending.get(key) == version:
+            del self.pending[key]
+        elif key in self.chunks:
+            # a newer version is on its way
+            return
+
+        self.store(key, version, QtGui.QPixmap.fromImage(img))
+
+        span = TileChunkSize * 24
+        self.scene.update(key[0] * span, key[1] * span, span, span)
+
+    def placeholder(self, cx, cy, level):
+        """
+        Returns any rendered version of a chunk, however outdated or
+        low-res, to show until the real one is ready
+        """
+        for other in (level, None) + tuple(range(TileMipLevels - 1, -1, -1)):
+            entry = self.chunks.get((cx, cy, other))
+            if entry is not None and entry[1] is not None:
+                return entry[1]
+
+        return None
+
+    def draw(self, painter, rect, level):
+        """
+        Draws every chunk that intersects rect, scheduling the missing and
+        outdated ones for rendering
+        """
+        if self.generation != TileChunkGeneration:
+            self.clear()
+
+        span = TileChunkSize * 24
+        cx1 = max(int(rect.x() // span), 0)
+        cy1 = max(int(rect.y() // span), 0)
+        cx2 = int((rect.x() + rect.width()) // span) + 1
+        cy2 = int((rect.y() + rect.height()) // span) + 1
+
+        versions = TileChunkVersions
+        stale = []
+
+        for cy in range(cy1, cy2):
+            for cx in range(cx1, cx2):
+                key = (cx, cy, level)
+                version = versions.get((cx, cy), 0)
+                entry = self.chunks.get(key)
+
+                if entry is None or entry[0] != version:
+                    stale.append((cx, cy, version, entry))
+                    continue
+
+                self.chunks.move_to_end(key)
+                if entry[1] is not None:
+                    painter.drawPixmap(QtCore.QRectF(cx * span, cy * span, span, span), entry[1], QtCore.QRectF(entry[1].rect()))
+
+        if not stale: return
+
+        # Build the tilemaps of every outdated chunk in one go
+        cs = TileChunkSize
+        sx1 = min(c[0] for c in stale)
+        sy1 = min(c[1] for c in stale)
+        sx2 = max(c[0] for c in stale) + 1
+        sy2 = max(c[1] for c in stale) + 1
+        regiontmaps = BuildLayerTilemaps(sx1 * cs, sy1 * cs, (sx2 - sx1) * cs, (sy2 - sy1) * cs)
+        synced = 0
+
+        for cx, cy, version, entry in stale:
+            key = (cx, cy, level)
+            xs = (cx - sx1) * cs
+            ys = (cy - sy1) * cs
+
+            tmaps = []
+            for regiontmap in regiontmaps:
+                tmap = [row[xs:xs + cs] for row in regiontmap[ys:ys + cs]]
+                if any(any(row) for row in tmap):
+                    tmaps.append(tmap)
+
+            if not tmaps:
+                self.store(key, version, None)
+                self.pending.pop(key, None)
+                continue
+
+            target = QtCore.QRectF(cx * span, cy * span, span, span)
+            renderer = TileChunkRenderer(self, key, version, tmaps, level, TileSources(tmaps, level), self.generation)
+
+            if entry is not None and synced < TileChunkSyncLimit:
+                # The chunk was just edited: redraw it right away, so
+                # the edit doesn't lag behind
+                synced += 1
+                pix = QtGui.QPixmap.fromImage(renderer.render())
+                self.store(key, version, pix)
+                self.pending.pop(key, None)
+                painter.drawPixmap(target, pix, QtCore.QRectF(pix.rect()))
+                continue
+
+            if self.pending.get(key) != version:
+                self.pending[key] = version
+                self.pool.start(renderer)
+
+            pix = self.placeholder(cx, cy, level)
+            if pix is not None:
+                painter.drawPixmap(target, pix, QtCore.QRectF(pix.rect()))
+
+
 class LevelScene(QtWidgets.QGraphicsScene):
     """
     GraphicsScene subclass for the level scene
@@ -16076,6 +16444,8 @@ class LevelScene(QtWidgets.QGraphicsScene):
         self.bgbrush = QtGui.QBrush(theme.color('bg'))
         QtWidgets.QGraphicsScene.__init__(self, *args)
 
+        self.chunkCache = TileChunkCache(self)
+
     def drawBackground(self, painter, rect):
         """
         Draws all visible tiles
@@ -16083,89 +16453,38 @@ class LevelScene(QtWidgets.QGraphicsScene):
         painter.fillRect(rect, self.bgbrush)
         if not hasattr(Area, 'layers'): return
 
-        drawrect = QtCore.QRectF(rect.x() / 24, rect.y() / 24, rect.width() / 24 + 1, rect.height() / 24 + 1)
-        isect = drawrect.intersects
-
-        layer0 = []
-        layer1 = []
-        layer2 = []
-
-        x1 = 1024
-        y1 = 512
-        x2 = 0
-        y2 = 0
-
-        # iterate through each object
-        funcs = [layer0.append, layer1.append, layer2.append]
-        show = [Layer0Shown, Layer1Shown, Layer2Shown]
-        for layer, add, process in zip(Area.layers, funcs, show):
-            if not process: continue
-            for item in layer:
-                if not isect(item.LevelRect): continue
-                add(item)
-                xs = item.objx
-                xe = xs + item.width
-                ys = item.objy
-                ye = ys + item.height
-                if xs < x1: x1 = xs
-                if xe > x2: x2 = xe
-                if ys < y1: y1 = ys
-                if ye > y2: y2 = ye
-
-        width = x2 - x1
-        height = y2 - y1
-        tiles = Tiles
-
-        # create and draw the tilemaps
-        for layer in [layer2, layer1, layer0]:
-            if len(layer) > 0:
-                tmap = []
-                i = 0
-                while i < height:
-                    tmap.append([None] * width)
-                    i += 1
+        # Use the painter's actual scale rather than mainWindow.ZoomLevel,
+        # so screenshots rendered at 100% still get full-size tiles
+        level = TileMipLevelForZoom(painter.worldTransform().m11() * 100)
 
-                for item in layer:
-                    startx = item.objx - x1
-                    desty = item.objy - y1
-
-                    exists = True
-                    if ObjectDefinitions[item.tileset] is None:
-                        exists = False
-                    elif ObjectDefinitions[item.tileset][item.type] is None:
-                        exists = False
-
-                    for row in item.objdata:
-                        destrow = tmap[desty]
-                        destx = startx
-                        for tile in row:
-                            if not exists:
-                                destrow[destx] = -1
-                            elif tile > 0:
-                                destrow[destx] = tile
-                            destx += 1
-                        desty += 1
+        if not TilesetsAnimating:
+            self.chunkCache.draw(painter, rect, level)
+            return
 
-                painter.save()
-                painter.translate(x1 * 24, y1 * 24)
-                desty = 0
-                for row in tmap:
-                    destx = 0
-                    for tile in row:
-                        pix = None
+        # Animated tiles change every frame, so there's no point in caching
+        # them: draw the tiles directly instead
+        x = int(rect.x() // 24)
+        y = int(rect.y() // 24)
+        width = int(rect.width() // 24) + 2
+        height = int(rect.height() // 24) + 2
+        tmaps = BuildLayerTilemaps(x, y, width, height)
 
-                        if tile == -1:
-                            # Draw unknown tiles
-                            pix = Overrides[108].getCurrentTile()
-                        elif tile is not None:
-                            pix = tiles[tile].getCurrentTile()
+        size = 1 if level is None else 24 >> level
+        painter.save()
+        painter.translate(x * 24, y * 24)
+        painter.scale(24 / size, 24 / size)
+        PaintTilemaps(painter, tmaps, level, TileSources(tmaps, level))
+        painter.restore()
 
-                        if pix is not None:
-                            painter.drawPixmap(destx, desty, pix)
+    def helpEvent(self, event):
+        """
+        Sets the tooltips that were deferred while loading the level
+        """
+        for item in self.items(event.scenePos()):
+            if isinstance(item, ObjectItem) and item.tooltipPending:
+                item.UpdateTooltip()
 
-                        destx += 24
-                    desty += 24
-                painter.restore()
+        super().helpEvent(event)
 
     def getMainWindow(self):
         global mainWindow
@@ -16201,6 +16520,7 @@ class LevelViewWidget(QtWidgets.QGraphicsView):
         self.currentobj = None
         self.mouseGridPosition = None  # QUICKPAINT purposes
         self.prev_mouseGridPosition = None  # QUICKPAINT purposes
+        self.gridCache = {}
 
     def mousePressEvent(self, event):
         """
@@ -16275,7 +16595,7 @@ class LevelViewWidget(QtWidgets.QGraphicsView):
                     spr.positionChanged = mw.HandleSprPosChange
                     mw.scene.addItem(spr)
 
-                    spr.listitem = ListWidgetItem_SortsByOther(spr)
+                    spr.listitem = LevelItemListEntry(spr)
                     mw.spriteList.addItem(spr.listitem)
                     Area.sprites.append(spr)
 
@@ -16310,7 +16630,7 @@ class LevelViewWidget(QtWidgets.QGraphicsView):
                 elist = mw.entranceList
                 # if it's the first available ID, all the other indexes should match right?
                 # so I can just use the ID to insert
-                ent.listitem = ListWidgetItem_SortsByOther(ent)
+                ent.listitem = LevelItemListEntry(ent)
                 elist.insertItem(minimumID, ent.listitem)
 
                 global PaintingEntrance, PaintingEntranceListIndex
@@ -16447,7 +16767,7 @@ class LevelViewWidget(QtWidgets.QGraphicsView):
                 mw = mainWindow
                 loc.positionChanged = mw.HandleLocPosChange
                 loc.sizeChanged = mw.HandleLocSizeChange
-                loc.listitem = ListWidgetItem_SortsByOther(loc)
+                loc.listitem = LevelItemListEntry(loc)
                 mw.locationList.addItem(loc.listitem)
                 mw.scene.addItem(loc)
 
@@ -16861,98 +17181,139 @@ class LevelViewWidget(QtWidgets.QGraphicsView):
         if GridType is None: return
 
         Zoom = mainWindow.ZoomLevel
-        drawLine = painter.drawLine
         GridColor = theme.color('grid')
 
         if GridType == 'grid':  # draw a classic grid
-            startx = rect.x()
-            startx -= (startx % 24)
-            endx = startx + rect.width() + 24
-
-            starty = rect.y()
-            starty -= (starty % 24)
-            endy = starty + rect.height() + 24
-
-            x = startx - 24
-            while x <= endx:
-                x += 24
-                if x % 192 == 0:
-                    painter.setPen(QtGui.QPen(GridColor, 2, Qt.DashLine))
-                    drawLine(x, starty, x, endy)
-                elif x % 96 == 0:
-                    if Zoom < 25: continue
-                    painter.setPen(QtGui.QPen(GridColor, 1, Qt.DashLine))
-                    drawLine(x, starty, x, endy)
-                else:
-                    if Zoom < 50: continue
-                    painter.setPen(QtGui.QPen(GridColor, 1, Qt.DotLine))
-                    drawLine(x, starty, x, endy)
-
-            y = starty - 24
-            while y <= endy:
-                y += 24
-                if y % 192 == 0:
-                    painter.setPen(QtGui.QPen(GridColor, 2, Qt.DashLine))
-                    drawLine(startx, y, endx, y)
-                elif y % 96 == 0 and Zoom >= 25:
-                    painter.setPen(QtGui.QPen(GridColor, 1, Qt.DashLine))
-                    drawLine(startx, y, endx, y)
-                elif Zoom >= 50:
-                    painter.setPen(QtGui.QPen(GridColor, 1, Qt.DotLine))
-                    drawLine(startx, y, endx, y)
+            # The grid is drawn in device pixels, so the lines stay sharp
+            transform = painter.worldTransform()
+            scale = transform.m11()
+            board = self.getGridPixmap(Zoom, scale, GridColor)
+
+            devrect = transform.mapRect(rect)
+            origin = transform.map(QtCore.QPointF(0, 0))
+            offset = QtCore.QPointF(
+                (devrect.x() - origin.x()) % board.width(),
+                (devrect.y() - origin.y()) % board.height(),
+            )
+
+            painter.save()
+            painter.resetTransform()
+            painter.drawTiledPixmap(devrect, board, offset)
+            painter.restore()
 
         else:  # draw a checkerboard
-            L = 0.2
-            D = 0.1  # Change these values to change the checkerboard opacity
-
-            Light = QtGui.QColor(GridColor)
-            Dark = QtGui.QColor(GridColor)
-            Light.setAlpha(Light.alpha() * L)
-            Dark.setAlpha(Dark.alpha() * D)
-
-            size = 24 if Zoom >= 50 else 96
-
-            board = QtGui.QPixmap(8 * size, 8 * size)
-            board.fill(QtGui.QColor(0, 0, 0, 0))
-            p = QtGui.QPainter(board)
-            p.setPen(Qt.NoPen)
-
-            p.setBrush(QtGui.QBrush(Light))
-            for x, y in ((0, size), (size, 0)):
-                p.drawRect(x + (4 * size), y, size, size)
-                p.drawRect(x + (4 * size), y + (2 * size), size, size)
-                p.drawRect(x + (6 * size), y, size, size)
-                p.drawRect(x + (6 * size), y + (2 * size), size, size)
-
-                p.drawRect(x, y + (4 * size), size, size)
-                p.drawRect(x, y + (6 * size), size, size)
-                p.drawRect(x + (2 * size), y + (4 * size), size, size)
-                p.drawRect(x + (2 * size), y + (6 * size), size, size)
-            p.setBrush(QtGui.QBrush(Dark))
-            for x, y in ((0, 0), (size, size)):
-                p.drawRect(x, y, size, size)
-                p.drawRect(x, y + (2 * size), size, size)
-                p.drawRect(x + (2 * size), y, size, size)
-                p.drawRect(x + (2 * size), y + (2 * size), size, size)
-
-                p.drawRect(x, y + (4 * size), size, size)
-                p.drawRect(x, y + (6 * size), size, size)
-                p.drawRect(x + (2 * size), y + (4 * size), size, size)
-                p.drawRect(x + (2 * size), y + (6 * size), size, size)
-
-                p.drawRect(x + (4 * size), y, size, size)
-                p.drawRect(x + (4 * size), y + (2 * size), size, size)
-                p.drawRect(x + (6 * size), y, size, size)
-                p.drawRect(x + (6 * size), y + (2 * size), size, size)
-
-                p.drawRect(x + (4 * size), y + (4 * size), size, size)
-                p.drawRect(x + (4 * size), y + (6 * size), size, size)
-                p.drawRect(x + (6 * size), y + (4 * size), size, size)
-                p.drawRect(x + (6 * size), y + (6 * size), size, size)
+            board = self.getCheckerboardPixmap(24 if Zoom >= 50 else 96, GridColor)
+            painter.drawTiledPixmap(rect, board, QtCore.QPointF(rect.x(), rect.y()))
 
-            del p
+    def getGridPixmap(self, Zoom, scale, GridColor):
+        """
+        Returns a tileable pixmap of the classic grid, rendered at the given
+        scale. Pixmaps are cached per zoom level and grid color.
+        """
+        key = ('grid', Zoom, scale, GridColor.rgba())
+        if key in self.gridCache:
+            return self.gridCache[key]
 
-            painter.drawTiledPixmap(rect, board, QtCore.QPointF(rect.x(), rect.y()))
+        # The pattern repeats every 192 units (8 blocks); use as many
+        # repetitions as needed for the pixmap to be a whole number of
+        # pixels wide, so the tiles line up exactly
+        period = 192
+        for count in range(1, 41):
+            if abs(period * count * scale - round(period * count * scale)) < 1e-6:
+                break
+        else:
+            count = 1
+        span = period * count
+        size = max(int(round(span * scale)), 1)
+
+        board = QtGui.QPixmap(size, size)
+        board.fill(QtGui.QColor(0, 0, 0, 0))
+        p = QtGui.QPainter(board)
+        p.scale(scale, scale)
+
+        major = QtGui.QPen(GridColor, 2, Qt.DashLine)
+        medium = QtGui.QPen(GridColor, 1, Qt.DashLine)
+        minor = QtGui.QPen(GridColor, 1, Qt.DotLine)
+
+        # Lines on the edges are drawn on both sides, so that each tile
+        # gets its half of them
+        for pos in range(0, span + 1, 24):
+            if pos % 192 == 0:
+                p.setPen(major)
+            elif pos % 96 == 0:
+                if Zoom < 25: continue
+                p.setPen(medium)
+            else:
+                if Zoom < 50: continue
+                p.setPen(minor)
+
+            p.drawLine(pos, 0, pos, span)
+            p.drawLine(0, pos, span, pos)
+
+        del p
+
+        self.gridCache = {key: board}
+        return board
+
+    def getCheckerboardPixmap(self, size, GridColor):
+        """
+        Returns a tileable 8x8-cell checkerboard pixmap. Pixmaps are cached
+        per cell size and grid color.
+        """
+        key = ('checker', size, GridColor.rgba())
+        if key in self.gridCache:
+            return self.gridCache[key]
+
+        L = 0.2
+        D = 0.1  # Change these values to change the checkerboard opacity
+
+        Light = QtGui.QColor(GridColor)
+        Dark = QtGui.QColor(GridColor)
+        Light.setAlpha(Light.alpha() * L)
+        Dark.setAlpha(Dark.alpha() * D)
+
+        board = QtGui.QPixmap(8 * size, 8 * size)
+        board.fill(QtGui.QColor(0, 0, 0, 0))
+        p = QtGui.QPainter(board)
+        p.setPen(Qt.NoPen)
+
+        p.setBrush(QtGui.QBrush(Light))
+        for x, y in ((0, size), (size, 0)):
+            p.drawRect(x + (4 * size), y, size, size)
+            p.drawRect(x + (4 * size), y + (2 * size), size, size)
+            p.drawRect(x + (6 * size), y, size, size)
+            p.drawRect(x + (6 * size), y + (2 * size), size, size)
+
+            p.drawRect(x, y + (4 * size), size, size)
+            p.drawRect(x, y + (6 * size), size, size)
+            p.drawRect(x + (2 * size), y + (4 * size), size, size)
+            p.drawRect(x + (2 * size), y + (6 * size), size, size)
+        p.setBrush(QtGui.QBrush(Dark))
+        for x, y in ((0, 0), (size, size)):
+            p.drawRect(x, y, size, size)
+            p.drawRect(x, y + (2 * size), size, size)
+            p.drawRect(x + (2 * size), y, size, size)
+            p.drawRect(x + (2 * size), y + (2 * size), size, size)
+
+            p.drawRect(x, y + (4 * size), size, size)
+            p.drawRect(x, y + (6 * size), size, size)
+            p.drawRect(x + (2 * size), y + (4 * size), size, size)
+            p.drawRect(x + (2 * size), y + (6 * size), size, size)
+
+            p.drawRect(x + (4 * size), y, size, size)
+            p.drawRect(x + (4 * size), y + (2 * size), size, size)
+            p.drawRect(x + (6 * size), y, size, size)
+            p.drawRect(x + (6 * size), y + (2 * size), size, size)
+
+            p.drawRect(x + (4 * size), y + (4 * size), size, size)
+            p.drawRect(x + (4 * size), y + (6 * size), size, size)
+            p.drawRect(x + (6 * size), y + (4 * size), size, size)
+            p.drawRect(x + (6 * size), y + (6 * size), size, size)
+
+        del p
+
+        self.gridCache = {key: board}
+        return board
 
 
 ####################################################################
@@ -17086,11 +17447,13 @@ class AboutDialog(QtWidgets.QDialog):
         description += '<center><h1><i>Reggie Next</i> Level Editor</h1><div class="main">'
         description += '<i>Reggie Next Level Editor</i> is an open-source project, started by Treeki in 2010 and forked by RoadrunnerWMC in 2013, that aims to bring you the fun of designing original New Super Mario Bros. Wii&trade;-compatible levels.<br>'
         description += 'Interested? Check out <a href="http://horizonwii.net">horizonwii.net</a> to get in touch with the current developer(s).<br>'
+        description += '<br>Codecs: ' + ', '.join('%s (%s)' % (codec, backend) for codec, (backend, _) in sorted(CodecBackends.items()))
         description += '</div></center></body></html>'
 
-        # Description label
+        # Description label; hovering it shows why the faster codecs aren't in use
         descLabel = QtWidgets.QLabel()
         descLabel.setText(description)
+        descLabel.setToolTip('\n'.join(failure for _, failures in CodecBackends.values() for failure in failures))
         descLabel.setMinimumWidth(512)
         descLabel.setWordWrap(True)
 
@@ -19134,7 +19497,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
                 obj.setSelected(False)
                 mainWindow.scene.removeItem(obj)
 
-            mainWindow.levelOverview.update()
+            mainWindow.levelOverview.Invalidate()
 
     def CrashSprites(self, mode='f'):
         """
@@ -19156,7 +19519,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
                 sprite.delete()
                 sprite.setSelected(False)
                 mainWindow.scene.removeItem(sprite)
-                mainWindow.levelOverview.update()
+                mainWindow.levelOverview.Invalidate()
 
     def CrashSpriteSettings(self, mode='f'):
         """
@@ -19237,7 +19600,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
                 new.positionChanged = mainWindow.HandleSprPosChange
                 mainWindow.scene.addItem(new)
 
-                new.listitem = ListWidgetItem_SortsByOther(new)
+                new.listitem = LevelItemListEntry(new)
                 mainWindow.spriteList.addItem(new.listitem)
                 Area.sprites.append(new)
                 mainWindow.scene.update()
@@ -19261,8 +19624,9 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
                 mainWindow.scene.removeItem(spr)
 
             Area.sprites = Area.sprites[0:max]
+            Area.InvalidateZoneEffectSprites()
             mainWindow.scene.update()
-            mainWindow.levelOverview.update()
+            mainWindow.levelOverview.Invalidate()
 
     def DuplicateEntranceIDs(self, mode='f'):
         """
@@ -19310,7 +19674,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
             mainWindow.scene.addItem(ent)
 
             elist = mainWindow.entranceList
-            ent.listitem = ListWidgetItem_SortsByOther(ent)
+            ent.listitem = LevelItemListEntry(ent)
             elist.insertItem(Area.startEntrance, ent.listitem)
 
             global PaintingEntrance, PaintingEntranceListIndex
@@ -19412,9 +19776,10 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
             return problem
         elif problem:
             Area.zones = Area.zones[0:8]
+            Area.InvalidateZoneEffectSprites()
 
             mainWindow.scene.update()
-            mainWindow.levelOverview.update()
+            mainWindow.levelOverview.Invalidate()
 
     def NoZones(self, mode='f'):
         """
@@ -19437,7 +19802,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
             Area.zones.append(z)
             mainWindow.scene.addItem(z)
             mainWindow.scene.update()
-            mainWindow.levelOverview.update()
+            mainWindow.levelOverview.Invalidate()
 
     def ZonesTooClose(self, mode='f'):
         """
@@ -19628,7 +19993,7 @@ class DiagnosticToolDialog(QtWidgets.QDialog):
             z.UpdateRects()
 
         mainWindow.scene.update()
-        mainWindow.levelOverview.update()
+        mainWindow.levelOverview.Invalidate()
 
     def UnusedBackgrounds(self, mode='f'):
         """
@@ -20864,76 +21229,259 @@ class UpdateDialog(QtWidgets.QDialog):
             # Updates!
             self.msgLabel.setText(trans.string('Updates', 3, '[name]', name, '[info]', infourl))
 
-            self.dldBtn.show()
-            self.dldBtn.url = url  # hacky method
+            self.dldBtn.show()
+            self.dldBtn.url = url  # hacky method
+
+    def handleDldBtn(self):
+        """
+        Handles the user clicking the Download Now button
+        """
+        self.dldBtn.hide()
+        self.progLabel.show()
+        self.progLabel.setText(trans.string('Updates', 5))
+
+        downloader = self.downloader(self.dldBtn.url)
+        downloader.done.connect(self.handleDldDone)
+
+        thread = threading.Thread(None, downloader.run)
+        thread.start()
+
+    def handleDldDone(self):
+        """
+        The download finished
+        """
+        self.progLabel.setText(trans.string('Updates', 6))
+
+    class downloader(QtCore.QObject):
+        """
+        An object that downloads the update. Contains signals.
+        """
+        done = QtCore.pyqtSignal()
+
+        def __init__(self, url):
+            """
+            Initializes it
+            """
+            QtCore.QObject.__init__(self)
+            self.url = url
+
+        def run(self):
+            """
+            Runs the download
+            """
+            local_filename, headers = urllib.request.urlretrieve(self.url)
+
+            if local_filename.startswith('\\'):
+                local_filename = local_filename[1:]
+            dest = os.path.dirname(sys.argv[0])
+
+            zipfile.ZipFile(local_filename).extractall(dest)
+
+            time.sleep(8)
+
+            self.done.emit()
+
+
+class ListWidgetWithToolTipSignal(QtWidgets.QListWidget):
+    """
+    A QtWidgets.QListWidget that includes a signal that
+    is emitted when a tooltip is about to be shown. Useful
+    for making tooltips that update every time you show
+    them.
+    """
+    toolTipAboutToShow = QtCore.pyqtSignal(QtWidgets.QListWidgetItem)
+
+    def viewportEvent(self, e):
+        """
+        Handles viewport events
+        """
+        if e.type() == e.ToolTip:
+            item = self.itemFromIndex(self.indexAt(e.pos()))
+            if item is not None:
+                self.toolTipAboutToShow.emit(item)
+
+        return super().viewportEvent(e)
+
+
+class LevelItemListModel(QtCore.QAbstractListModel):
+    """
+    List model over LevelItemListEntry rows. If sorted, rows are kept in
+    the order of the items they refer to.
+    """
+
+    def __init__(self, sorted=False):
+        super().__init__()
+        self.entries = []
+        self.sorted = sorted
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid(): return 0
+        return len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+
+        if role == Qt.DisplayRole:
+            return self.entries[index.row()].text()
+        elif role == Qt.ToolTipRole:
+            return self.entries[index.row()].tooltip
+
+        return None
+
+    def entry(self, index):
+        if not index.isValid(): return None
+        return self.entries[index.row()]
+
+    def row(self, entry):
+        try:
+            return self.entries.index(entry)
+        except ValueError:
+            return -1
 
-    def handleDldBtn(self):
+    def addEntries(self, entries):
         """
-        Handles the user clicking the Download Now button
+        Adds several entries at once
         """
-        self.dldBtn.hide()
-        self.progLabel.show()
-        self.progLabel.setText(trans.string('Updates', 5))
+        entries = list(entries)
+        if not entries: return
 
-        downloader = self.downloader(self.dldBtn.url)
-        downloader.done.connect(self.handleDldDone)
+        if self.sorted and self.entries:
+            for entry in entries: self.insertEntry(entry)
+            return
 
-        thread = threading.Thread(None, downloader.run)
-        thread.start()
+        if self.sorted: entries.sort()
+        for entry in entries: entry.model = self
 
-    def handleDldDone(self):
+        first = len(self.entries)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+    def insertEntry(self, entry, row=None):
         """
-        The download finished
+        Inserts an entry at row, or where it sorts to
         """
-        self.progLabel.setText(trans.string('Updates', 6))
+        if self.sorted:
+            row = bisect.bisect_right(self.entries, entry)
+        elif row is None or not 0 <= row <= len(self.entries):
+            row = len(self.entries)
 
-    class downloader(QtCore.QObject):
+        entry.model = self
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.entries.insert(row, entry)
+        self.endInsertRows()
+
+    def takeRow(self, row):
         """
-        An object that downloads the update. Contains signals.
+        Removes the entry at row and returns it
         """
-        done = QtCore.pyqtSignal()
+        if not 0 <= row < len(self.entries): return None
 
-        def __init__(self, url):
-            """
-            Initializes it
-            """
-            QtCore.QObject.__init__(self)
-            self.url = url
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        entry = self.entries.pop(row)
+        self.endRemoveRows()
 
-        def run(self):
-            """
-            Runs the download
-            """
-            local_filename, headers = urllib.request.urlretrieve(self.url)
+        entry.model = None
+        return entry
 
-            if local_filename.startswith('\\'):
-                local_filename = local_filename[1:]
-            dest = os.path.dirname(sys.argv[0])
+    def clear(self):
+        self.beginResetModel()
+        for entry in self.entries: entry.model = None
+        self.entries = []
+        self.endResetModel()
 
-            zipfile.ZipFile(local_filename).extractall(dest)
+    def entryChanged(self, entry, shown):
+        """
+        Moves an entry whose sort key may have changed, and refreshes it
+        if it has been displayed
+        """
+        if not (self.sorted or shown): return
 
-            time.sleep(8)
+        row = self.row(entry)
+        if row == -1: return
 
-            self.done.emit()
+        entries = self.entries
+        if self.sorted and ((row > 0 and entry < entries[row - 1])
+                            or (row + 1 < len(entries) and entries[row + 1] < entry)):
+            others = entries[:row] + entries[row + 1:]
+            dest = bisect.bisect_right(others, entry)
 
+            self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), dest if dest < row else dest + 1)
+            entries[:] = others
+            entries.insert(dest, entry)
+            self.endMoveRows()
+            row = dest
 
-class ListWidgetWithToolTipSignal(QtWidgets.QListWidget):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class LevelItemListView(QtWidgets.QListView):
     """
-    A QtWidgets.QListWidget that includes a signal that
-    is emitted when a tooltip is about to be shown. Useful
-    for making tooltips that update every time you show
-    them.
+    A list view of level items, built on a LevelItemListModel. Keeps the
+    parts of the QListWidget API the editor uses, and emits
+    toolTipAboutToShow like ListWidgetWithToolTipSignal.
     """
-    toolTipAboutToShow = QtCore.pyqtSignal(QtWidgets.QListWidgetItem)
+    itemActivated = QtCore.pyqtSignal(object)
+    toolTipAboutToShow = QtCore.pyqtSignal(object)
+
+    def __init__(self, sorted=False):
+        super().__init__()
+        self.listModel = LevelItemListModel(sorted)
+
+        self.filterModel = QtCore.QSortFilterProxyModel(self)
+        self.filterModel.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filterModel.setSourceModel(self.listModel)
+
+        self.setModel(self.filterModel)
+        self.setUniformItemSizes(True)
+        self.activated.connect(self.HandleActivated)
+
+    def entryAt(self, index):
+        return self.listModel.entry(self.filterModel.mapToSource(index))
+
+    def indexOf(self, entry):
+        row = self.listModel.row(entry)
+        if row == -1: return QtCore.QModelIndex()
+        return self.filterModel.mapFromSource(self.listModel.index(row))
+
+    def HandleActivated(self, index):
+        entry = self.entryAt(index)
+        if entry is not None:
+            self.itemActivated.emit(entry)
+
+    def setFilterText(self, text):
+        self.filterModel.setFilterFixedString(text)
+
+    def addItem(self, entry):
+        self.listModel.insertEntry(entry)
+
+    def addItems(self, entries):
+        self.listModel.addEntries(entries)
+
+    def insertItem(self, row, entry):
+        self.listModel.insertEntry(entry, row)
+
+    def row(self, entry):
+        return self.listModel.row(entry)
+
+    def takeItem(self, row):
+        return self.listModel.takeRow(row)
+
+    def clear(self):
+        self.listModel.clear()
+
+    def setCurrentItem(self, entry):
+        self.selectionModel().setCurrentIndex(self.indexOf(entry), QtCore.QItemSelectionModel.ClearAndSelect)
 
     def viewportEvent(self, e):
         """
         Handles viewport events
         """
         if e.type() == e.ToolTip:
-            item = self.itemFromIndex(self.indexAt(e.pos()))
-            if item is not None:
-                self.toolTipAboutToShow.emit(item)
+            entry = self.entryAt(self.indexAt(e.pos()))
+            if entry is not None:
+                self.toolTipAboutToShow.emit(entry)
 
         return super().viewportEvent(e)
 
@@ -20986,6 +21534,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         # required variables
         self.UpdateFlag = False
         self.SelectionUpdateFlag = False
+        self.spriteImageUpdatePending = False
         self.selObj = None
         self.CurrentSelection = []
 
@@ -21029,7 +21578,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         self.AutosaveTimer.start(20000)
 
         # set up actions and menus
-        self.SetupActionsAndMenus()
+        with StartupTimer.phase('SetupActionsAndMenus'):
+            self.SetupActionsAndMenus()
 
         # set up the status bar
         self.posLabel = QtWidgets.QLabel()
@@ -21046,21 +21596,23 @@ class ReggieWindow(QtWidgets.QMainWindow):
         self.statusBar().addPermanentWidget(self.ZoomStatusWidget)
 
         # create the various panels
-        self.SetupDocksAndPanels()
+        with StartupTimer.phase('SetupDocksAndPanels'):
+            self.SetupDocksAndPanels()
 
         # now get stuff ready
         loaded = False
 
-        if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]) and IsNSMBLevel(sys.argv[1]):
-            loaded = self.LoadLevel(None, sys.argv[1], True, 1)
-        elif settings.contains(('LastLevel_' + gamedef.name) if gamedef.custom else 'LastLevel'):
-            lastlevel = str(gamedef.GetLastLevel())
-            loaded = self.LoadLevel(None, lastlevel, True, 1)
+        with StartupTimer.phase('LoadLevel'):
+            if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]) and IsNSMBLevel(sys.argv[1]):
+                loaded = self.LoadLevel(None, sys.argv[1], True, 1)
+            elif settings.contains(('LastLevel_' + gamedef.name) if gamedef.custom else 'LastLevel'):
+                lastlevel = str(gamedef.GetLastLevel())
+                loaded = self.LoadLevel(None, lastlevel, True, 1)
 
-        if not loaded:
-            self.LoadLevel(None, '01-01', False, 1)
+            if not loaded:
+                self.LoadLevel(None, '01-01', False, 1)
 
-        QtCore.QTimer.singleShot(100, self.levelOverview.update)
+        QtCore.QTimer.singleShot(100, self.levelOverview.Invalidate)
 
         # call each toggle-button handler to set each feature correctly upon
         # startup
@@ -21071,8 +21623,9 @@ class ReggieWindow(QtWidgets.QMainWindow):
             self.HandleCommentsVisibility: CommentsShown,
             self.HandlePathsVisibility: PathsShown,
         }
-        for handler in toggleHandlers:
-            handler(toggleHandlers[handler])
+        with StartupTimer.phase('ToggleHandlers'):
+            for handler in toggleHandlers:
+                handler(toggleHandlers[handler])
 
         # let's restore the state and geometry
         # geometry: determines the main window position
@@ -21083,7 +21636,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
             self.restoreState(setting('MainWindowState'), 0)
 
         # Load the most recently used gamedef
-        LoadGameDef(setting('LastGameDef'), False)
+        with StartupTimer.phase('LoadGameDef'):
+            LoadGameDef(setting('LastGameDef'), False)
 
         # Aaaaaand... initializing is done!
         global Initializing
@@ -22008,10 +22562,9 @@ class ReggieWindow(QtWidgets.QMainWindow):
 
         elabel = QtWidgets.QLabel(trans.string('Palette', 8))
         elabel.setWordWrap(True)
-        self.entranceList = ListWidgetWithToolTipSignal()
+        self.entranceList = LevelItemListView(True)
         self.entranceList.itemActivated.connect(self.HandleEntranceSelectByList)
         self.entranceList.toolTipAboutToShow.connect(self.HandleEntranceToolTipAboutToShow)
-        self.entranceList.setSortingEnabled(True)
 
         eel.addWidget(elabel)
         eel.addWidget(self.entranceList)
@@ -22026,10 +22579,9 @@ class ReggieWindow(QtWidgets.QMainWindow):
 
         Llabel = QtWidgets.QLabel(trans.string('Palette', 12))
         Llabel.setWordWrap(True)
-        self.locationList = ListWidgetWithToolTipSignal()
+        self.locationList = LevelItemListView(True)
         self.locationList.itemActivated.connect(self.HandleLocationSelectByList)
         self.locationList.toolTipAboutToShow.connect(self.HandleLocationToolTipAboutToShow)
-        self.locationList.setSortingEnabled(True)
 
         locL.addWidget(Llabel)
         locL.addWidget(self.locationList)
@@ -22201,6 +22753,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         self.levelOverview.Xposlocator = pos
         self.levelOverview.update()
+        self.QueueSpriteImageUpdate()
 
     def YScrollChange(self, pos):
         """
@@ -22208,11 +22761,56 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         self.levelOverview.Yposlocator = pos
         self.levelOverview.update()
+        self.QueueSpriteImageUpdate()
 
     def HandleWindowSizeChange(self, w, h):
         self.levelOverview.Hlocator = h
         self.levelOverview.Wlocator = w
         self.levelOverview.update()
+        self.QueueSpriteImageUpdate()
+
+    def QueueSpriteImageUpdate(self):
+        """
+        Schedules an update of the sprite images near the view
+        """
+        if self.spriteImageUpdatePending: return
+        self.spriteImageUpdatePending = True
+        QtCore.QTimer.singleShot(0, self.UpdateSpriteImages)
+
+    def UpdateSpriteImages(self):
+        """
+        Creates the images of sprites near the view, and releases the ones
+        that have been out of view for a while
+        """
+        self.spriteImageUpdatePending = False
+        if Area is None or not hasattr(Area, 'sprites'): return
+
+        started = time.time()
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        rect.adjust(-SpriteImageMargin, -SpriteImageMargin, SpriteImageMargin, SpriteImageMargin)
+        self.RealizeSpriteImages(rect)
+
+        if SpriteImageReleaseDelay is None: return
+
+        expiry = started - SpriteImageReleaseDelay
+        for spr in Area.sprites:
+            if not spr.imageRealized or spr.lastNearView >= expiry: continue
+            if spr.isSelected() or spr.type in AbstractParsedArea.ZoneEffectSpriteTypes: continue
+            spr.ReleaseImage()
+
+    def RealizeSpriteImages(self, rect):
+        """
+        Creates the images of all sprites within a scene rect
+        """
+        now = time.time()
+        for item in self.scene.items(rect):
+            if not isinstance(item, SpriteItem):
+                # auxiliary objects keep their sprite alive
+                item = item.parentItem()
+                if not isinstance(item, SpriteItem): continue
+
+            item.lastNearView = now
+            item.RealizeImage()
 
     def UpdateTitle(self):
         """
@@ -22559,7 +23157,6 @@ class ReggieWindow(QtWidgets.QMainWindow):
                 self.clipboard = self.encodeObjects(clipboard_o, clipboard_s)
                 self.systemClipboard.setText(self.clipboard)
 
-        self.levelOverview.update()
         self.SelectionUpdateFlag = False
         self.ChangeSelectionHandler()
 
@@ -22737,10 +23334,10 @@ class ReggieWindow(QtWidgets.QMainWindow):
             elif isinstance(item, ObjectItem):
                 item.setPos((item.objx + xoffset) * 24, (item.objy + yoffset) * 24)
             if select: item.setSelected(True)
+            self.levelOverview.InvalidateItem(item)
 
         OverrideSnapping = False
 
-        self.levelOverview.update()
         SetDirty()
         self.SelectionUpdateFlag = False
         self.ChangeSelectionHandler()
@@ -22922,7 +23519,6 @@ class ReggieWindow(QtWidgets.QMainWindow):
                 obj.delete()
                 obj.setSelected(False)
                 self.scene.removeItem(obj)
-                self.levelOverview.update()
                 SetDirty()
 
         if newx != 999999 and newy != 999999:
@@ -22986,15 +23582,9 @@ class ReggieWindow(QtWidgets.QMainWindow):
         fn = QtWidgets.QFileDialog.getOpenFileName(self, trans.string('FileDlgs', 0), '', filetypes)[0]
         if fn == '': return
 
-        with open(str(fn), 'rb') as fileobj:
-            arcdata = fileobj.read()
-        if lh.IsLHCompressed(bytes(arcdata)):
-            try:
-                arcdata = lh.UncompressLH(bytearray(arcdata))
-            except IndexError:
-                QtWidgets.QMessageBox.warning(None, trans.string('Err_Decompress', 0),
-                                              trans.string('Err_Decompress', 1, '[file]', str(fn)))
-                return
+        arcdata = ReadLevelFile(str(fn))
+        if arcdata is None:
+            return
 
         arc = archive.U8.load(arcdata)
 
@@ -23278,11 +23868,43 @@ class ReggieWindow(QtWidgets.QMainWindow):
         Handle activated signals for areaComboBox
         """
         if self.CheckDirty():
-            self.areaComboBox.setCurrentIndex(Area.areanum)
+            self.areaComboBox.setCurrentIndex(Area.areanum - 1)
             return
 
-        if Area.areanum != idx + 1:
+        if Area.areanum == idx + 1: return
+
+        if Dirty:
+            # The changes were discarded, so load the level again without them
             self.LoadLevel(None, self.fileSavePath, True, idx + 1)
+        else:
+            self.SwitchArea(idx + 1)
+
+    def SwitchArea(self, areaNum):
+        """
+        Shows another area of the open level. The level and its parsed areas
+        are kept, so only the contents of the scene change.
+        """
+        global DirtyOverride, LevelPopulating
+
+        DirtyOverride += 1
+
+        self.ClearArea(True)
+
+        LevelPopulating += 1
+        try:
+            Level.switchArea(areaNum)
+        finally:
+            LevelPopulating -= 1
+
+        self.ShowArea()
+        self.FinishLoadingArea(areaNum)
+
+        # Areas that weren't parsed yet show the splashscreen while loading
+        if hasattr(app, 'splashScreen'):
+            app.splashScreen.hide()
+            del app.splashScreen
+
+        DirtyOverride -= 1
 
     def HandleUpdateLayer0(self, checked):
         """
@@ -23296,6 +23918,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             for obj in Area.layers[0]:
                 obj.setVisible(Layer0Shown)
 
+        InvalidateTileChunks()
         self.scene.update()
 
     def HandleUpdateLayer1(self, checked):
@@ -23310,6 +23933,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             for obj in Area.layers[1]:
                 obj.setVisible(Layer1Shown)
 
+        InvalidateTileChunks()
         self.scene.update()
 
     def HandleUpdateLayer2(self, checked):
@@ -23324,6 +23948,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             for obj in Area.layers[2]:
                 obj.setVisible(Layer2Shown)
 
+        InvalidateTileChunks()
         self.scene.update()
 
     def HandleTilesetAnimToggle(self, checked):
@@ -23345,6 +23970,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         global CollisionsShown
 
         CollisionsShown = checked
+        InvalidateTileChunks()
 
         setSetting('ShowCollisions', CollisionsShown)
         self.scene.update()
@@ -23624,6 +24250,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         self.ZoomLevel = z
         self.view.setTransform(tr)
         self.levelOverview.mainWindowScale = z / 100.0
+        self.QueueSpriteImageUpdate()
 
         zi = self.ZoomLevels.index(z)
         self.actions['zoommax'].setEnabled(zi < len(self.ZoomLevels) - 1)
@@ -23652,22 +24279,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         Saves the comments data back to self.Metadata
         """
-        b = []
-        for com in Area.comments:
-            xpos, ypos, tlen = com.objx, com.objy, len(com.text)
-            b.append(xpos >> 24)
-            b.append((xpos >> 16) & 0xFF)
-            b.append((xpos >> 8) & 0xFF)
-            b.append(xpos & 0xFF)
-            b.append(ypos >> 24)
-            b.append((ypos >> 16) & 0xFF)
-            b.append((ypos >> 8) & 0xFF)
-            b.append(ypos & 0xFF)
-            b.append(tlen >> 24)
-            b.append((tlen >> 16) & 0xFF)
-            b.append((tlen >> 8) & 0xFF)
-            b.append(tlen & 0xFF)
-            for char in com.text: b.append(ord(char))
+        b = levelcore.WriteComments(Area.comments)
         Area.Metadata.setBinData('InLevelComments_A%d' % Area.areanum, b)
 
     def closeEvent(self, event):
@@ -23737,7 +24349,13 @@ class ReggieWindow(QtWidgets.QMainWindow):
                                               trans.string('Err_CantFindLevel', 0, '[name]', checkname),
                                               QtWidgets.QMessageBox.Ok)
                 return False
-            if not IsNSMBLevel(checkname):
+
+            # Read and check the file in one go, so it's only decompressed once
+            levelData = ReadLevelFile(checkname)
+            if levelData is None:
+                return False
+
+            if not checkContent(levelData):
                 QtWidgets.QMessageBox.warning(self, 'Reggie!', trans.string('Err_InvalidLevel', 0),
                                               QtWidgets.QMessageBox.Ok)
                 return False
@@ -23747,30 +24365,10 @@ class ReggieWindow(QtWidgets.QMainWindow):
             # Get the data
             global RestoredFromAutoSave
             if not RestoredFromAutoSave:
-
-                # Check if there is a file by this name
-                if not os.path.isfile(name):
-                    QtWidgets.QMessageBox.warning(None, trans.string('Err_MissingLevel', 0),
-                                                  trans.string('Err_MissingLevel', 1, '[file]', name))
-                    return False
-
                 # Set the filepath variables
                 self.fileSavePath = name
                 self.fileTitle = os.path.basename(self.fileSavePath)
 
-                # Open the file
-                with open(self.fileSavePath, 'rb') as fileobj:
-                    levelData = fileobj.read()
-
-                # Decompress, if needed
-                if lh.IsLHCompressed(bytes(levelData)):
-                    try:
-                        levelData = lh.UncompressLH(bytearray(levelData))
-                    except IndexError:
-                        QtWidgets.QMessageBox.warning(None, trans.string('Err_Decompress', 0),
-                                                      trans.string('Err_Decompress', 1, '[file]', name))
-                        return False
-
             else:
                 # Auto-saved level. Check if there's a path associated with it:
 
@@ -23808,9 +24406,57 @@ class ReggieWindow(QtWidgets.QMainWindow):
         # - 7: Preparing editor
 
         # First, clear out the existing level.
+        self.ClearArea()
+
+        app.splashScreen.setProgress(trans.string('Splash', 2), 0)
+
+        # Load the actual level
+        if new:
+            self.newLevel()
+        else:
+            self.LoadLevel_NSMBW(levelData, areaNum)
+
+        self.FinishLoadingArea(areaNum)
+
+        # Turn the dirty flag off
+        DirtyOverride -= 1
+
+        # Remove the splashscreen
+        app.splashScreen.hide()
+        del app.splashScreen
+
+        if new:
+            SetDirty()
+
+        else:
+            # Add the path to Recent Files
+            self.RecentMenu.AddToList(mainWindow.fileSavePath)
+
+        # If we got this far, everything worked! Return True.
+        return True
+
+    def ClearArea(self, keepItems=False):
+        """
+        Takes the current area out of the editor. If keepItems is True, its
+        items are only taken out of the scene, so they can be shown again.
+        """
+        global LevelPopulating
+
         self.scene.clearSelection()
         self.CurrentSelection = []
-        self.scene.clear()
+
+        if keepItems:
+            LevelPopulating += 1
+            try:
+                for item in self.scene.items():
+                    if item.parentItem() is None:
+                        self.scene.removeItem(item)
+            finally:
+                LevelPopulating -= 1
+        else:
+            self.scene.clear()
+
+        InvalidateTileChunks()
 
         # Clear out all level-thing lists
         for thingList in (self.spriteList, self.entranceList, self.locationList, self.pathList, self.commentList):
@@ -23829,13 +24475,11 @@ class ReggieWindow(QtWidgets.QMainWindow):
         global OverrideSnapping
         OverrideSnapping = True
 
-        app.splashScreen.setProgress(trans.string('Splash', 2), 0)
-
-        # Load the actual level
-        if new:
-            self.newLevel()
-        else:
-            self.LoadLevel_NSMBW(levelData, areaNum)
+    def FinishLoadingArea(self, areaNum):
+        """
+        Sets up the editor for the area that was just loaded
+        """
+        global OverrideSnapping
 
         # Set up and reset the Quick Paint Tool
         if hasattr(self, 'quickPaint'):
@@ -23854,7 +24498,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             self.areaComboBox.addItem(trans.string('AreaCombobox', 0, '[num]', i))
         self.areaComboBox.setCurrentIndex(areaNum - 1)
 
-        self.levelOverview.update()
+        self.levelOverview.Invalidate()
 
         # Scroll to the initial entrance
         startEntID = Area.startEntrance
@@ -23883,30 +24527,15 @@ class ReggieWindow(QtWidgets.QMainWindow):
         # Turn snapping back on
         OverrideSnapping = False
 
-        # Turn the dirty flag off
-        DirtyOverride -= 1
         self.UpdateTitle()
 
         # Update UI things
         self.scene.update(0, 0, self.scene.width(), self.scene.height())
 
         self.levelOverview.Reset()
-        self.levelOverview.update()
-        QtCore.QTimer.singleShot(20, self.levelOverview.update)
-
-        # Remove the splashscreen
-        app.splashScreen.hide()
-        del app.splashScreen
-
-        if new:
-            SetDirty()
-
-        else:
-            # Add the path to Recent Files
-            self.RecentMenu.AddToList(mainWindow.fileSavePath)
-
-        # If we got this far, everything worked! Return True.
-        return True
+        self.levelOverview.Invalidate()
+        self.QueueSpriteImageUpdate()
+        QtCore.QTimer.singleShot(20, self.levelOverview.Invalidate)
 
     def newLevel(self):
         # Create the new level object
@@ -23935,15 +24564,31 @@ class ReggieWindow(QtWidgets.QMainWindow):
         Do not call this directly - use LoadLevel(NewSuperMarioBrosWii, ...) instead!
         """
         # Create the new level object
-        global Level
+        global Level, LevelPopulating
         Level = Level_NSMBW()
 
-        # Load it
-        if not Level.load(levelData, areaNum):
+        # Load it. Objects created while populating the level leave
+        # their tooltips and search database entries for later.
+        LevelPopulating += 1
+        try:
+            loaded = Level.load(levelData, areaNum)
+        finally:
+            LevelPopulating -= 1
+
+        if not loaded:
             raise Exception
 
+        self.ShowArea()
+
+    def ShowArea(self):
+        """
+        Fills the editor with the current area
+        """
+        global LevelPopulating
+
         # Prepare the object picker
-        app.splashScreen.setProgress(trans.string('Splash', 4), 7)
+        if hasattr(app, 'splashScreen'):
+            app.splashScreen.setProgress(trans.string('Splash', 4), 7)
 
         self.objUseLayer1.setChecked(True)
 
@@ -23956,83 +24601,94 @@ class ReggieWindow(QtWidgets.QMainWindow):
         self.objAllTab.setTabEnabled(3, (Area.tileset3 != ''))
 
         # Add all things to scene
-        app.splashScreen.setProgress(trans.string('Splash', 5), 8)
+        if hasattr(app, 'splashScreen'):
+            app.splashScreen.setProgress(trans.string('Splash', 5), 8)
 
         # Load events
         self.LoadEventTabFromLevel()
 
-        # Add all things to the scene
-        pcEvent = self.HandleObjPosChange
-        for layer in reversed(Area.layers):
-            for obj in layer:
-                obj.positionChanged = pcEvent
-                self.scene.addItem(obj)
+        # Add all things to the scene. The tile cache and the overview are
+        # rebuilt afterwards, so the items don't update them one by one.
+        LevelPopulating += 1
+        try:
+            pcEvent = self.HandleObjPosChange
+            for layer in reversed(Area.layers):
+                for obj in layer:
+                    obj.positionChanged = pcEvent
+                    self.scene.addItem(obj)
 
-        pcEvent = self.HandleSprPosChange
-        for spr in Area.sprites:
-            spr.positionChanged = pcEvent
-            spr.listitem = ListWidgetItem_SortsByOther(spr)
-            self.spriteList.addItem(spr.listitem)
-            self.scene.addItem(spr)
-            spr.UpdateListItem()
+            # List entries build their text when shown, so they're
+            # added in one go without calling UpdateListItem
+            pcEvent = self.HandleSprPosChange
+            for spr in Area.sprites:
+                spr.positionChanged = pcEvent
+                spr.listitem = LevelItemListEntry(spr)
+                self.scene.addItem(spr)
+            self.spriteList.addItems(spr.listitem for spr in Area.sprites)
 
-        pcEvent = self.HandleEntPosChange
-        for ent in Area.entrances:
-            ent.positionChanged = pcEvent
-            ent.listitem = ListWidgetItem_SortsByOther(ent)
-            ent.listitem.entid = ent.entid
-            self.entranceList.addItem(ent.listitem)
-            self.scene.addItem(ent)
-            ent.UpdateListItem()
+            pcEvent = self.HandleEntPosChange
+            for ent in Area.entrances:
+                ent.positionChanged = pcEvent
+                ent.listitem = LevelItemListEntry(ent)
+                ent.listitem.entid = ent.entid
+                self.scene.addItem(ent)
+            self.entranceList.addItems(ent.listitem for ent in Area.entrances)
+
+            for zone in Area.zones:
+                self.scene.addItem(zone)
+
+            pcEvent = self.HandleLocPosChange
+            scEvent = self.HandleLocSizeChange
+            for location in Area.locations:
+                location.positionChanged = pcEvent
+                location.sizeChanged = scEvent
+                location.listitem = LevelItemListEntry(location)
+                self.scene.addItem(location)
+            self.locationList.addItems(location.listitem for location in Area.locations)
+
+            for path in Area.paths:
+                path.positionChanged = self.HandlePathPosChange
+                path.listitem = ListWidgetItem_SortsByOther(path)
+                self.pathList.addItem(path.listitem)
+                self.scene.addItem(path)
 
-        for zone in Area.zones:
-            self.scene.addItem(zone)
+            for path in Area.pathdata:
+                peline = PathEditorLineItem(path['nodes'])
+                path['peline'] = peline
+                self.scene.addItem(peline)
+                peline.loops = path['loops']
 
-        pcEvent = self.HandleLocPosChange
-        scEvent = self.HandleLocSizeChange
-        for location in Area.locations:
-            location.positionChanged = pcEvent
-            location.sizeChanged = scEvent
-            location.listitem = ListWidgetItem_SortsByOther(location)
-            self.locationList.addItem(location.listitem)
-            self.scene.addItem(location)
-            location.UpdateListItem()
-
-        for path in Area.paths:
-            path.positionChanged = self.HandlePathPosChange
-            path.listitem = ListWidgetItem_SortsByOther(path)
-            self.pathList.addItem(path.listitem)
-            self.scene.addItem(path)
-            path.UpdateListItem()
-
-        for path in Area.pathdata:
-            peline = PathEditorLineItem(path['nodes'])
-            path['peline'] = peline
-            self.scene.addItem(peline)
-            peline.loops = path['loops']
-
-        for path in Area.paths:
-            path.UpdateListItem()
-
-        for com in Area.comments:
-            com.positionChanged = self.HandleComPosChange
-            com.textChanged = self.HandleComTxtChange
-            com.listitem = QtWidgets.QListWidgetItem()
-            self.commentList.addItem(com.listitem)
-            self.scene.addItem(com)
-            com.UpdateListItem()
+            for path in Area.paths:
+                path.UpdateListItem()
+
+            for com in Area.comments:
+                com.positionChanged = self.HandleComPosChange
+                com.textChanged = self.HandleComTxtChange
+                com.listitem = QtWidgets.QListWidgetItem()
+                self.commentList.addItem(com.listitem)
+                self.scene.addItem(com)
+                com.UpdateListItem()
+        finally:
+            LevelPopulating -= 1
 
-    def ReloadTilesets(self, soft=False):
+    def ReloadTilesets(self, soft=False, dataChanged=True):
         """
         Reloads all the tilesets. If soft is True, they will not be reloaded if the filepaths have not changed.
+        If none of them have, and dataChanged is False, the objects aren't redrawn either.
         """
-        LoadTilesetInfo(True)
+        # A soft reload comes from LoadGameDef, which has just parsed the
+        # tileset info and sprite data
+        if not soft:
+            LoadTilesetInfo(True)
 
+        loaded = list(TilesetFilesLoaded)
         tilesets = [Area.tileset0, Area.tileset1, Area.tileset2, Area.tileset3]
         for idx, name in enumerate(tilesets):
             if (name is not None) and (name != ''):
                 LoadTileset(idx, name, not soft)
 
+        if soft and not dataChanged and TilesetFilesLoaded == loaded: return
+
         self.objPicker.LoadFromTilesets()
 
         for layer in Area.layers:
@@ -24041,9 +24697,10 @@ class ReggieWindow(QtWidgets.QMainWindow):
 
         self.scene.update()
 
-        global Sprites
-        Sprites = None
-        LoadSpriteData()
+        if not soft:
+            global Sprites
+            Sprites = None
+            LoadSpriteData()
 
     def ChangeSelectionHandler(self):
         """
@@ -24243,7 +24900,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         if obj == self.selObj:
             if oldx == x and oldy == y: return
             SetDirty()
-        self.levelOverview.update()
+        self.levelOverview.InvalidateItem(obj)
 
     def CreationTabChanged(self, nt):
         """
@@ -24438,6 +25095,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             if oldx == x and oldy == y: return
             obj.UpdateListItem()
             SetDirty()
+        self.levelOverview.InvalidateItem(obj)
 
     def SpriteDataUpdated(self, data):
         """
@@ -24459,6 +25117,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
         obj.UpdateListItem()
         if obj == self.selObj:
             SetDirty()
+        self.levelOverview.InvalidateItem(obj)
 
     def HandlePathPosChange(self, obj, oldx, oldy, x, y):
         """
@@ -24498,12 +25157,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         if self.UpdateFlag: return
 
-        ent = None
-        for check in Area.entrances:
-            if check.listitem == item:
-                ent = check
-                break
-        if ent is None: return
+        ent = item.reference
+        if ent not in Area.entrances: return
 
         ent.ensureVisible(QtCore.QRectF(), 192, 192)
         self.scene.clearSelection()
@@ -24513,12 +25168,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         Handle an entrance being hovered in the list
         """
-        ent = None
-        for check in Area.entrances:
-            if check.listitem == item:
-                ent = check
-                break
-        if ent is None: return
+        ent = item.reference
+        if ent not in Area.entrances: return
 
         ent.UpdateListItem(True)
 
@@ -24528,12 +25179,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         if self.UpdateFlag: return
 
-        loc = None
-        for check in Area.locations:
-            if check.listitem == item:
-                loc = check
-                break
-        if loc is None: return
+        loc = item.reference
+        if loc not in Area.locations: return
 
         loc.ensureVisible(QtCore.QRectF(), 192, 192)
         self.scene.clearSelection()
@@ -24543,12 +25190,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         Handle a location being hovered in the list
         """
-        loc = None
-        for check in Area.locations:
-            if check.listitem == item:
-                loc = check
-                break
-        if loc is None: return
+        loc = item.reference
+        if loc not in Area.locations: return
 
         loc.UpdateListItem(True)
 
@@ -24556,12 +25199,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         Handle a sprite being selected from the list
         """
-        spr = None
-        for check in Area.sprites:
-            if check.listitem == item:
-                spr = check
-                break
-        if spr is None: return
+        spr = item.reference
+        if spr not in Area.sprites: return
 
         spr.ensureVisible(QtCore.QRectF(), 192, 192)
         self.scene.clearSelection()
@@ -24571,12 +25210,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
         """
         Handle a sprite being hovered in the list
         """
-        spr = None
-        for check in Area.sprites:
-            if check.listitem == item:
-                spr = check
-                break
-        if spr is None: return
+        spr = item.reference
+        if spr not in Area.sprites: return
 
         spr.UpdateListItem(True)
 
@@ -24645,7 +25280,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
             self.locationEditor.setLocation(loc)
             SetDirty()
         loc.UpdateListItem()
-        self.levelOverview.update()
+        self.levelOverview.InvalidateItem(loc)
 
     def HandleLocSizeChange(self, loc, width, height):
         """
@@ -24655,7 +25290,6 @@ class ReggieWindow(QtWidgets.QMainWindow):
             self.locationEditor.setLocation(loc)
             SetDirty()
         loc.UpdateListItem()
-        self.levelOverview.update()
 
     def UpdateModeInfo(self):
         """
@@ -24735,7 +25369,6 @@ class ReggieWindow(QtWidgets.QMainWindow):
                     obj.delete()
                     obj.setSelected(False)
                     self.scene.removeItem(obj)
-                    self.levelOverview.update()
                 SetDirty()
                 event.accept()
                 self.SelectionUpdateFlag = False
@@ -24818,6 +25451,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
                     self.scene.removeItem(item)
 
             Area.zones = []
+            Area.InvalidateZoneEffectSprites()
 
             for tab in dlg.zoneTabs:
                 z = tab.zoneObj
@@ -25108,7 +25742,7 @@ class ReggieWindow(QtWidgets.QMainWindow):
                     z.sfxmod = z.sfxmod + 1
 
                 i = i + 1
-        self.levelOverview.update()
+        self.levelOverview.Invalidate()
 
     # Handles setting the backgrounds
     def HandleBG(self):
@@ -25186,6 +25820,8 @@ class ReggieWindow(QtWidgets.QMainWindow):
                 minX = (0 if 40 > minX else minX - 40)
                 minY = (40 if 40 > minY else minY - 40)
 
+                mainWindow.RealizeSpriteImages(QtCore.QRectF(minX, minY, maxX - minX, maxY - minY))
+
                 ScreenshotImage = QtGui.QImage(int(maxX - minX), int(maxY - minY), QtGui.QImage.Format_ARGB32)
                 ScreenshotImage.fill(Qt.transparent)
 
@@ -25196,6 +25832,10 @@ class ReggieWindow(QtWidgets.QMainWindow):
 
             else:
                 i = dlg.zoneCombo.currentIndex() - 2
+                mainWindow.RealizeSpriteImages(QtCore.QRectF(
+                    int(Area.zones[i].objx) * 1.5, int(Area.zones[i].objy) * 1.5,
+                    Area.zones[i].width * 1.5, Area.zones[i].height * 1.5,
+                ).adjusted(-SpriteImageMargin, -SpriteImageMargin, SpriteImageMargin, SpriteImageMargin))
                 ScreenshotImage = QtGui.QImage(Area.zones[i].width * 1.5, Area.zones[i].height * 1.5,
                                                QtGui.QImage.Format_ARGB32)
                 ScreenshotImage.fill(Qt.transparent)
@@ -25218,6 +25858,111 @@ class ReggieWindow(QtWidgets.QMainWindow):
         dlg.exec_()
 
 
+class StartupProfiler:
+    """
+    Records wall time, CPU time and memory allocations for each phase of
+    startup, then writes a JSON report and prints a summary table
+    """
+
+    def __init__(self, reportPath=None):
+        self.enabled = reportPath is not None
+        self.reportPath = reportPath
+        self.phases = []
+        self.stack = []
+
+        if self.enabled:
+            tracemalloc.start()
+            self.startWall = time.perf_counter()
+            self.startCpu = time.process_time()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager that times one phase. Phases can be nested.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        record = {'name': name, 'depth': len(self.stack)}
+        self.phases.append(record)
+        self.updatePeaks()
+        self.stack.append(record)
+
+        record['start'] = time.perf_counter() - self.startWall
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        mem = tracemalloc.get_traced_memory()[0]
+        record['peak'] = 0
+
+        try:
+            yield
+        finally:
+            record['wall'] = time.perf_counter() - wall
+            record['cpu'] = time.process_time() - cpu
+            self.updatePeaks()
+            record['alloc'] = tracemalloc.get_traced_memory()[0] - mem
+            record['peak'] = max(record['peak'] - mem, 0)
+            self.stack.pop()
+
+    def updatePeaks(self):
+        """
+        Folds the tracemalloc peak into every open phase, so nested phases
+        can reset it without losing their parents' peaks
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self.stack:
+            record['peak'] = max(record['peak'], peak)
+
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def finish(self):
+        """
+        Stops profiling, writes the report and prints the summary
+        """
+        if not self.enabled: return
+        self.enabled = False
+
+        wall = time.perf_counter() - self.startWall
+        cpu = time.process_time() - self.startCpu
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        report = {
+            'version': ReggieVersion,
+            'python': sys.version,
+            'qt': QtCore.QT_VERSION_STR,
+            'codecs': {codec: backend for codec, (backend, _) in CodecBackends.items()},
+            'wall': wall,
+            'cpu': cpu,
+            'phases': [{
+                'name': r['name'],
+                'depth': r['depth'],
+                'start': r['start'],
+                'wall': r['wall'],
+                'cpu': r['cpu'],
+                'alloc': r['alloc'],
+                'peak': r['peak'],
+            } for r in self.phases if 'wall' in r],
+        }
+
+        try:
+            with open(self.reportPath, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print('Could not write the startup report: %s' % e)
+        else:
+            print('Startup report written to %s' % self.reportPath)
+
+        print('%-34s %10s %10s %12s %12s' % ('Phase', 'Wall (ms)', 'CPU (ms)', 'Alloc (KiB)', 'Peak (KiB)'))
+        for r in report['phases']:
+            print('%-34s %10.1f %10.1f %12.1f %12.1f' % (
+                ('  ' * r['depth'] + r['name'])[:34], r['wall'] * 1000, r['cpu'] * 1000,
+                r['alloc'] / 1024, r['peak'] / 1024))
+        print('%-34s %10.1f %10.1f %12s %12.1f' % ('Total', wall * 1000, cpu * 1000, '', peak / 1024))
+
+
 def main():
     """
     Main startup function for Reggie
@@ -25237,10 +25982,12 @@ def main():
     settings = QtCore.QSettings('Reggie', ReggieVersion)
 
     # Load the translation (needs to happen first)
-    LoadTranslation()
+    with StartupTimer.phase('LoadTranslation'):
+        LoadTranslation()
 
     # Load the style
-    GetDefaultStyle()
+    with StartupTimer.phase('GetDefaultStyle'):
+        GetDefaultStyle()
 
     # go to the script path
     path = module_path()
@@ -25256,23 +26003,31 @@ def main():
     global SpriteListData
     Sprites = None
     SpriteListData = None
-    LoadGameDef(setting('LastGameDef'))
-    LoadTheme()
-    LoadActionsLists()
-    LoadConstantLists()
-    LoadTilesetNames()
-    LoadObjDescriptions()
-    LoadBgANames()
-    LoadBgBNames()
-    LoadSpriteData()
-    LoadSpriteListData()
-    LoadEntranceNames()
-    LoadNumberFont()
-    LoadOverrides()
-    LoadTilesetInfo()
+
+    # The gamedef's data files are parsed in the background while
+    # the loaders that need the GUI thread run
+    loader = DataLoader()
+    with StartupTimer.phase('LoadGameDef'):
+        LoadGameDef(setting('LastGameDef'), loader=loader)
+    with StartupTimer.phase('LoadTheme'):
+        LoadTheme()
+    with StartupTimer.phase('LoadActionsLists'):
+        LoadActionsLists()
+    with StartupTimer.phase('LoadConstantLists'):
+        LoadConstantLists()
+    with StartupTimer.phase('LoadNumberFont'):
+        LoadNumberFont()
+    with StartupTimer.phase('LoadOverrides'):
+        LoadOverrides()
     SLib.OutlineColor = theme.color('smi')
-    SLib.main()
-    sprites.LoadBasics()
+    with StartupTimer.phase('SpriteLib'):
+        SLib.main()
+
+    with StartupTimer.phase('DataLoader.join'):
+        try:
+            loader.join()
+        finally:
+            loader.close()
 
     # Set the default window icon (used for random popups and stuff)
     app.setWindowIcon(GetIcon('reggie'))
@@ -25326,6 +26081,7 @@ def main():
                                               trans.string('ChangeGamePath', 3))
         else:
             setSetting('GamePath', path)
+            gamedef.ResetGamePaths()
             break
 
     # Check to see if we have anything saved
@@ -25343,9 +26099,16 @@ def main():
             setSetting('AutoSaveFileData', 'x')
 
     # Create and show the main window
-    mainWindow = ReggieWindow()
-    mainWindow.__init2__()  # fixes bugs
-    mainWindow.show()
+    with StartupTimer.phase('ReggieWindow'):
+        mainWindow = ReggieWindow()
+
+    with StartupTimer.phase('ReggieWindow.__init2__'):
+        mainWindow.__init2__()  # fixes bugs
+
+    with StartupTimer.phase('Show'):
+        mainWindow.show()
+
+    StartupTimer.finish()
 
     exitcodesys = app.exec_()
     app.deleteLater()
@@ -25356,4 +26119,16 @@ generateStringsXML = False
 if '-generatestringsxml' in sys.argv:
     generateStringsXML = True
 
+# Startup profiling: pass -profilestartup, or set REGGIE_PROFILE_STARTUP
+# (to 1, or to the path the report should be written to)
+StartupReportPath = os.environ.get('REGGIE_PROFILE_STARTUP', '')
+if StartupReportPath in ('', '0') and '-profilestartup' not in sys.argv:
+    StartupReportPath = None
+elif StartupReportPath in ('', '0', '1'):
+    StartupReportPath = os.path.abspath('reggie_startup.json')
+else:
+    StartupReportPath = os.path.abspath(StartupReportPath)
+
+StartupTimer = StartupProfiler(StartupReportPath)
+
 if __name__ == '__main__': main()
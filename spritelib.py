@@ -31,15 +31,18 @@
 
 # Imports
 import os.path
+import threading
+import time
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+import levelcore
+
 Qt = QtCore.Qt
 
 OutlineColor = None
 OutlinePen = None
 OutlineBrush = None
-ImageCache = {}
 Tiles = {}
 SpriteImagesLoaded = set()
 
@@ -47,6 +50,106 @@ SpritesFolders = []
 RealViewEnabled = False
 Area = None
 MapPositionToZoneID = None
+CurrentZoneIndex = None
+CurrentSpriteFileIndex = None
+Preloader = None
+
+
+################################################################
+################################################################
+################################################################
+######################### Image Cache ##########################
+
+class LazyImageCache(dict):
+    """
+    The sprite image cache. Images registered with register() are only
+    loaded once they're first looked up, and again after the cache has
+    been cleared. Indexing and get() load them; "name in ImageCache" only
+    reports images that are loaded already, which is what
+    loadIfNotInImageCache and the loadImages() methods rely on.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loaders = {}
+
+    def register(self, names, loader):
+        """
+        Makes loader() fill in names the first time one of them is needed
+        """
+        for name in names:
+            self.loaders[name] = loader
+
+    def __missing__(self, name):
+        loader = self.loaders.get(name)
+        if loader is None:
+            raise KeyError(name)
+
+        loader()
+        return dict.__getitem__(self, name)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+
+ImageCache = LazyImageCache()
+
+
+def LoadBasics():
+    """
+    Registers the basic images used in NSMBW. They're used all over the
+    place, but each set is only loaded when it's first drawn.
+    """
+    ImageCache.register(('Coin', 'SpecialCoin', 'PCoin', 'RedCoin', 'StarCoin'), LoadCoinImages)
+    ImageCache.register(('Blocks',), LoadBlockImages)
+    ImageCache.register(('Overrides',), LoadOverrideImages)
+    ImageCache.register(['Character%d%s' % (num + 1, direction) for num in range(4) for direction in 'LR'],
+                        LoadCharacterImages)
+    ImageCache.register(('VineTop', 'VineMid', 'VineBtm'), LoadVineImages)
+
+
+def LoadCoinImages():
+    ImageCache['Coin'] = GetImg('coin.png')
+    ImageCache['SpecialCoin'] = GetImg('special_coin.png')
+    ImageCache['PCoin'] = GetImg('p_coin.png')
+    ImageCache['RedCoin'] = GetImg('redcoin.png')
+    ImageCache['StarCoin'] = GetImg('starcoin.png')
+
+
+def LoadBlockImages():
+    BlockImage = GetImg('blocks.png')
+    Blocks = []
+    count = BlockImage.width() // 24
+    for i in range(count):
+        Blocks.append(BlockImage.copy(i * 24, 0, 24, 24))
+    ImageCache['Blocks'] = Blocks
+
+
+def LoadOverrideImages():
+    Overrides = QtGui.QPixmap('reggiedata/overrides.png')
+    Blocks = []
+    x = Overrides.width() // 24
+    y = Overrides.height() // 24
+    for i in range(y):
+        for j in range(x):
+            Blocks.append(Overrides.copy(j * 24, i * 24, 24, 24))
+    ImageCache['Overrides'] = Blocks
+
+
+def LoadCharacterImages():
+    for num in range(4):
+        for direction in 'lr':
+            ImageCache['Character%d%s' % (num + 1, direction.upper())] = \
+                GetImg('character_%d_%s.png' % (num + 1, direction))
+
+
+def LoadVineImages():
+    ImageCache['VineTop'] = GetImg('vine_top.png')
+    ImageCache['VineMid'] = GetImg('vine_mid.png')
+    ImageCache['VineBtm'] = GetImg('vine_btm.png')
 
 
 ################################################################
@@ -69,10 +172,231 @@ def main():
     # won't receive it, which causes bugs.
     ImageCache.clear()
     SpriteImagesLoaded.clear()
+    ClearPreloadedImages()
+    LoadBasics()
 
     SpritesFolders = []
 
 
+class SpriteFileIndex:
+    """
+    Maps filenames to their paths in the sprite folders. Later folders
+    take priority, the same way GetImg picks the most recent copy.
+    """
+    DefaultFolder = os.path.join('reggiedata', 'sprites')
+    CheckInterval = 1.0  # seconds between checks of the folder mtimes
+
+    def __init__(self, folders):
+        self.folders = tuple(folders)
+        self.stamps = self.stampsFor(self.folders)
+        self.checked = time.monotonic()
+
+        self.paths = {}
+        for folder in (self.DefaultFolder,) + self.folders:
+            try:
+                entries = os.scandir(folder)
+            except OSError:
+                continue
+
+            with entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self.paths[os.path.normcase(entry.name)] = entry.path
+
+    @classmethod
+    def stampsFor(cls, folders):
+        """
+        Returns the modification times of the folders
+        """
+        stamps = []
+        for folder in (cls.DefaultFolder,) + folders:
+            try:
+                stamps.append(os.stat(folder).st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+
+        return tuple(stamps)
+
+    def isCurrent(self, folders):
+        """
+        Returns True if the index is still valid for the folders
+        """
+        if self.folders != tuple(folders): return False
+
+        now = time.monotonic()
+        if now - self.checked < self.CheckInterval: return True
+        self.checked = now
+
+        return self.stamps == self.stampsFor(self.folders)
+
+    def lookup(self, filename):
+        """
+        Returns the path to the most recent copy of filename, or None
+        """
+        return self.paths.get(os.path.normcase(filename))
+
+
+def GetSpriteFileIndex():
+    """
+    Returns a SpriteFileIndex for SpritesFolders, rescanning the folders
+    if they have changed
+    """
+    global CurrentSpriteFileIndex
+
+    if CurrentSpriteFileIndex is None or not CurrentSpriteFileIndex.isCurrent(SpritesFolders):
+        CurrentSpriteFileIndex = SpriteFileIndex(SpritesFolders)
+
+    return CurrentSpriteFileIndex
+
+
+def ImageFilenames(loadImages):
+    """
+    Returns the image filenames that appear as constants in a loadImages()
+    function. Filenames built at runtime aren't found.
+    """
+    names = set()
+    codes = [loadImages.__code__] if hasattr(loadImages, '__code__') else []
+    while codes:
+        for const in codes.pop().co_consts:
+            if isinstance(const, str):
+                if const.lower().endswith('.png') and '%' not in const and '{' not in const:
+                    names.add(const)
+            elif hasattr(const, 'co_consts'):
+                codes.append(const)
+
+    return names
+
+
+class ImageDecoder(QtCore.QRunnable):
+    """
+    Decodes image files into QImages on a worker thread
+    """
+
+    def __init__(self, preloader, generation, paths):
+        super().__init__()
+        self.preloader = preloader
+        self.generation = generation
+        self.paths = paths
+
+    def run(self):
+        for path in self.paths:
+            img = QtGui.QImageReader(path).read()
+            if not img.isNull():
+                self.preloader.store(self.generation, path, img)
+
+        self.preloader.decoderFinished.emit(self.generation)
+
+
+class ImagePreloader(QtCore.QObject):
+    """
+    Decodes the images of sprite types on a thread pool. GetImg picks up the
+    decoded QImages, and once a batch is done the sprite classes' images are
+    loaded into ImageCache on the GUI thread.
+    """
+    decoderFinished = QtCore.pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.images = {}
+        self.generation = 0
+        self.running = 0
+        self.classes = {}
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, QtCore.QThread.idealThreadCount() - 1))
+
+        self.decoderFinished.connect(self.handleDecoderFinished)
+
+    def clear(self):
+        """
+        Forgets all decoded images and ignores decoders still running
+        """
+        with self.lock:
+            self.generation += 1
+            self.images.clear()
+        self.running = 0
+        self.classes = {}
+
+    def store(self, generation, path, img):
+        """
+        Stores a decoded image (called from the worker threads)
+        """
+        with self.lock:
+            if generation == self.generation:
+                self.images[path] = img
+
+    def take(self, path):
+        """
+        Returns and forgets the decoded image for path, or None
+        """
+        with self.lock:
+            return self.images.pop(path, None)
+
+    def preload(self, classes):
+        """
+        Starts decoding the images of a {type: image class} mapping
+        """
+        index = GetSpriteFileIndex()
+        paths = set()
+        for type, cls in classes.items():
+            if type in SpriteImagesLoaded or type in self.classes: continue
+            self.classes[type] = cls
+
+            for name in ImageFilenames(cls.loadImages):
+                path = index.lookup(name)
+                if path is not None: paths.add(path)
+
+        if not paths: return
+
+        paths = sorted(paths)
+        count = min(len(paths), self.pool.maxThreadCount())
+        for i in range(count):
+            self.running += 1
+            self.pool.start(ImageDecoder(self, self.generation, paths[i::count]))
+
+    def handleDecoderFinished(self, generation):
+        """
+        Loads the images of the preloaded sprite types once all decoders
+        are done
+        """
+        if generation != self.generation: return
+
+        self.running -= 1
+        if self.running > 0: return
+
+        classes = self.classes
+        self.classes = {}
+        for type, cls in classes.items():
+            if type in SpriteImagesLoaded: continue
+            cls.loadImages()
+            SpriteImagesLoaded.add(type)
+
+        # drop whatever the image classes didn't ask for
+        with self.lock:
+            self.images.clear()
+
+
+def PreloadSpriteImages(classes, types):
+    """
+    Starts decoding the images needed by the sprite types in the background
+    """
+    global Preloader
+
+    if Preloader is None:
+        Preloader = ImagePreloader()
+
+    Preloader.preload({type: classes[type] for type in types if type in classes})
+
+
+def ClearPreloadedImages():
+    """
+    Forgets all images decoded in the background
+    """
+    if Preloader is not None:
+        Preloader.clear()
+
+
 def GetImg(imgname, image=False):
     """
     Returns the image path from the PNG filename imgname
@@ -80,20 +404,36 @@ def GetImg(imgname, image=False):
     imgname = str(imgname)
 
     # Try to find the best path
-    path = os.path.join('reggiedata', 'sprites', imgname)
+    if not os.path.dirname(imgname):
+        path = GetSpriteFileIndex().lookup(imgname)
+
+    else:
+        # Only the top level of each folder is indexed
+        path = os.path.join('reggiedata', 'sprites', imgname)
+
+        for folder in reversed(SpritesFolders):  # find the most recent copy
+            tryPath = os.path.join(folder, imgname)
+            if os.path.isfile(tryPath):
+                path = tryPath
+                break
 
-    for folder in reversed(SpritesFolders):  # find the most recent copy
-        tryPath = os.path.join(folder, imgname)
-        if os.path.isfile(tryPath):
-            path = tryPath
-            break
+        if not os.path.isfile(path):
+            path = None
 
     # Return the appropriate object
-    if os.path.isfile(path):
+    if path is not None:
+        img = Preloader.take(path) if Preloader is not None else None
+
+        if img is None:
+            if image:
+                return QtGui.QImage(path)
+            else:
+                return QtGui.QPixmap(path)
+
         if image:
-            return QtGui.QImage(path)
+            return img
         else:
-            return QtGui.QPixmap(path)
+            return QtGui.QPixmap.fromImage(img)
 
 
 def loadIfNotInImageCache(name, filename):
@@ -137,6 +477,41 @@ def MapPositionToZoneID(zones, x, y, useid=False):
     return rval
 
 
+class ZoneIndex(levelcore.ZoneIndex):
+    """
+    Snapshot of the zone rectangles, for mapping many positions to zones.
+    Gives exactly the same results as MapPositionToZoneID.
+    """
+
+    @staticmethod
+    def keyFor(zones):
+        """
+        Returns a value that changes whenever the zones do
+        """
+        return tuple(zone.ZoneRect.getRect() + (zone.id,) for zone in zones)
+
+
+def GetZoneIndex(zones):
+    """
+    Returns a ZoneIndex for the zones, reusing the previous one if the
+    zones haven't changed since
+    """
+    global CurrentZoneIndex
+
+    if CurrentZoneIndex is None or CurrentZoneIndex.key != ZoneIndex.keyFor(zones):
+        CurrentZoneIndex = ZoneIndex(zones)
+
+    return CurrentZoneIndex
+
+
+def MapPositionsToZoneIDs(zones, positions, useid=False):
+    """
+    Bulk version of MapPositionToZoneID: returns the zone IDs for a list
+    of (x, y) positions
+    """
+    return GetZoneIndex(zones).lookupMany(positions, useid)
+
+
 ################################################################
 ################################################################
 ################################################################
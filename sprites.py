@@ -45,47 +45,6 @@ ImageCache = SLib.ImageCache
 ################################################################
 
 
-def LoadBasics():
-    """
-    Loads basic images used in NSMBW
-    """
-    # Load some coins, because coins are in almost every Mario level ever
-    ImageCache['Coin'] = SLib.GetImg('coin.png')
-    ImageCache['SpecialCoin'] = SLib.GetImg('special_coin.png')
-    ImageCache['PCoin'] = SLib.GetImg('p_coin.png')
-    ImageCache['RedCoin'] = SLib.GetImg('redcoin.png')
-    ImageCache['StarCoin'] = SLib.GetImg('starcoin.png')
-
-    # Load blocks
-    BlockImage = SLib.GetImg('blocks.png')
-    Blocks = []
-    count = BlockImage.width() // 24
-    for i in range(count):
-        Blocks.append(BlockImage.copy(i * 24, 0, 24, 24))
-    ImageCache['Blocks'] = Blocks
-
-    # Load the overrides
-    Overrides = QtGui.QPixmap('reggiedata/overrides.png')
-    Blocks = []
-    x = Overrides.width() // 24
-    y = Overrides.height() // 24
-    for i in range(y):
-        for j in range(x):
-            Blocks.append(Overrides.copy(j * 24, i * 24, 24, 24))
-    ImageCache['Overrides'] = Blocks
-
-    # Load the characters
-    for num in range(4):
-        for direction in 'lr':
-            ImageCache['Character%d%s' % (num + 1, direction.upper())] = \
-                SLib.GetImg('character_%d_%s.png' % (num + 1, direction))
-
-    # Load vines, because these are used by entrances
-    SLib.loadIfNotInImageCache('VineTop', 'vine_top.png')
-    SLib.loadIfNotInImageCache('VineMid', 'vine_mid.png')
-    SLib.loadIfNotInImageCache('VineBtm', 'vine_btm.png')
-
-
 # ---- Low-Level Classes ----
 
 
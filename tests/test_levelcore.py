@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: latin-1 -*-
+
+# Reggie Next - New Super Mario Bros. Wii Level Editor
+# Milestone 3
+# Copyright (C) 2009-2014 Treeki, Tempus, angelsl, JasonP27, Kamek64,
+# MalStar1000, RoadrunnerWMC, 2017 Stella/AboodXD, John10v10
+
+# This file is part of Reggie Next.
+
+# Reggie Next is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Reggie Next is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Reggie Next.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# test_levelcore.py
+# Checks that levelcore saves levels back unchanged, without Qt.
+# Run with: python3 -m unittest discover tests
+
+
+import os
+import sys
+import unittest
+
+RootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RootDir)
+
+import levelcore
+import lh
+
+
+def ReadLevelData(filename):
+    """
+    Reads a level file the way a batch script would, decompressing it if needed
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if lh.IsLHCompressed(data):
+        data = lh.UncompressLH(bytearray(data))
+
+    return bytes(data)
+
+
+class LevelRoundTripTests(unittest.TestCase):
+    """
+    Loads levels with levelcore and saves them again
+    """
+
+    def setUp(self):
+        self.data = ReadLevelData(os.path.join(RootDir, 'reggieextras', 'TrainingLevel.arc'))
+
+    def roundTrip(self, data):
+        level = levelcore.Level()
+        self.assertTrue(level.load(data))
+        return level.save()
+
+    def test_training_level(self):
+        self.assertEqual(self.roundTrip(self.data), self.data)
+
+    def test_missing_layer_files(self):
+        # Many retail levels have no L0 or L2 file; saving mustn't add empty ones
+        areas = levelcore.ReadLevel(self.data)
+        for area in areas:
+            area[1] = area[3] = None
+        data = levelcore.WriteLevel(areas)
+
+        self.assertEqual(self.roundTrip(data), data)
+
+    def test_added_objects_create_layer_file(self):
+        areas = levelcore.ReadLevel(self.data)
+        areas[0][1] = None
+        data = levelcore.WriteLevel(areas)
+
+        level = levelcore.Level()
+        level.load(data)
+        level.areas[0].layers[0].append(levelcore.LevelObject(0, 1, 0, 2, 3, 4, 5))
+
+        L0 = levelcore.ReadLevel(level.save())[0][1]
+        self.assertIsNotNone(L0)
+        self.assertEqual(len(levelcore.ReadLayer(L0, 0)), 1)
+
+    def test_no_qt(self):
+        self.assertNotIn('PyQt5', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+# -*- coding: latin-1 -*-
+
+# Reggie Next - New Super Mario Bros. Wii Level Editor
+# Milestone 3
+# Copyright (C) 2009-2014 Treeki, Tempus, angelsl, JasonP27, Kamek64,
+# MalStar1000, RoadrunnerWMC, 2017 Stella/AboodXD, John10v10
+
+# This file is part of Reggie Next.
+
+# Reggie Next is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Reggie Next is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Reggie Next.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# tpl_np.py
+# TPL image data decoder in NumPy, used when the Cython one isn't built.
+
+
+################################################################
+################################################################
+
+import numpy as np
+
+from tpl import encodeRGB4A3
+
+
+# 'data' must be RGBA8 raw data
+def decodeRGB4A3(data, width, height, noAlpha):
+    # The pixels are stored in 4x4 tiles; put them back in rows
+    pixel = np.frombuffer(data, '>u2', width * height).astype(np.uint32)
+    pixel = pixel.reshape(height // 4, width // 4, 4, 4).swapaxes(1, 2).reshape(height, width)
+
+    opaque = (pixel & 0x8000) != 0
+    result = np.empty((height, width, 4), np.uint8)
+
+    result[..., 0] = np.where(opaque, (pixel & 0x1F) * 255 // 0x1F,
+                              (pixel & 0xF) * 255 // 0xF)
+    result[..., 1] = np.where(opaque, ((pixel >> 5) & 0x1F) * 255 // 0x1F,
+                              ((pixel & 0xF0) >> 4) * 255 // 0xF)
+    result[..., 2] = np.where(opaque, ((pixel >> 10) & 0x1F) * 255 // 0x1F,
+                              ((pixel & 0xF00) >> 8) * 255 // 0xF)
+
+    if noAlpha:
+        result[..., 3] = 0xFF
+
+    else:
+        result[..., 3] = np.where(opaque, 0xFF, ((pixel & 0x7000) >> 12) * 255 // 0x7)
+
+    return result.tobytes()
@@ -35,6 +35,7 @@ Version = '0.3.2'  # This must be a valid float in string format
 # Imports
 import os.path
 import shutil
+import subprocess
 import sys
 
 try:
@@ -72,6 +73,11 @@ printv('>> Build directory will be ' + dir_)
 print('[[ Freezing Reggie! Next ]]')
 print('>> Destination directory: %s' % dir_)
 
+# Compile the Cython codecs, so they get frozen in too
+print('>> Building the codecs...')
+subprocess.check_call([sys.executable, 'build_codecs.py'])
+print('>> Codecs built!')
+
 # Add the "build" parameter to the system argument list
 if 'build' not in sys.argv:
     sys.argv.append('build')